@@ -30,7 +30,7 @@ import warnings
 # The classes below are unused, but imported so that they are available in the
 # workspace.
 from openexp.canvas_elements import (Rect, Line, Text, Ellipse, Circle,
-	FixDot, Gabor, NoisePatch, Image, Arrow, Polygon)
+	FixDot, Gabor, NoisePatch, Image, Arrow, Polygon, Dots)
 from libopensesame.widgets.widget_factory import (Label, Button, ImageWidget,
 	ImageButton, TextInput, RatingScale, Checkbox)
 
@@ -48,6 +48,7 @@ class sampler(base_response_item, keyboard_response_mixin,
 		self.var.stop_after = 0
 		self.var.volume = 1.0
 		self.var.duration = u'sound'
+		self.var.stream = u'no'
 
 	def process_response(self, response_args):
 
@@ -82,7 +83,8 @@ class sampler(base_response_item, keyboard_response_mixin,
 				u'No sample has been specified in sampler "%s"' % self.name)
 		sample = self.experiment.pool[self.var.sample]
 		try:
-			self.sampler = openexp_sampler(self.experiment, sample)
+			self.sampler = openexp_sampler(self.experiment, sample,
+				stream=self.var.stream == u'yes')
 		except Exception as e:
 			raise osexception(u'Failed to load sample: %s' % sample,
 				exception=e)
@@ -25,6 +25,7 @@ from libopensesame.base_response_item import base_response_item
 from libopensesame.keyboard_response import keyboard_response_mixin
 from libopensesame.mouse_response import mouse_response_mixin
 from openexp.canvas import canvas
+from openexp._canvas import frame_timing
 
 class sketchpad(base_response_item, keyboard_response_mixin,
 	mouse_response_mixin):
@@ -43,6 +44,7 @@ class sketchpad(base_response_item, keyboard_response_mixin,
 
 		self.var.duration = u'keypress'
 		self.elements = []
+		self._static_canvas = None
 
 	def element_module(self):
 
@@ -133,24 +135,78 @@ class sketchpad(base_response_item, keyboard_response_mixin,
 		"""See item."""
 
 		base_response_item.prepare(self)
+		# A sketchpad that doesn't depend on variables looks the same every
+		# time, so the canvas is only created and rendered once. Every prepare
+		# gets a copy, so that changes to the canvas, for example from an
+		# inline_script, do not carry over to the next prepare. Because
+		# copying is copy-on-write, this doesn't re-render the canvas.
+		if self._static_canvas is not None:
+			self._copy_static_canvas()
+			return
 		self.canvas = canvas(
 			self.experiment,
+			auto_prepare=False,
 			color=self.var.foreground,
 			background_color=self.var.background
 		)
-		with self.canvas:
-			for element in self._elements():
-				temp_name = element.draw()
-				if element.element_name is not None:
-					self.canvas.rename_element(
-						temp_name, element.element_name
-					)
+		for element in self._elements():
+			temp_name = element.draw()
+			if element.element_name is not None:
+				self.canvas.rename_element(temp_name, element.element_name)
+		# If supported by the backend, the canvas is rendered in the
+		# background, while the rest of the sequence is being prepared.
+		self.canvas.auto_prepare = True
+		self.canvas.prepare_in_background()
+		if self.is_static():
+			self._static_canvas = self.canvas
+			self._copy_static_canvas()
+
+	def _copy_static_canvas(self):
+
+		"""
+		desc:
+			Sets the canvas to a copy of the cached canvas of a static
+			sketchpad.
+		"""
+
+		self.canvas = canvas(self.experiment, auto_prepare=False)
+		self.canvas.copy(self._static_canvas)
+		self.canvas.auto_prepare = True
+
+	def is_static(self):
+
+		"""
+		desc:
+			Determines whether the sketchpad looks the same every time, which
+			is the case when its colors and all of its elements are static.
+			Sketchpads with named elements are not considered static, because
+			named elements are meant to be changed, for example from an
+			inline_script.
+
+		returns:
+			desc:	A bool indicating whether the sketchpad is static.
+			type:	bool
+		"""
+
+		for var in (u'foreground', u'background'):
+			if self.syntax.contains_variables(self.var.get(var, _eval=False)):
+				return False
+		return all(
+			element.is_static() and element.element_name is None
+			for element in self.elements
+		)
 
 	def run(self):
 
 		"""See item."""
 
 		self._t0 = self.set_item_onset(self.canvas.show())
+		# With a fixed duration, the next display is intended to appear right
+		# after this one has been shown for the duration
+		if isinstance(self.var.duration, (int, float)) \
+				and self.var.duration > 0:
+			frame_timing.expect(self._t0 + self.var.duration)
+		frame_timing.log_item(self.experiment, self.name)
 		base_response_item.run(self)
 
 	def coroutine(self):
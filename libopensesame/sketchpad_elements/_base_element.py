@@ -249,6 +249,27 @@ class base_element(object):
 			properties[var] = val
 		return properties
 
+	def is_static(self):
+
+		"""
+		desc:
+			Determines whether the element is drawn the same way every time,
+			which is the case when it is always shown and none of its
+			properties contain variables or inline Python.
+
+		returns:
+			desc:	A bool indicating whether the element is static.
+			type:	bool
+		"""
+
+		if safe_decode(self.properties[u'show_if']).strip().lower() \
+				!= u'always':
+			return False
+		return not any(
+			self.syntax.contains_variables(val)
+			for val in self.properties.values()
+		)
+
 	def is_shown(self):
 
 		"""
@@ -317,6 +317,30 @@ class syntax(object):
 				+ txt[m.end(0):]
 		return self.unescape(txt)
 
+	def contains_variables(self, txt):
+
+		"""
+		desc:
+			Checks whether a text string contains variables or inline Python,
+			i.e. whether the text may evaluate differently depending on the
+			state of the experiment.
+
+		arguments:
+			txt:	The string to check. If the input is not a string, then
+					False is returned.
+
+		returns:
+			desc:	True if the string contains [variables] or [=inline
+					Python], and False otherwise.
+			type:	bool
+		"""
+
+		if not isinstance(txt, basestring):
+			return False
+		txt = safe_decode(txt)
+		return self.re_txt.search(txt) is not None \
+			or self.re_txt_py.search(txt) is not None
+
 	def quotable_symbol(self, s):
 
 		"""
@@ -23,6 +23,8 @@ from libopensesame.exceptions import osexception
 from openexp.canvas import canvas
 from openexp.mouse import mouse
 from openexp.keyboard import keyboard
+from openexp._canvas.spatial_index import SpatialIndex
+from openexp._input.event_wait import input_waiter, POLL_INTERVAL
 from libopensesame.widgets.widget_factory import WidgetFactory
 
 
@@ -125,6 +127,9 @@ class Form(object):
 		n_cells = len(self.cols)*len(self.rows)
 		self.widgets = [None]*n_cells
 		self.span = [(1, 1)]*n_cells
+		# A SpatialIndex of the cell rects, which is rebuilt when widgets are
+		# set
+		self._spatial_index = None
 		self._validator = (lambda: True) if validator is None else validator
 		self.canvas = canvas(
 			self.experiment,
@@ -195,8 +200,7 @@ class Form(object):
 			# Handle mouse clicks, including waiting until the mouse is released
 			# after a mouse click.
 			if mousedown:
-				while any(ms.get_pressed()):
-					pass
+				input_waiter.wait_for(lambda: not any(ms.get_pressed()))
 				mousedown = False
 			button, xy, timestamp = ms.get_click(visible=True)
 			if button is not None:
@@ -224,8 +228,10 @@ class Form(object):
 						u'key': key,
 						u'timestamp': timestamp
 					}
-			# Send message (if any)
+			# Send message (if any). If there was no input, sleep briefly
+			# instead of checking for input again right away.
 			if msg is None:
+				input_waiter.sleep(POLL_INTERVAL)
 				continue
 			resp = coroutines[focus_widget].send(msg)
 			self.canvas.show()
@@ -401,6 +407,7 @@ class Form(object):
 			widget = widget.construct(self)
 		self.widgets[index] = widget
 		self.span[index] = colspan, rowspan
+		self._spatial_index = None
 		widget.set_rect(self.get_rect(index))
 
 	def xy_to_index(self, xy):
@@ -420,11 +427,13 @@ class Form(object):
 			type:	int
 		"""
 
-		for index in range(len(self.widgets)):
-			x, y, w, h = self.get_rect(index)
-			if x <= xy[0] and x+w >= xy[0] and y <= xy[1] and y+h >= xy[1]:
-				return index
-		return None
+		if self._spatial_index is None:
+			self._spatial_index = SpatialIndex(
+				(index, self.get_rect(index))
+				for index in range(len(self.widgets))
+			)
+		indices = self._spatial_index.candidates(*xy)
+		return indices[0] if indices else None
 
 	def xy_to_widget(self, xy):
 
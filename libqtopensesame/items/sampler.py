@@ -62,3 +62,5 @@ class sampler(sampler_runtime, qtplugin):
 		self.add_line_edit_control(u'duration', _(u'Duration'),
 			info=_(u'In milliseconds, "sound", "keypress", or "mouseclick"'),
 			validator=duration_validator(self, default=u'sound'))
+		self.add_checkbox_control(u'stream',
+			_(u'Stream from disk (for long .wav files; pitch is not supported)'))
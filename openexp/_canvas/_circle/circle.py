@@ -30,6 +30,19 @@ class Circle(Ellipse):
 		self.prepare = self.circle_prepare(self.prepare)
 		Ellipse.__init__(self, canvas, **properties)
 
+	def __getstate__(self):
+
+		# The wrapped prepare() function is bound to this element, and is
+		# therefore recreated for copies by __setstate__().
+		state = Ellipse.__getstate__(self)
+		del state[u'prepare']
+		return state
+
+	def __setstate__(self, state):
+
+		self.__dict__.update(state)
+		self.prepare = self.circle_prepare(self.prepare)
+
 	@property
 	def rect(self):
 		return self.x-self.r, self.y-self.r, self.r*2, self.r*2
@@ -68,7 +81,10 @@ class Circle(Ellipse):
 	def _setter(key, self, val):
 
 		if key == u'r':
+			if self._shared:
+				self._unshare()
 			self._properties[u'w'] = val * 2
 			self._properties[u'h'] = val * 2
+			self._canvas._spatial_index = None
 			return
 		Ellipse._setter(key, self, val)
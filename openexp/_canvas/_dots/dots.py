@@ -0,0 +1,89 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.exceptions import osexception
+from openexp._canvas._element.element import Element
+import numpy as np
+
+
+class Dots(Element):
+
+	"""
+	desc:
+		A batch of filled circles that share a radius and a color. Dots are
+		drawn as a single element, which is much faster than drawing many
+		separate Circle elements.
+	"""
+
+	def __init__(self, canvas, xys, r=2, **properties):
+
+		properties = properties.copy()
+		properties.update({u'xys': self._xys(xys), u'r': r})
+		Element.__init__(self, canvas, **properties)
+
+	@property
+	def rect(self):
+
+		if not len(self.xys):
+			return 0, 0, 0, 0
+		x1, y1 = (self.xys.min(axis=0) - self.r).tolist()
+		x2, y2 = (self.xys.max(axis=0) + self.r).tolist()
+		return x1, y1, x2-x1, y2-y1
+
+	def __contains__(self, xy):
+
+		return bool(np.any(
+			np.hypot(self.xys[:, 0]-xy[0], self.xys[:, 1]-xy[1]) <= self.r
+		))
+
+	@staticmethod
+	def _xys(xys):
+
+		"""
+		visible: False
+
+		desc:
+			Converts a sequence of (x, y) tuples to a float array with one row
+			per dot.
+
+		arguments:
+			xys:
+				desc:	A sequence of (x, y) tuples or an array.
+				type:	[list, ndarray]
+
+		returns:
+			desc:	An N x 2 array.
+			type:	ndarray
+		"""
+
+		try:
+			xys = np.array(xys, dtype=float).reshape(-1, 2)
+		except ValueError:
+			raise osexception(u'xys should be a sequence of (x, y) tuples')
+		if not np.all(np.isfinite(xys)):
+			raise osexception(u'xys should not contain nan or inf')
+		return xys
+
+	@staticmethod
+	def _setter(key, self, val):
+
+		if key == u'xys':
+			val = self._xys(val)
+		Element._setter(key, self, val)
@@ -0,0 +1,67 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from openexp._canvas._dots.dots import Dots
+from openexp._canvas._element.psycho import PsychoElement
+from psychopy import visual
+
+
+class Psycho(PsychoElement, Dots):
+
+	def prepare(self):
+
+		# All dots are drawn in a single call by an ElementArrayStim. The
+		# field is made large enough to cover the entire display.
+		self._stim = visual.ElementArrayStim(
+			self.win,
+			units=u'pix',
+			fieldPos=(0, 0),
+			fieldSize=(2*self.experiment.var.width,
+				2*self.experiment.var.height),
+			fieldShape=u'sqr',
+			nElements=len(self.xys),
+			xys=self.to_xy(self.xys),
+			sizes=2*self.r,
+			colors=self._psycho_rgb(),
+			colorSpace=u'rgb',
+			elementTex=None,
+			elementMask=u'circle'
+		)
+
+	def _on_attribute_change(self, **kwargs):
+
+		# Moving dots is the common case, for example in random-dot
+		# kinematograms, so we update the positions without recreating the
+		# stimulus if the number of dots hasn't changed.
+		if (
+			self._canvas.auto_prepare
+			and list(kwargs) == [u'xys']
+			and hasattr(self, u'_stim')
+			and self._stim.nElements == len(self.xys)
+		):
+			self._stim.xys = self.to_xy(self.xys)
+			return
+		PsychoElement._on_attribute_change(self, **kwargs)
+
+	def _psycho_rgb(self):
+
+		# Convert #rrggbb to PsychoPy's -1 - 1 rgb format
+		hexcolor = self.color.hexcolor
+		return [int(hexcolor[i:i+2], 16) / 127.5 - 1 for i in (1, 3, 5)]
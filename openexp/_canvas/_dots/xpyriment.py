@@ -0,0 +1,38 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from openexp._canvas._dots.dots import Dots
+from openexp._canvas._dots.legacy import blit_dots
+from openexp._canvas._element.xpyriment import XpyrimentElement
+from expyriment.stimuli._visual import Visual
+import pygame
+
+
+class Xpyriment(XpyrimentElement, Dots):
+
+	def prepare(self):
+
+		x, y, w, h = (int(i) for i in self.rect)
+		surface = pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA)
+		blit_dots(surface, self.xys[:, 0]-x, self.xys[:, 1]-y, self.r,
+			self.color.backend_color)
+		self._stim = Visual(position=self.to_xy(x+w//2, y+h//2))
+		self._stim.set_surface(surface)
+		self._stim.preload()
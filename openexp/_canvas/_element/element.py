@@ -37,6 +37,11 @@ class Element(object):
 	# A property that indicates whether style properties (color etc) can be
 	# changed or not.
 	read_only = False
+	# Indicates whether the element shares backend resources, such as stimulus
+	# objects, with an element on another canvas as a result of Canvas.copy(),
+	# in which case these resources should be detached before the element is
+	# modified.
+	_shared = False
 
 	def __init__(self, canvas, **properties):
 
@@ -70,6 +75,14 @@ class Element(object):
 		if canvas.auto_prepare and self.visible:
 			self.prepare()
 
+	def __getstate__(self):
+
+		# Copies of an element should not share their properties, because
+		# otherwise changing a copy would also change the original.
+		state = self.__dict__.copy()
+		state[u'_properties'] = self._properties.copy()
+		return state
+
 	def __contains__(self, xy):
 
 		x, y, w, h = self.rect
@@ -146,8 +159,50 @@ class Element(object):
 			# PsychoPy stimuli.
 			e = copy.copy(self)
 		e._canvas = canvas
+		e._shared = False
+		return e
+
+	def _share(self, canvas):
+
+		"""
+		visible: False
+
+		desc:
+			Creates a shallow copy of the element that becomes part of the
+			provided canvas. The copy has its own properties, but shares all
+			other attributes, such as rendered surfaces and stimulus objects,
+			with the current element until either element is modified. This is
+			used by Canvas.copy().
+
+		arguments:
+			canvas:
+				desc:	The canvas of which the copied element is part.
+				type:	Canvas
+
+		returns:
+			desc:	A copy of the current element.
+			type:	Element
+		"""
+
+		e = copy.copy(self)
+		e._canvas = canvas
+		e._shared = self._shared = True
 		return e
 
+	def _unshare(self):
+
+		"""
+		visible: False
+
+		desc:
+			Is called before a shared element is modified. This should be
+			implemented by backend-specific element objects that modify shared
+			resources in place, for example by changing a stimulus object
+			rather than creating a new one.
+		"""
+
+		self._shared = False
+
 	def prepare(self):
 
 		"""
@@ -158,6 +213,18 @@ class Element(object):
 
 		pass
 
+	def preload(self):
+
+		"""
+		desc:
+			Is called in the main thread before the canvas is prepared in a
+			background thread. This should be implemented by backend-specific
+			element objects that use resources that can only be created in the
+			main thread.
+		"""
+
+		pass
+
 	def show(self):
 
 		"""
@@ -302,9 +369,13 @@ class Element(object):
 
 		if key in NUMERIC_PROPERTIES:
 			self._assert_numeric(**{key: val})
+		if self._shared:
+			self._unshare()
 		if key == u'color':
 			val = color(self.experiment, val)
 		self._properties[key] = val
+		# The bounding rect may have changed
+		self._canvas._spatial_index = None
 		self._on_attribute_change(**{key: val})
 
 	@staticmethod
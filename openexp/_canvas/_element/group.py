@@ -38,6 +38,11 @@ class Group(Element):
 		for element in self._elements:
 			element.prepare()
 
+	def preload(self):
+
+		for element in self._elements:
+			element.preload()
+
 	def show(self, **kwargs):
 
 		for element in self._elements:
@@ -60,6 +65,12 @@ class Group(Element):
 
 		return Group(self._canvas, self._elements + [element])
 
+	def _share(self, canvas):
+
+		e = Element._share(self, canvas)
+		e._elements = [element._share(canvas) for element in self._elements]
+		return e
+
 	@staticmethod
 	def _setter(key, self, val):
 
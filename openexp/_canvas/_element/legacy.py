@@ -18,6 +18,7 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
+from openexp._canvas.prerenderer import render_lock
 
 
 class LegacyElement(object):
@@ -28,10 +29,39 @@ class LegacyElement(object):
 		sketchpad elements.
 	"""
 
+	def __init__(self, canvas, *args, **kwargs):
+
+		# Elements draw directly onto the canvas surface when they are
+		# constructed, so we need to make sure that the canvas is not being
+		# prepared in the background.
+		canvas._wait_prepared()
+		with render_lock:
+			canvas._own_surface()
+			super(LegacyElement, self).__init__(canvas, *args, **kwargs)
+
+	# The area of the canvas surface that the element was last drawn on
+	_drawn_rect = None
+
 	@property
 	def surface(self):
 		return self._canvas.surface
 
 	def _on_attribute_change(self, **kwargs):
 
-		self._canvas.redraw()
+		self._canvas.invalidate(self)
+
+	def _drawn(self, rect):
+
+		"""
+		desc:
+			Should be called by prepare() with the rect that is returned by
+			pygame drawing and blitting functions, so that the canvas knows
+			which area to repaint when the element changes.
+
+		arguments:
+			rect:
+				desc:	The area of the canvas surface that was drawn on.
+				type:	Rect
+		"""
+
+		self._drawn_rect = rect
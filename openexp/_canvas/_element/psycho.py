@@ -44,6 +44,14 @@ class PsychoElement(object):
 		if self._canvas.auto_prepare:
 			self.prepare()
 
+	def _unshare(self):
+
+		# Some elements change their stimulus in place, so a shared stimulus is
+		# replaced by a new one before the element is changed.
+		if hasattr(self, u'_stim'):
+			self.prepare()
+		self._shared = False
+
 	def _mask(self, env, size, stdev):
 
 		"""
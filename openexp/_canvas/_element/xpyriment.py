@@ -45,6 +45,7 @@ class XpyrimentElement(object):
 		e = copy.copy(self)
 		e._stim = self._stim.copy()
 		e._canvas = canvas
+		e._shared = False
 		return e
 
 	def _on_attribute_change(self, **kwargs):
@@ -33,8 +33,8 @@ class Legacy(LegacyElement, Ellipse):
 		h = int(self.h)
 		x, y = self.to_xy(x, y)
 		if self.fill:
-			pygame.draw.ellipse(self.surface, self.color.backend_color,
-				(x, y, w, h), 0)
+			self._drawn(pygame.draw.ellipse(self.surface,
+				self.color.backend_color, (x, y, w, h), 0))
 			return
 		# Use experyiment's method to draw ellipses with a transparent
 		# interior by using the transparent colorkey method. This involves
@@ -66,4 +66,5 @@ class Legacy(LegacyElement, Ellipse):
 			special_flags=pygame.BLEND_RGB_MAX)
 		# The line_width affects the temp's surface size, so use it to correct the
 		# positioning when blitting.
-		self.surface.blit(surface, (x-line_width/2, y-line_width/2) )
+		self._drawn(
+			self.surface.blit(surface, (x-line_width/2, y-line_width/2)))
@@ -18,7 +18,10 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
+import os
+from libopensesame.exceptions import osexception
 from openexp._canvas._element.element import Element
+from openexp.cache import Cache, image_size
 
 
 class Image(Element):
@@ -33,14 +36,11 @@ class Image(Element):
 	@property
 	def rect(self):
 
-		from PIL import Image
-
-		im = Image.open(self.fname)
+		im = cached_image(self.fname, u'pil', load_pil)
 		w1, h1 = im.size
 		if self.rotation is not None and self.rotation != 0:
 			im = im.rotate(self.rotation, expand=True)
 		w2, h2 = im.size
-		im.close()
 		dx = (w2-w1)/2
 		dy = (h2-h1)/2
 		if self.scale is not None:
@@ -52,3 +52,76 @@ class Image(Element):
 		if self.center:
 			return x-w2//2, y-h2//2, w2, h2
 		return x-dx, y-dy, w2, h2
+
+
+# The default memory budget of the image cache in bytes
+DEFAULT_CACHE_SIZE = 128 * 1024 ** 2
+# A process-wide cache of decoded images, which is shared by all backends
+image_cache = Cache(max_size=DEFAULT_CACHE_SIZE, sizeof=image_size)
+
+
+def cached_image(fname, kind, load, *args):
+
+	"""
+	desc:
+		Gets a decoded image from the image cache, or loads it and adds it to
+		the cache. Images are keyed by their path and modification time, so
+		that changed files are reloaded.
+
+	arguments:
+		fname:
+			desc:	The path to the image file.
+			type:	[str, unicode]
+		kind:
+			desc:	The kind of decoded image, such as 'pygame' for a pygame
+					surface or 'pil' for a PIL image.
+			type:	[str, unicode]
+		load:
+			desc:	A function that takes the path and args, and returns a
+					decoded image.
+			type:	function
+
+	argument-list:
+		args:	Additional parameters, such as rotation and scale, which are
+				part of the key.
+
+	returns:
+		A decoded image. This image is shared, and should not be modified.
+	"""
+
+	fname = safe_decode(fname)
+	if not os.path.isfile(fname):
+		raise osexception(u'"%s" does not exist' % fname)
+	key = (kind, fname, os.path.getmtime(fname)) + args
+	image = image_cache.get(key)
+	if image is None:
+		image = load(fname, *args)
+		image_cache[key] = image
+	return image
+
+
+def load_pil(fname):
+
+	"""
+	desc:
+		Decodes an image file into a PIL image.
+
+	arguments:
+		fname:
+			desc:	The path to the image file.
+			type:	unicode
+
+	returns:
+		A PIL image.
+	"""
+
+	from PIL import Image
+
+	with open(fname, u'rb') as fd:
+		try:
+			im = Image.open(fd)
+			im.load()
+		except IOError:
+			raise osexception(
+				u"'%s' is not a supported image format" % fname)
+	return im
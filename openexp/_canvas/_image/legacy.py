@@ -18,10 +18,9 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
-import os
 import pygame
 from libopensesame.exceptions import osexception
-from openexp._canvas._image.image import Image
+from openexp._canvas._image.image import Image, cached_image
 from openexp._canvas._element.legacy import LegacyElement
 
 
@@ -31,42 +30,8 @@ class Legacy(LegacyElement, Image):
 
 		if not hasattr(self, '_image_surface') or self._dirty:
 			self._dirty = False
-			fname = safe_decode(self.fname)
-			if not os.path.isfile(fname):
-				raise osexception(u'"%s" does not exist' % fname)
-			with open(fname, u'rb') as fd:
-				try:
-					self._image_surface = pygame.image.load(fd)
-				except pygame.error:
-					raise osexception(
-						u"'%s' is not a supported image format" % fname)
-			# After rotation, the figure gets bigger. We therefore need to
-			# compensate by moving it a bit
-			if self.rotation is not None and self.rotation != 0:
-				w1, h1 = self._image_surface.get_size()
-				self._image_surface = pygame.transform.rotate(
-					self._image_surface.convert_alpha(), -self.rotation
-				)
-				w2, h2 = self._image_surface.get_size()
-				self._dx = (w2-w1)/2
-				self._dy = (h2-h1)/2
-			else:
-				self._dx = self._dy = 0
-			if self.scale is not None:
-				try:
-					self._image_surface = pygame.transform.smoothscale(
-						self._image_surfacesurface,
-						(int(self._image_surface.get_width()*self.scale),
-						int(self._image_surface.get_height()*self.scale))
-					)
-				except:
-					self._image_surface = pygame.transform.scale(
-						self._image_surface,
-						(int(self._image_surface.get_width()*self.scale),
-						int(self._image_surface.get_height()*self.scale))
-					)
-				self._dx *= self.scale
-				self._dy *= self.scale
+			self._image_surface, self._dx, self._dy = transformed_surface(
+				self.fname, self.rotation, self.scale)
 		size = self._image_surface.get_size()
 		x, y = self.to_xy(self.x, self.y)
 		if self.center:
@@ -75,10 +40,84 @@ class Legacy(LegacyElement, Image):
 		else:
 			x -= self._dx
 			y -= self._dy
-		self.surface.blit(self._image_surface, (x, y))
+		self._drawn(self.surface.blit(self._image_surface, (x, y)))
 
 	@staticmethod
 	def _setter(key, self, val):
 
 		self._dirty = True
 		Image._setter(key, self, val)
+
+
+def transformed_surface(fname, rotation, scale):
+
+	"""
+	desc:
+		Gets a rotated and scaled pygame surface for an image file from the
+		image cache. This is shared by the legacy and xpyriment backends.
+
+	arguments:
+		fname:
+			desc:	The path to the image file.
+			type:	[str, unicode]
+		rotation:
+			desc:	The rotation in degrees, or None.
+			type:	[int, float, NoneType]
+		scale:
+			desc:	The scaling factor, or None.
+			type:	[int, float, NoneType]
+
+	returns:
+		desc:	A (surface, dx, dy) tuple, where dx and dy indicate how much
+				the image has grown on each side because of the rotation.
+		type:	tuple
+	"""
+
+	surface = cached_image(fname, u'pygame', _load_surface)
+	if (rotation is None or rotation == 0) and scale is None:
+		return surface, 0, 0
+	w1, h1 = surface.get_size()
+	surface = cached_image(fname, u'pygame', _transform_surface, rotation,
+		scale)
+	w2, h2 = surface.get_size()
+	# After rotation, the figure gets bigger. We therefore need to
+	# compensate by moving it a bit
+	if scale is None:
+		scale = 1
+	return surface, (w2-w1*scale)/2, (h2-h1*scale)/2
+
+
+def _load_surface(fname):
+
+	"""
+	desc:
+		Decodes an image file into a pygame surface.
+	"""
+
+	with open(fname, u'rb') as fd:
+		try:
+			return pygame.image.load(fd)
+		except pygame.error:
+			raise osexception(
+				u"'%s' is not a supported image format" % fname)
+
+
+def _transform_surface(fname, rotation, scale):
+
+	"""
+	desc:
+		Rotates and scales a decoded image file. The decoded image is itself
+		taken from the image cache.
+	"""
+
+	surface = cached_image(fname, u'pygame', _load_surface)
+	if rotation is not None and rotation != 0:
+		surface = pygame.transform.rotate(surface.convert_alpha(), -rotation)
+	if scale is not None:
+		size = (int(surface.get_width()*scale),
+			int(surface.get_height()*scale))
+		try:
+			surface = pygame.transform.smoothscale(surface, size)
+		except:
+			surface = pygame.transform.scale(surface, size)
+	return surface
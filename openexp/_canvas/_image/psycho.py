@@ -19,7 +19,7 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 
 from libopensesame.py3compat import *
 from libopensesame.exceptions import osexception
-from openexp._canvas._image.image import Image
+from openexp._canvas._image.image import Image, cached_image, load_pil
 from openexp._canvas._element.psycho import PsychoElement, RotatingElement
 from psychopy import visual
 
@@ -30,7 +30,7 @@ class Psycho(RotatingElement, PsychoElement, Image):
 
 		self._stim = visual.ImageStim(
 			win=self.win,
-			image=safe_decode(self.fname)
+			image=cached_image(self.fname, u'pil', load_pil)
 		)
 		if self.rotation is not None and self.rotation != 0:
 			self._stim.ori = self.rotation
@@ -27,6 +27,6 @@ class Legacy(LegacyElement, Line):
 
 	def prepare(self):
 
-		pygame.draw.line(self.surface, self.color.backend_color,
+		self._drawn(pygame.draw.line(self.surface, self.color.backend_color,
 			self.to_xy(self.sx, self.sy), self.to_xy(self.ex, self.ey),
-			self.penwidth)
+			self.penwidth))
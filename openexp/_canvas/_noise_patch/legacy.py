@@ -30,4 +30,5 @@ class Legacy(LegacyElement, NoisePatch):
 		surface = canvas._noise_patch(self.env, self.size, self.stdev,
 			self.col1, self.col2, self.bgmode)
 		x, y = self.to_xy(self.x, self.y)
-		self.surface.blit(surface, (x-0.5*self.size, y-0.5*self.size))
+		self._drawn(
+			self.surface.blit(surface, (x-0.5*self.size, y-0.5*self.size)))
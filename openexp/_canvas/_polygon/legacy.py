@@ -27,6 +27,7 @@ class Legacy(LegacyElement, Polygon):
 
 	def prepare(self):
 
-		pygame.draw.polygon(self.surface, self.color.backend_color,
-			[self.to_xy(x, y) for x, y in self.vertices],
-			0 if self.fill else self.penwidth)
+		self._drawn(pygame.draw.polygon(self.surface,
+			self.color.backend_color,
+			self._backend_vertices(),
+			0 if self.fill else self.penwidth))
@@ -19,6 +19,10 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 
 from libopensesame.py3compat import *
 from openexp._canvas._element.element import Element
+try:
+	import numpy as np
+except ImportError:
+	np = None
 
 
 class Polygon(Element):
@@ -37,3 +41,28 @@ class Polygon(Element):
 		top = min(y for x,y in self.vertices)
 		bottom = max(y for x,y in self.vertices)
 		return left, top, right-left, bottom-top
+
+	def _backend_vertices(self):
+
+		"""
+		visible: False
+
+		desc:
+			Converts the vertices to the back-end specific reference frame. If
+			possible, all vertices are converted in a single vectorized
+			operation.
+
+		returns:
+			desc:	A list of (x, y) coordinates.
+			type:	list
+		"""
+
+		if np is not None:
+			try:
+				xy = np.array(self.vertices, dtype=float)
+			except (TypeError, ValueError):
+				pass
+			else:
+				if xy.ndim == 2 and xy.shape[1] == 2 and np.isfinite(xy).all():
+					return self.to_xy(xy).tolist()
+		return [self.to_xy(x, y) for x, y in self.vertices]
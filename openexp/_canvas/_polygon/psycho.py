@@ -30,7 +30,7 @@ class Psycho(PsychoElement, Polygon):
 		self._stim = visual.ShapeStim(
 			self.win,
 			lineWidth=self.penwidth,
-			vertices=[self.to_xy(x, y) for x, y in self.vertices],
+			vertices=self._backend_vertices(),
 			lineColor=self.color.backend_color,
 			closeShape=True,
 			fillColor=self.color.backend_color if self.fill else None,
@@ -39,7 +39,5 @@ class Xpyriment(XpyrimentElement, Polygon):
 			colour=self.color.backend_color,
 			anti_aliasing=self.ANTI_ALIAS
 		)
-		self._stim.add_vertices(points2vertices(
-			[self.to_xy(x, y) for x, y in self.vertices]
-		))
+		self._stim.add_vertices(points2vertices(self._backend_vertices()))
 		self._stim.preload()
@@ -28,5 +28,5 @@ class Legacy(LegacyElement, Rect):
 	def prepare(self):
 
 		x, y = self.to_xy(self.x, self.y)
-		pygame.draw.rect(self.surface, self.color.backend_color,
-			(x, y, self.w, self.h), 0 if self.fill else self.penwidth)
+		self._drawn(pygame.draw.rect(self.surface, self.color.backend_color,
+			(x, y, self.w, self.h), 0 if self.fill else self.penwidth))
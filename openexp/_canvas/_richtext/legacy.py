@@ -18,25 +18,31 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
-from openexp._canvas._richtext.richtext import RichText
+from openexp._canvas._richtext.richtext import RichText, pil_to_surface
 from openexp._canvas._element.legacy import LegacyElement
-import pygame
 
 
 class Legacy(LegacyElement, RichText):
 
-	def prepare(self):
+	def preload(self):
 
+		# Qt can only render in the main thread
 		if not hasattr(self, '_text_surface') or self._dirty:
-			im = self._to_pil()
-			self._text_surface = pygame.image.fromstring(
-				im.tobytes(), im.size, im.mode)
+			self._text_surface = self._render()
 			self._dirty = False
+
+	def prepare(self):
+
+		self.preload()
 		x, y = self.to_xy(self.x, self.y)
 		if self.center:
 			x -= self._text_surface.get_width()//2
 			y -= self._text_surface.get_height()//2
-		self.surface.blit(self._text_surface, (x, y))
+		self._drawn(self.surface.blit(self._text_surface, (x, y)))
+
+	def _render(self):
+
+		return self._cached_render(u'pygame', pil_to_surface)
 
 	@staticmethod
 	def _setter(key, self, val):
@@ -27,7 +27,7 @@ class Psycho(PsychoElement, RichText):
 
 	def prepare(self):
 
-		im = self._to_pil()
+		im = self._render()
 		x, y = self.to_xy(self.x, self.y)
 		if not self.center:
 			x += im.width // 2
@@ -22,7 +22,10 @@ import sys
 from libopensesame.py3compat import *
 from libopensesame import misc
 import warnings
+import math
 from openexp._canvas._element.element import Element
+from openexp._canvas.canvas import text_cache
+from openexp import canvas_elements
 from qtpy.QtWidgets import (QGraphicsTextItem, QStyleOptionGraphicsItem,
 	QApplication)
 from qtpy.QtGui import QPixmap, QPainter, QColor, QFont, QFontDatabase
@@ -134,15 +137,7 @@ class RichText(Element):
 			)
 		else:
 			t.setPlainText(self.text)
-		mw = self.max_width
-		if mw is None:
-			if self.uniform_coordinates:
-				mw = self._canvas.width//2 - self.x
-			else:
-				mw = self._canvas.width - self.x
-		if self.center:
-			mw *= 2
-		t.setTextWidth(mw)
+		t.setTextWidth(self._text_width())
 		f = QFont(self.font_family,
 			weight=QFont.Bold if self.font_bold else QFont.Normal,
 			italic=self.font_italic)
@@ -152,13 +147,34 @@ class RichText(Element):
 		t.setFont(f)
 		return t
 
+	def _text_width(self):
+
+		"""
+		desc:
+			Gets the width at which the text wraps.
+
+		returns:
+			desc:	The text width in pixels.
+			type:	[int, float]
+		"""
+
+		mw = self.max_width
+		if mw is None:
+			if self.uniform_coordinates:
+				mw = self._canvas.width//2 - self.x
+			else:
+				mw = self._canvas.width - self.x
+		if self.center:
+			mw *= 2
+		return mw
+
 	def _to_qimage(self):
 
 		t = self._to_qgraphicstextitem()
 		rect = t.boundingRect()
 		height = rect.height()
 		width = rect.width()
-		pixmap = QPixmap(width, height)
+		pixmap = QPixmap(int(math.ceil(width)), int(math.ceil(height)))
 		pixmap.fill(Qt.transparent)
 		painter = QPainter(pixmap)
 		t.paint(painter, QStyleOptionGraphicsItem(), None)
@@ -173,9 +189,116 @@ class RichText(Element):
 		y1 = min(y2-self.font_size, y1)
 		return im.crop((x1, y1, x2, y2))
 
+	def _cached_render(self, kind, convert=None):
+
+		"""
+		desc:
+			Gets the rendered text from the text cache, or renders it and adds
+			it to the cache. Texts are keyed by everything that affects their
+			rendering, so identical texts are rendered only once, even if they
+			are part of different elements or canvases.
+
+		arguments:
+			kind:
+				desc:	The kind of rendered text, such as 'pygame' for a pygame
+						surface or 'pil' for a PIL image.
+				type:	[str, unicode]
+
+		keywords:
+			convert:
+				desc:	A function that converts a PIL image into the kind of
+						rendered text, or None to keep the PIL image.
+				type:	[function, NoneType]
+
+		returns:
+			The rendered text. This is shared, and should not be modified.
+		"""
+
+		key = (kind, self.text, self.html, self.center, self.font_family,
+			self.font_size, self.font_bold, self.font_italic,
+			self.color.hexcolor, self._text_width())
+		im = text_cache.get(key)
+		if im is None:
+			im = self._to_pil()
+			if convert is not None:
+				im = convert(im)
+			text_cache[key] = im
+		return im
+
+	def _render(self):
+
+		"""
+		desc:
+			Gets the rendered text in the form in which the backend draws it.
+			Backends that don't draw PIL images override this function.
+
+		returns:
+			The rendered text. This is shared, and should not be modified.
+		"""
+
+		return self._cached_render(u'pil')
+
 	@staticmethod
 	def _setter(key, self, val):
 
 		if key == u'text':
 			val = safe_decode(val)
 		super(RichText, self)._setter(key, self, val)
+
+
+def pil_to_surface(im):
+
+	"""
+	desc:
+		Converts a rendered text from a PIL image into a pygame surface.
+
+	arguments:
+		im:
+			desc:	A PIL image.
+			type:	Image
+
+	returns:
+		A pygame surface.
+	"""
+
+	import pygame
+	return pygame.image.fromstring(im.tobytes(), im.size, im.mode)
+
+
+def warm_up(canvas, texts, **style_args):
+
+	"""
+	desc: |
+		*New in v3.3.0*
+
+		Renders a list of texts into the text cache, so that text elements
+		with these texts are prepared without rendering. This is useful for
+		tasks in which many texts from a limited vocabulary are shown in rapid
+		succession, such as RSVP and word-by-word reading tasks. The texts are
+		only taken from the cache if they are shown on a canvas with the same
+		size and backend, and with the same `center`, `max_width`, `html`,
+		and style arguments. The canvas itself is not changed.
+
+	arguments:
+		canvas:
+			desc:	The canvas on which the texts will be shown.
+			type:	Canvas
+		texts:
+			desc:	A list of texts.
+			type:	list
+
+	keyword-dict:
+		style_args:	Keywords that are passed on to [canvas.text].
+
+	example: |
+		from openexp._canvas._richtext.richtext import warm_up
+		warm_up(my_canvas, [u'the', u'quick', u'brown', u'fox'], font_size=32)
+	"""
+
+	# The texts are rendered through elements on a throwaway canvas with the
+	# same style, so that nothing is drawn onto the canvas itself
+	scratch_canvas = canvas.__class__(canvas.experiment, auto_prepare=False,
+		**canvas.get_config())
+	for text in texts:
+		canvas_elements.RichText(text, **style_args).construct(
+			scratch_canvas)._render()
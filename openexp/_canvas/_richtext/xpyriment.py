@@ -18,22 +18,24 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
-import pygame
-from openexp._canvas._richtext.richtext import RichText
+from openexp._canvas._richtext.richtext import RichText, pil_to_surface
 from openexp._canvas._element.xpyriment import XpyrimentElement
 from expyriment.stimuli._visual import Visual
 
 
 class Xpyriment(XpyrimentElement, RichText):
 
+	def _render(self):
+
+		return self._cached_render(u'pygame', pil_to_surface)
+
 	def prepare(self):
 
-		im = self._to_pil()
-		surface = pygame.image.fromstring(im.tobytes(), im.size, im.mode)
+		surface = self._render()
 		x, y = self.to_xy(self.x, self.y)
 		if not self.center:
-			x += im.width // 2
-			y -= im.height // 2
+			x += surface.get_width() // 2
+			y -= surface.get_height() // 2
 		self._stim = Visual(position=(x, y))
 		self._stim.set_surface(surface)
 		self._stim.preload()
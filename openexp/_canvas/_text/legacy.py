@@ -37,7 +37,7 @@ class Legacy(LegacyElement, Text):
 		self._set_font()
 		surface = self._font.render(self.text, self._antialias,
 			self.color.backend_color)
-		self.surface.blit(surface, self.to_xy(self.x, self.y))
+		self._drawn(self.surface.blit(surface, self.to_xy(self.x, self.y)))
 
 	@property
 	def size(self):
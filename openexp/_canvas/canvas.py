@@ -24,11 +24,20 @@ import math
 from libopensesame.exceptions import osexception
 from openexp.backend import Backend, configurable
 from openexp.color import Color
+from openexp.cache import Cache, DiskStore, image_size
+from libopensesame.oslogging import oslogger
 from collections import OrderedDict
 from openexp.canvas_elements import (Line, Rect, Polygon, Ellipse, Image,
-	Gabor, NoisePatch, Circle, FixDot, ElementFactory, RichText, Arrow)
+	Gabor, NoisePatch, Circle, FixDot, ElementFactory, RichText, Arrow, Dots)
 from openexp._canvas._element.element import Element
 from openexp._canvas._element.group import Group
+from openexp._canvas.spatial_index import SpatialIndex, element_rect
+from openexp._canvas._image.image import (image_cache,
+	DEFAULT_CACHE_SIZE as DEFAULT_IMAGE_CACHE_SIZE)
+try:
+	import numpy as np
+except ImportError:
+	np = None
 
 
 class Canvas(Backend):
@@ -261,6 +270,10 @@ class Canvas(Backend):
 		--%
 	"""
 
+	# Indicates whether the canvas can be prepared in a background thread. See
+	# Canvas.prepare_in_background().
+	threadsafe_prepare = False
+
 	def __init__(self, experiment, auto_prepare=True, **style_args):
 
 		"""
@@ -318,6 +331,11 @@ class Canvas(Backend):
 		}, **style_args)
 		self._elements = OrderedDict()
 		self._stimnr = 0
+		self._prerender_job = None
+		# A SpatialIndex for elements_at(), which is rebuilt when elements are
+		# added, removed, reordered, or changed
+		self._spatial_index = None
+		self._spatial_index_items = None
 
 	def __enter__(self):
 
@@ -424,7 +442,7 @@ class Canvas(Backend):
 			Iterates over the elements.
 		"""
 
-		for name, stim in self._elements.items():
+		for name, stim in list(self._elements.items()):
 			yield name, stim
 
 	def __iadd__(self, element):
@@ -504,14 +522,37 @@ class Canvas(Backend):
 		"""
 
 		elements = []
-		for name, element in self:
+		for name in self._get_spatial_index().candidates(x, y):
 			try:
-				if (x, y) in element:
+				if (x, y) in self._elements[name]:
 					elements.append(name)
 			except NotImplementedError:
 				pass
 		return elements
 
+	def _get_spatial_index(self):
+
+		"""
+		visible: False
+
+		desc:
+			Gets a SpatialIndex of the bounding rects of all elements. The
+			index is rebuilt when elements have been changed, or when the
+			elements themselves have been added, removed, or reordered.
+
+		returns:
+			desc:	A spatial index with element names as keys.
+			type:	SpatialIndex
+		"""
+
+		items = list(self._elements.items())
+		if self._spatial_index is None or self._spatial_index_items != items:
+			self._spatial_index = SpatialIndex(
+				(name, element_rect(element)) for name, element in self
+			)
+			self._spatial_index_items = items
+		return self._spatial_index
+
 	def lower_to_bottom(self, element):
 
 		"""
@@ -747,11 +788,30 @@ class Canvas(Backend):
 			my_copied_canvas.show()
 		"""
 
+		self._share_elements(canvas)
+		self.set_config(**canvas.get_config())
+
+	def _share_elements(self, canvas):
+
+		"""
+		visible: False
+
+		desc:
+			Gives the canvas shallow copies of the elements of another canvas.
+			The copies have their own properties, so that changing an element
+			on either canvas doesn't affect the other canvas, but they share
+			rendered surfaces and stimulus objects until they are changed.
+
+		arguments:
+			canvas:
+				desc:	The canvas to share elements with.
+				type:	Canvas
+		"""
+
 		self._elements = OrderedDict([
-			(name, element.copy(self))
+			(name, element._share(self))
 			for name, element in canvas._elements.items()
 		])
-		self.set_config(**canvas.get_config())
 
 	def prepare(self):
 
@@ -765,10 +825,86 @@ class Canvas(Backend):
 			[canvas.__init__].
 		"""
 
-		for name, element in self._elements.items():
+		for name, element in list(self._elements.items()):
 			if element.visible:
 				element.prepare()
 
+	def prepare_in_background(self):
+
+		"""
+		desc: |
+			*New in v3.3.0*
+
+			Prepares the canvas in a background thread, so that the
+			experiment can do other things in the meantime. [canvas.show] waits
+			until the preparation is finished. If the backend does not support
+			this, or if the `canvas_prerender` experiment variable is 0 (the
+			default), the canvas is prepared immediately.
+
+		example: |
+			my_canvas = Canvas(auto_prepare=False)
+			for x in range(-500, 500, 10):
+				my_canvas.fixdot(x=x)
+			my_canvas.prepare_in_background()
+			# Do something else
+			my_canvas.show()
+		"""
+
+		from openexp._canvas import prerenderer
+
+		self._wait_prepared()
+		if self.threadsafe_prepare:
+			# Resources that can only be created in the main thread are
+			# prepared right away.
+			for name, element in self._elements.items():
+				if element.visible:
+					element.preload()
+			self._prerender_job = prerenderer.submit(self)
+			if self._prerender_job is not None:
+				return
+		self.prepare()
+
+	def _wait_prepared(self):
+
+		"""
+		visible: False
+
+		desc:
+			Waits until a preparation in the background (if any) has finished.
+		"""
+
+		job = self._prerender_job
+		if job is None:
+			return
+		self._prerender_job = None
+		job.wait()
+
+	def _flipped(self, t):
+
+		"""
+		visible: False
+
+		desc:
+			Should be called by show() with the flip timestamp, so that the
+			flip is recorded if frame timing is enabled.
+
+		arguments:
+			t:
+				desc:	The flip timestamp.
+				type:	[int, float]
+
+		returns:
+			desc:	The flip timestamp.
+			type:	[int, float]
+		"""
+
+		from openexp._canvas import frame_timing
+		from libopensesame.item_stack import item_stack_singleton
+		if frame_timing.frame_timer is not None:
+			stack = item_stack_singleton.l
+			frame_timing.frame_timer.record(t, stack[-1][0] if stack else None)
+		return t
+
 	def show(self):
 
 		"""
@@ -898,6 +1034,50 @@ class Canvas(Backend):
 		self += Circle(x, y, r, **style_args)
 		return 'stim%d' % self._stimnr
 
+	def dots(self, xys, r=2, **style_args):
+
+		"""
+		desc: |
+			Draws a batch of filled circles that share a radius and a color.
+			This is much faster than drawing each dot separately with
+			`circle()`, and is useful for stimuli that consist of many dots,
+			such as random-dot kinematograms. Dots are always filled, so the
+			`fill` and `penwidth` style arguments are ignored.
+
+			*New in v3.3.0*
+
+		arguments:
+			xys:
+				desc:	A list of (x, y) tuples, or an N x 2 numpy array, with
+						the center coordinates of the dots.
+				type:	[list, ndarray]
+
+		keywords:
+			r:
+				desc:	The radius of the dots.
+				type:	int
+
+		keyword-dict:
+			style_args:	"%arg_style"
+
+		example: |
+			import random
+			my_canvas = Canvas()
+			xys = [
+				(random.randint(-200, 200), random.randint(-200, 200))
+				for i in range(500)
+			]
+			# Function interface
+			my_canvas.dots(xys, r=3, color='white')
+			# Element interface
+			my_canvas['my_dots'] = Dots(xys, r=3, color='white')
+			# Move all dots to the right
+			my_canvas['my_dots'].xys = [(x+5, y) for x, y in xys]
+		"""
+
+		self += Dots(xys, r=r, **style_args)
+		return 'stim%d' % self._stimnr
+
 	def line(self, sx, sy, ex, ey, **style_args):
 
 		"""
@@ -1460,7 +1640,100 @@ env_synonyms[u"lin"] = u"l"
 env_synonyms[u"ln"] = u"l"
 env_synonyms[u"l"] = u"l"
 
-canvas_cache = {}
+
+
+def _save_surface(surface, path):
+
+	"""
+	desc:
+		Saves a pygame surface to an image file for the on-disk canvas cache.
+	"""
+
+	import pygame
+	pygame.image.save(surface, path)
+
+
+def _load_surface(path):
+
+	"""
+	desc:
+		Loads a pygame surface from an image file for the on-disk canvas cache.
+	"""
+
+	import pygame
+	return pygame.image.load(path)
+
+
+# The default memory cap of the canvas cache in bytes
+DEFAULT_CACHE_SIZE = 64 * 1024 ** 2
+# A cache for Gabor and noise patches
+canvas_cache = Cache(max_size=DEFAULT_CACHE_SIZE, sizeof=image_size)
+# The default memory cap of the text cache in bytes
+DEFAULT_TEXT_CACHE_SIZE = 32 * 1024 ** 2
+# A cache of rendered texts, which is shared by all rich-text elements
+text_cache = Cache(max_size=DEFAULT_TEXT_CACHE_SIZE, sizeof=image_size)
+
+
+def init_cache(experiment):
+
+	"""
+	desc: |
+		Configures the canvas caches before the experiment begins, based on the
+		following experiment variables:
+
+		- `patch_cache_size` is the memory cap for Gabor and noise patches in
+		  megabytes.
+		- `patch_cache_folder` is a folder in which generated patches are
+		  stored, so that they can be reused across sessions. If empty
+		  (the default), patches are kept in memory only.
+		- `image_cache_size` is the memory budget for decoded images in
+		  megabytes.
+		- `text_cache_size` is the memory cap for rendered texts in megabytes.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	canvas_cache.max_size = int(experiment.var.get(u'patch_cache_size',
+		DEFAULT_CACHE_SIZE // 1024 ** 2) * 1024 ** 2)
+	folder = safe_decode(experiment.var.get(u'patch_cache_folder', u''))
+	if folder:
+		oslogger.info(u'storing patches in %s' % folder)
+		canvas_cache.store = DiskStore(folder, _save_surface, _load_surface,
+			suffix=u'.png')
+	else:
+		canvas_cache.store = None
+	canvas_cache.reset_stats()
+	image_cache.max_size = int(experiment.var.get(u'image_cache_size',
+		DEFAULT_IMAGE_CACHE_SIZE // 1024 ** 2) * 1024 ** 2)
+	image_cache.reset_stats()
+	text_cache.max_size = int(experiment.var.get(u'text_cache_size',
+		DEFAULT_TEXT_CACHE_SIZE // 1024 ** 2) * 1024 ** 2)
+	text_cache.reset_stats()
+
+
+def close_cache(experiment):
+
+	"""
+	desc:
+		Logs cache statistics after the experiment is finished.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	for name, cache in [
+		(u'canvas', canvas_cache),
+		(u'image', image_cache),
+		(u'text', text_cache)
+	]:
+		oslogger.info(u'%(name)s cache: %(hits)d hits (%(disk_hits)d from '
+			u'disk), %(misses)d misses, %(evictions)d evictions, %(items)d '
+			u'items, %(size)d bytes' % dict(cache.stats(), name=name))
 
 
 def _color(col):
@@ -1481,6 +1754,23 @@ def _color(col):
 	return Legacy(None, col).backend_color
 
 
+def _check_bgmode(bgmode):
+
+	"""
+	desc:
+		Checks whether bgmode is valid for _gabor and _noise_patch.
+
+	arguments:
+		bgmode:
+			desc:	A background mode.
+			type:	[str, unicode]
+	"""
+
+	if bgmode not in (u"avg", u"col2"):
+		raise osexception(u"Invalid argument for bgmode: %s "
+						  u"(should be one of 'avg','col2')" % bgmode)
+
+
 def _gabor(orient, freq, env=u"gaussian", size=96, stdev=12, phase=0,
 	col1=u"white", col2=u"black", bgmode=u"avg"):
 
@@ -1490,17 +1780,217 @@ def _gabor(orient, freq, env=u"gaussian", size=96, stdev=12, phase=0,
 		see [canvas.gabor].
 	"""
 
-	import pygame
-
 	env = _match_env(env)
+	_check_bgmode(bgmode)
 	# Generating a Gabor patch takes quite some time, so keep
 	# a cache of previously generated Gabor patches to speed up
 	# the process.
-	global canvas_cache
 	key = u"gabor_%s_%s_%s_%s_%s_%s_%s_%s_%s" % (orient, freq, env, size,
 		stdev, phase, col1, col2, bgmode)
-	if key in canvas_cache:
-		return canvas_cache[key]
+	surface = canvas_cache.get(key)
+	if surface is not None:
+		return surface
+	if np is None:
+		surface = _gabor_pixelwise(orient, freq, env, size, stdev, phase,
+			_color(col1), _color(col2), bgmode)
+	else:
+		surface = _gabor_vectorized(orient, freq, env, size, stdev, phase,
+			_color(col1), _color(col2), bgmode)
+	canvas_cache[key] = surface
+	return surface
+
+
+def _noise_patch(env=u"gaussian", size=96, stdev=12, col1=u"white",
+	col2=u"black", bgmode=u"avg"):
+
+	"""
+	desc:
+		Returns a pygame surface containing a noise patch. For arguments,
+		see [canvas.noise_patch].
+	"""
+
+	env = _match_env(env)
+	_check_bgmode(bgmode)
+	# Generating a noise patch takes quite some time, so keep
+	# a cache of previously generated noise patches to speed up
+	# the process.
+	key = u"noise_%s_%s_%s_%s_%s_%s" % (env, size, stdev, col1, col2, bgmode)
+	surface = canvas_cache.get(key)
+	if surface is not None:
+		return surface
+	if np is None:
+		surface = _noise_patch_pixelwise(env, size, stdev, _color(col1),
+			_color(col2), bgmode)
+	else:
+		surface = _noise_patch_vectorized(env, size, stdev, _color(col1),
+			_color(col2), bgmode)
+	canvas_cache[key] = surface
+	return surface
+
+
+def _gabor_vectorized(orient, freq, env, size, stdev, phase, col1, col2,
+	bgmode):
+
+	"""
+	desc:
+		Generates a Gabor patch as NumPy arrays. For arguments, see _gabor(),
+		except that env should be a standard envelope name and col1 and col2
+		should be PyGame color objects.
+
+	returns:
+		A pygame surface.
+	"""
+
+	dx, dy = _patch_grid(size)
+	# Rotate the coordinates (dx, dy) back into the unrotated Gabor patch.
+	# This is equivalent to the polar transform of the pixelwise version.
+	orient = math.radians(orient)
+	ux = dx * math.cos(orient) - dy * math.sin(orient)
+	# Get the amplitude without the envelope (0 .. 1)
+	amp = 0.5 + 0.5 * np.cos(2.0 * math.pi * (ux * freq + phase))
+	return _blend_vectorized(amp, _envelope_vectorized(env, size, stdev, dx,
+		dy), col1, col2, bgmode)
+
+
+def _noise_patch_vectorized(env, size, stdev, col1, col2, bgmode):
+
+	"""
+	desc:
+		Generates a noise patch as NumPy arrays. For arguments, see
+		_noise_patch(), except that env should be a standard envelope name and
+		col1 and col2 should be PyGame color objects.
+
+	returns:
+		A pygame surface.
+	"""
+
+	dx, dy = _patch_grid(size)
+	# The noise is seeded from the random module, so that random.seed() makes
+	# noise patches reproducible, just like for the pixelwise version.
+	rng = np.random.RandomState(random.getrandbits(32))
+	amp = rng.random_sample((size, size))
+	return _blend_vectorized(amp, _envelope_vectorized(env, size, stdev, dx,
+		dy), col1, col2, bgmode)
+
+
+def _patch_grid(size):
+
+	"""
+	desc:
+		Creates a coordinate grid for a patch.
+
+	arguments:
+		size:
+			desc:	The size of the patch in pixels.
+			type:	int
+
+	returns:
+		desc:	A (dx, dy) tuple of arrays with the horizontal and vertical
+				distance from the center. The arrays are indexed as [x, y], in
+				line with pygame.surfarray.
+		type:	tuple
+	"""
+
+	r = np.arange(size, dtype=float) - 0.5 * size
+	return np.meshgrid(r, r, indexing=u'ij')
+
+
+def _envelope_vectorized(env, size, stdev, dx, dy):
+
+	"""
+	desc:
+		Gets the envelope for a patch. All envelopes are rotation invariant, so
+		the envelope does not depend on the orientation.
+
+	arguments:
+		env:
+			desc:	A standard envelope name.
+			type:	unicode
+		size:
+			desc:	The size of the patch in pixels.
+			type:	int
+		stdev:
+			desc:	The standard deviation of a Gaussian envelope.
+			type:	[int, float]
+		dx:
+			desc:	The horizontal distance from the center.
+			type:	ndarray
+		dy:
+			desc:	The vertical distance from the center.
+			type:	ndarray
+
+	returns:
+		desc:	An array of envelope values (0 .. 1).
+		type:	ndarray
+	"""
+
+	if env == u"g":
+		return np.exp(-0.5 * (dx / stdev) ** 2 - 0.5 * (dy / stdev) ** 2)
+	r = np.sqrt(dx ** 2 + dy ** 2)
+	if env == u"l":
+		return np.maximum(0, (0.5 * size - r) / (0.5 * size))
+	if env == u"c":
+		return (r <= 0.5 * size).astype(float)
+	return np.ones(r.shape)
+
+
+def _blend_vectorized(amp, f, col1, col2, bgmode):
+
+	"""
+	desc:
+		Applies an envelope to an amplitude array, interpolates between two
+		colors, and blits the result onto a new surface.
+
+	arguments:
+		amp:
+			desc:	An array of amplitudes without the envelope (0 .. 1).
+			type:	ndarray
+		f:
+			desc:	An array of envelope values (0 .. 1).
+			type:	ndarray
+		col1:
+			desc:	The color for an amplitude of 1.
+			type:	Color
+		col2:
+			desc:	The color for an amplitude of 0.
+			type:	Color
+		bgmode:
+			desc:	The background mode.
+			type:	[str, unicode]
+
+	returns:
+		A pygame surface.
+	"""
+
+	import pygame
+
+	if bgmode == u"avg":
+		amp = amp * f + 0.5 * (1.0 - f)
+	else:
+		amp = amp * f
+	amp = amp[:, :, np.newaxis]
+	rgb1 = np.array([col1.r, col1.g, col1.b], dtype=float)
+	rgb2 = np.array([col2.r, col2.g, col2.b], dtype=float)
+	px = np.round(rgb1 * amp + rgb2 * (1.0 - amp)).astype(np.uint8)
+	surface = pygame.Surface(amp.shape[:2])
+	pygame.surfarray.blit_array(surface, px)
+	return surface
+
+
+def _gabor_pixelwise(orient, freq, env, size, stdev, phase, col1, col2,
+	bgmode):
+
+	"""
+	desc:
+		Generates a Gabor patch pixel by pixel. This is slow, and is only used
+		when NumPy is not available. For arguments, see _gabor_vectorized().
+
+	returns:
+		A pygame surface.
+	"""
+
+	import pygame
+
 	# Create a surface
 	surface = pygame.Surface( (size, size) )
 	try:
@@ -1509,8 +1999,6 @@ def _gabor(orient, freq, env=u"gaussian", size=96, stdev=12, phase=0,
 		px = None
 	# Conver the orientation to radians
 	orient = math.radians(orient)
-	col1 = _color(col1)
-	col2 = _color(col2)
 	# rx and ry reflect the real coordinates in the
 	# target image
 	for rx in range(size):
@@ -1541,12 +2029,8 @@ def _gabor(orient, freq, env=u"gaussian", size=96, stdev=12, phase=0,
 			# Apply the envelope
 			if bgmode == u"avg":
 				amp = amp * f + 0.5 * (1.0 - f)
-			elif bgmode == u"col2":
-				amp = amp * f
 			else:
-				raise osexception(u"Invalid argument for bgmode: %s "
-								  u"(should be one of 'avg','col2')" % bgmode)
-
+				amp = amp * f
 			r = col1.r * amp + col2.r * (1.0 - amp)
 			g = col1.g * amp + col2.g * (1.0 - amp)
 			b = col1.b * amp + col2.b * (1.0 - amp)
@@ -1554,38 +2038,30 @@ def _gabor(orient, freq, env=u"gaussian", size=96, stdev=12, phase=0,
 				surface.set_at((rx, ry), (round(r), round(g), round(b)))
 			else:
 				px[rx][ry] = round(r), round(g), round(b)
-	canvas_cache[key] = surface
 	del px
 	return surface
 
 
-def _noise_patch(env=u"gaussian", size=96, stdev=12, col1=u"white",
-	col2=u"black", bgmode=u"avg"):
+def _noise_patch_pixelwise(env, size, stdev, col1, col2, bgmode):
 
 	"""
 	desc:
-		Returns a pygame surface containing a noise patch. For arguments,
-		see [canvas.noise_patch].
+		Generates a noise patch pixel by pixel. This is slow, and is only used
+		when NumPy is not available. For arguments, see
+		_noise_patch_vectorized().
+
+	returns:
+		A pygame surface.
 	"""
 
 	import pygame
 
-	env = _match_env(env)
-	# Generating a noise patch takes quite some time, so keep
-	# a cache of previously generated noise patches to speed up
-	# the process.
-	global canvas_cache
-	key = u"noise_%s_%s_%s_%s_%s_%s" % (env, size, stdev, col1, col2, bgmode)
-	if key in canvas_cache:
-		return canvas_cache[key]
 	# Create a surface
 	surface = pygame.Surface( (size, size) )
 	try:
 		px = pygame.PixelArray(surface)
 	except:
 		px = None
-	col1 = _color(col1)
-	col2 = _color(col2)
 	# rx and ry reflect the real coordinates in the
 	# target image
 	for rx in range(size):
@@ -1611,12 +2087,8 @@ def _noise_patch(env=u"gaussian", size=96, stdev=12, col1=u"white",
 			# Apply the envelope
 			if bgmode == u"avg":
 				amp = amp * f + 0.5 * (1.0 - f)
-			elif bgmode == u"col2":
-				amp = amp * f
 			else:
-				raise osexception(u"Invalid argument for bgmode: %s "
-								  u"(should be one of 'avg','col2')" % bgmode)
-
+				amp = amp * f
 			r = col1.r * amp + col2.r * (1.0 - amp)
 			g = col1.g * amp + col2.g * (1.0 - amp)
 			b = col1.b * amp + col2.b * (1.0 - amp)
@@ -1624,7 +2096,6 @@ def _noise_patch(env=u"gaussian", size=96, stdev=12, col1=u"white",
 				surface.set_at((rx, ry), (round(r), round(g), round(b)))
 			else:
 				px[rx][ry] = round(r), round(g), round(b)
-	canvas_cache[key] = surface
 	del px
 	return surface
 
@@ -0,0 +1,370 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+from array import array
+from collections import OrderedDict
+
+NAN = float(u'nan')
+# Flip intervals that are shorter than this (in milliseconds) indicate that
+# flips are not synchronized to the vertical refresh, because refresh rates
+# above 500 Hz are not plausible
+MIN_REFRESH_INTERVAL = 2
+# The active FrameTimer, or None if frame timing is disabled
+frame_timer = None
+
+
+class FrameTimer(object):
+
+	"""
+	desc:
+		Records the timestamp of every display flip, together with the intended
+		onset (if any) and the item that was running. From this, the refresh
+		interval is estimated, and flips are flagged as late when they occurred
+		one or more refresh intervals after their intended onset, which
+		indicates that frames were dropped.
+	"""
+
+	def __init__(self, refresh_interval=None):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			refresh_interval:
+				desc:	The refresh interval in milliseconds, or None to
+						estimate the refresh interval from the recorded flips.
+				type:	[float, NoneType]
+		"""
+
+		self._refresh_interval = refresh_interval
+		self._calibrated = False
+		self._onsets = array(u'd' if py3 else b'd')
+		self._intended = array(u'd' if py3 else b'd')
+		self._items = array(u'i' if py3 else b'i')
+		self._item_names = []
+		self._expected = NAN
+
+	def __len__(self):
+
+		return len(self._onsets)
+
+	def expect(self, t):
+
+		"""
+		desc:
+			Sets the intended onset of the next flip.
+
+		arguments:
+			t:
+				desc:	A timestamp in milliseconds.
+				type:	[int, float]
+		"""
+
+		self._expected = t
+
+	def record(self, t, item=None):
+
+		"""
+		desc:
+			Records a flip. This is called by the canvas backends.
+
+		arguments:
+			t:
+				desc:	The flip timestamp in milliseconds.
+				type:	[int, float]
+
+		keywords:
+			item:
+				desc:	The name of the item that flipped the display, or None.
+				type:	[str, NoneType]
+		"""
+
+		if item is None:
+			index = -1
+		else:
+			try:
+				index = self._item_names.index(item)
+			except ValueError:
+				index = len(self._item_names)
+				self._item_names.append(item)
+		self._onsets.append(t)
+		self._intended.append(self._expected)
+		self._items.append(index)
+		self._expected = NAN
+
+	@property
+	def onsets(self):
+
+		"""
+		desc:
+			An array with all flip timestamps.
+		"""
+
+		return self._onsets
+
+	@property
+	def refresh_interval(self):
+
+		"""
+		desc:
+			The refresh interval in milliseconds, or None if the refresh
+			interval is unknown, for example because flips are not
+			synchronized to the vertical refresh. If the refresh interval has
+			not been specified or calibrated, it is estimated as the median of
+			the intervals between back-to-back flips.
+		"""
+
+		if self._refresh_interval is not None or self._calibrated:
+			return self._refresh_interval
+		intervals = [
+			t2 - t1 for t1, t2 in zip(self._onsets, self._onsets[1:])
+			if t2 - t1 >= MIN_REFRESH_INTERVAL
+		]
+		if not intervals:
+			return None
+		# Intervals that are much longer than the shortest interval are not
+		# back-to-back flips
+		shortest = min(intervals)
+		intervals = sorted(i for i in intervals if i < 1.5 * shortest)
+		return intervals[len(intervals) // 2]
+
+	def calibrate(self, canvas, flips):
+
+		"""
+		desc:
+			Estimates the refresh interval as the median interval between
+			flips while showing a canvas several times in a row.
+
+		arguments:
+			canvas:
+				desc:	The canvas to show.
+				type:	Canvas
+			flips:
+				desc:	The number of times to show the canvas.
+				type:	int
+		"""
+
+		first = len(self._onsets)
+		for i in range(flips):
+			canvas.show()
+		onsets = self._onsets[first:]
+		intervals = sorted(t2 - t1 for t1, t2 in zip(onsets, onsets[1:]))
+		refresh = intervals[len(intervals) // 2]
+		self._refresh_interval = \
+			refresh if refresh >= MIN_REFRESH_INTERVAL else None
+		self._calibrated = True
+
+	def summary(self):
+
+		"""
+		desc:
+			Summarizes the recorded flips per item. Flips that were not
+			triggered by an item, such as calibration flips, are not included.
+
+		returns:
+			desc:	An OrderedDict with item names as keys, and dicts with the
+					number of `flips`, the number of flips with an intended
+					onset (`timed`), the number of `late` flips, the number of
+					`dropped` frames, and the `max_delay` in milliseconds
+					relative to the intended onset as values.
+			type:	OrderedDict
+		"""
+
+		refresh = self.refresh_interval
+		summary = OrderedDict(
+			(name, {
+				u'flips': 0,
+				u'timed': 0,
+				u'late': 0,
+				u'dropped': 0,
+				u'max_delay': NAN
+			})
+			for name in self._item_names
+		)
+		for t, intended, index in zip(self._onsets, self._intended,
+				self._items):
+			if index < 0:
+				continue
+			d = summary[self._item_names[index]]
+			d[u'flips'] += 1
+			if intended != intended:
+				continue
+			d[u'timed'] += 1
+			delay = t - intended
+			if not delay <= d[u'max_delay']:
+				d[u'max_delay'] = delay
+			# A flip normally occurs within one refresh interval of the
+			# intended onset. Without a refresh interval, every delay of at
+			# least MIN_REFRESH_INTERVAL counts as late.
+			if refresh is None:
+				if delay >= MIN_REFRESH_INTERVAL:
+					d[u'late'] += 1
+				continue
+			dropped = int(delay // refresh)
+			if dropped > 0:
+				d[u'late'] += 1
+				d[u'dropped'] += dropped
+		return summary
+
+	def log_summary(self):
+
+		"""
+		desc:
+			Writes the summary to the log.
+		"""
+
+		refresh = self.refresh_interval
+		if refresh is None:
+			oslogger.info(u'frame timing: refresh interval unknown')
+		else:
+			oslogger.info(u'frame timing: refresh interval %.2f ms' % refresh)
+		for name, d in self.summary().items():
+			oslogger.info(u'frame timing: %(name)s: %(flips)d flips, '
+				u'%(timed)d timed, %(late)d late, %(dropped)d dropped frames, '
+				u'max delay %(max_delay).2f ms' % dict(d, name=name))
+
+
+def init_frame_timer(experiment, cls):
+
+	"""
+	desc:
+		Starts recording flips before the experiment begins, if the
+		`canvas_frame_timing` experiment variable is 'yes'. The refresh
+		interval is estimated by showing a blank canvas a number of times, as
+		specified by the `canvas_frame_timing_calibration` experiment variable
+		(default: 30).
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+		cls:
+			desc:	The canvas backend class.
+			type:	type
+	"""
+
+	global frame_timer
+
+	if experiment.var.get(u'canvas_frame_timing', u'no') != u'yes':
+		return
+	frame_timer = FrameTimer()
+	flips = experiment.var.get(u'canvas_frame_timing_calibration', 30)
+	if isinstance(flips, int) and flips > 1:
+		frame_timer.calibrate(cls(experiment), flips)
+	if frame_timer.refresh_interval is None:
+		oslogger.info(u'recording frame timing, refresh interval unknown')
+	else:
+		oslogger.info(u'recording frame timing, refresh interval %.2f ms'
+			% frame_timer.refresh_interval)
+
+
+def close_frame_timer(experiment):
+
+	"""
+	desc:
+		Logs the frame-timing summary (if any) after the experiment is
+		finished.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global frame_timer
+
+	if frame_timer is None:
+		return
+	frame_timer.log_summary()
+	frame_timer = None
+
+
+def log_item(experiment, item):
+
+	"""
+	desc:
+		Stores the frame-timing summary of an item as experiment variables,
+		so that it is written to the log file by the next logger. The summary
+		is stored as `frame_timing_[item]_flips`, `frame_timing_[item]_late`,
+		`frame_timing_[item]_dropped`, etc., and covers all flips of the item
+		so far. The refresh interval is stored as
+		`frame_timing_refresh_interval`. Unknown values are stored as 'NA'.
+		Nothing is stored if frame timing is disabled.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+		item:
+			desc:	The name of the item.
+			type:	str
+	"""
+
+	if frame_timer is None:
+		return
+	summary = frame_timer.summary().get(item)
+	if summary is None:
+		return
+	refresh = frame_timer.refresh_interval
+	experiment.var.set(u'frame_timing_refresh_interval',
+		u'NA' if refresh is None else refresh)
+	for key, value in summary.items():
+		# The maximum delay is nan if none of the flips had an intended onset
+		experiment.var.set(u'frame_timing_%s_%s' % (item, key),
+			u'NA' if value != value else value)
+
+
+def expect(t):
+
+	"""
+	desc:
+		Sets the intended onset of the next flip, if frame timing is enabled.
+
+	arguments:
+		t:
+			desc:	A timestamp in milliseconds.
+			type:	[int, float]
+	"""
+
+	if frame_timer is not None:
+		frame_timer.expect(t)
+
+
+def record(t, item=None):
+
+	"""
+	desc:
+		Records a flip, if frame timing is enabled.
+
+	arguments:
+		t:
+			desc:	The flip timestamp in milliseconds.
+			type:	[int, float]
+
+	keywords:
+		item:
+			desc:	The name of the item that flipped the display, or None.
+			type:	[str, NoneType]
+	"""
+
+	if frame_timer is not None:
+		frame_timer.record(t, item)
@@ -0,0 +1,126 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+import os
+import pygame
+from openexp._canvas.legacy import Legacy
+from openexp._clock.headless import virtual_time
+from libopensesame.oslogging import oslogger
+
+# The environment variables that are changed to render off-screen, and their
+# original values, which are restored when the display is closed
+_environ = {
+	u'SDL_VIDEODRIVER': u'dummy',
+	u'QT_QPA_PLATFORM': u'offscreen'
+}
+_original_environ = {}
+
+
+class Headless(Legacy):
+
+	"""
+	desc:
+		This is a canvas backend that renders off-screen, so that it does not
+		need a display. It is identical to the legacy backend, except that the
+		display is a PyGame surface in memory that is not flipped to the
+		screen. Rendered canvases can be retrieved as NumPy arrays.
+
+		For function specifications and docstrings, see
+		`openexp._canvas.canvas`.
+	"""
+
+	settings = {}
+
+	def show(self):
+
+		self._wait_prepared()
+		self._repaint_dirty()
+		self.experiment.surface.blit(self.surface, (0, 0))
+		self.experiment.last_shown_canvas = self.surface
+		return self._flipped(virtual_time())
+
+	# The legacy backend uses a different show() function on Mac OS, which is
+	# not necessary when rendering off-screen
+	_show_macos = show
+
+	def to_array(self):
+
+		"""
+		desc:
+			Gets the contents of the canvas as an array.
+
+		returns:
+			desc:	A height x width x 3 array of uint8 RGB values.
+			type:	ndarray
+		"""
+
+		self._wait_prepared()
+		self._repaint_dirty()
+		return pygame.surfarray.array3d(self.surface).swapaxes(0, 1)
+
+	@staticmethod
+	def screenshot(experiment):
+
+		"""
+		desc:
+			Gets the contents of the off-screen display, i.e. the canvas that
+			was shown most recently, as an array.
+
+		arguments:
+			experiment:
+				desc:	The experiment object.
+				type:	experiment
+
+		returns:
+			desc:	A height x width x 3 array of uint8 RGB values.
+			type:	ndarray
+		"""
+
+		return pygame.surfarray.array3d(experiment.surface).swapaxes(0, 1)
+
+	@staticmethod
+	def init_display(experiment):
+
+		# The video driver can only be changed when the display is not
+		# initialized
+		pygame.display.quit()
+		for key, value in _environ.items():
+			_original_environ[key] = os.environ.get(key, None)
+			os.environ[key] = value
+		pygame.init()
+		experiment.window = pygame.display.set_mode(experiment.resolution())
+		experiment.surface = pygame.display.get_surface()
+		oslogger.info(u'rendering off-screen at %dx%d'
+			% experiment.resolution())
+
+	@staticmethod
+	def close_display(experiment):
+
+		Legacy.close_display(experiment)
+		for key, value in _original_environ.items():
+			if value is None:
+				os.environ.pop(key, None)
+			else:
+				os.environ[key] = value
+		_original_environ.clear()
+
+
+# Non PEP-8 alias for backwards compatibility
+headless = Headless
@@ -25,6 +25,7 @@ import platform
 from openexp.backend import configurable
 from openexp._canvas.canvas import Canvas
 from openexp._coordinates.legacy import Legacy as LegacyCoordinates
+from openexp._canvas.prerenderer import render_lock
 from libopensesame.oslogging import oslogger
 
 # PyGame 1.9.2 suffers from character encoding issues. To get around those, we
@@ -74,12 +75,21 @@ class Legacy(Canvas, LegacyCoordinates):
 			u"default" : u"auto",
 			}
 		}
+	threadsafe_prepare = True
 
 	def __init__(self, experiment, auto_prepare=True, **style_args):
 
 		Canvas.__init__(self, experiment, auto_prepare=auto_prepare,
 			**style_args)
 		LegacyCoordinates.__init__(self)
+		# Elements that have changed, and areas of the surface that need to be
+		# repainted, since the last call to show()
+		self._dirty_elements = []
+		self._dirty_rects = []
+		self._scratch_surface = None
+		# Indicates whether the surface is shared with another canvas, as a
+		# result of copy(), in which case it is copied before it is drawn on
+		self._surface_shared = False
 		self.antialias = True
 		self.surface = self.experiment.surface.copy()
 		self.clear()
@@ -88,10 +98,12 @@ class Legacy(Canvas, LegacyCoordinates):
 
 	def show(self):
 
+		self._wait_prepared()
+		self._repaint_dirty()
 		self.experiment.surface.blit(self.surface, (0, 0))
 		self.experiment.last_shown_canvas = self.surface
 		pygame.display.flip()
-		return pygame.time.get_ticks()
+		return self._flipped(pygame.time.get_ticks())
 
 	def _show_macos(self):
 
@@ -104,11 +116,13 @@ class Legacy(Canvas, LegacyCoordinates):
 			hack which is only used on Mac OS.
 		"""
 
+		self._wait_prepared()
+		self._repaint_dirty()
 		self.experiment.surface.blit(self.surface, (0, 0))
 		self.experiment.last_shown_canvas = self.surface
 		pygame.display.flip()
 		pygame.event.pump()
-		return pygame.time.get_ticks()
+		return self._flipped(pygame.time.get_ticks())
 
 	def prepare(self):
 
@@ -120,8 +134,21 @@ class Legacy(Canvas, LegacyCoordinates):
 			[canvas.__init__].
 		"""
 
-		self.surface.fill(self.background_color.backend_color)
-		Canvas.prepare(self)
+		with render_lock:
+			self._dirty_elements = []
+			self._dirty_rects = []
+			self._own_surface()
+			self.surface.fill(self.background_color.backend_color)
+			Canvas.prepare(self)
+
+	def __delitem__(self, key):
+
+		self._wait_prepared()
+		self._dirty_rects += [
+			e._drawn_rect for e in self._leaves(self._elements[key])
+			if e._drawn_rect is not None
+		]
+		Canvas.__delitem__(self, key)
 
 	def lower_to_bottom(self, element):
 
@@ -135,10 +162,149 @@ class Legacy(Canvas, LegacyCoordinates):
 
 	def redraw(self):
 
+		self._wait_prepared()
 		if not self.auto_prepare:
 			return
 		self.prepare()
 
+	def invalidate(self, element):
+
+		"""
+		visible: False
+
+		desc:
+			Marks an element as changed, so that the area that it covers
+			is repainted on the next call to show(). Changes are coalesced, so
+			that an element that changes several times between two calls to
+			show() is repainted only once.
+
+		arguments:
+			element:
+				desc:	The changed element.
+				type:	LegacyElement
+		"""
+
+		self._wait_prepared()
+		if not self.auto_prepare:
+			return
+		if element not in self._dirty_elements:
+			self._dirty_elements.append(element)
+
+	def _repaint_dirty(self):
+
+		"""
+		visible: False
+
+		desc:
+			Repaints only those areas of the surface that are covered by
+			changed elements, either before or after the change. Overlapping
+			areas are merged, and each area is repainted by filling it with the
+			background color and redrawing all elements that overlap with it,
+			in the normal drawing order.
+		"""
+
+		if not self._dirty_elements and not self._dirty_rects:
+			return
+		with render_lock:
+			self._own_surface()
+			rects = self._dirty_rects + [
+				e._drawn_rect for e in self._dirty_elements
+				if e._drawn_rect is not None
+			]
+			visible = [
+				e for name, element in self._elements.items()
+				if element.visible for e in self._leaves(element)
+			]
+			visible_set = set(visible)
+			# Elements are drawn onto a scratch surface, from which only the
+			# repainted areas are copied. Drawing directly onto a clipped
+			# surface is not an option, because pygame draws some shapes, such
+			# as thick lines, slightly differently when they are clipped.
+			surface = self.surface
+			if self._scratch_surface is None \
+				or self._scratch_surface.get_size() != surface.get_size():
+				self._scratch_surface = surface.copy()
+			self.surface = self._scratch_surface
+			try:
+				# Draw the changed elements once to find out which area they
+				# now cover.
+				for e in self._dirty_elements:
+					e._drawn_rect = None
+					if e in visible_set:
+						e.prepare()
+						if e._drawn_rect is not None:
+							rects.append(e._drawn_rect)
+				for rect in self._coalesce(rects):
+					self.surface.fill(self.background_color.backend_color,
+						rect)
+					for e in visible:
+						if e._drawn_rect is None \
+							or e._drawn_rect.colliderect(rect):
+							e.prepare()
+					surface.blit(self.surface, rect, rect)
+			finally:
+				self.surface = surface
+			self._dirty_elements = []
+			self._dirty_rects = []
+
+	@staticmethod
+	def _coalesce(rects):
+
+		"""
+		visible: False
+
+		desc:
+			Merges overlapping rects.
+
+		arguments:
+			rects:
+				desc:	A list of rects.
+				type:	list
+
+		returns:
+			desc:	A list of non-overlapping pygame.Rect objects.
+			type:	list
+		"""
+
+		merged = []
+		for rect in rects:
+			rect = pygame.Rect(rect)
+			if not rect.w or not rect.h:
+				continue
+			i = rect.collidelist(merged)
+			while i >= 0:
+				rect.union_ip(merged.pop(i))
+				i = rect.collidelist(merged)
+			merged.append(rect)
+		return merged
+
+	@classmethod
+	def _leaves(cls, element):
+
+		"""
+		visible: False
+
+		desc:
+			Recursively iterates through an element, so that groups are
+			flattened into the elements that they contain.
+
+		arguments:
+			element:
+				desc:	An element or a group.
+				type:	Element
+
+		returns:
+			desc:	A generator of elements that are not groups.
+			type:	generator
+		"""
+
+		for e in element:
+			if e is element:
+				yield e
+			else:
+				for leaf in cls._leaves(e):
+					yield leaf
+
 	def set_config(self, **cfg):
 
 		Canvas.set_config(self, **cfg)
@@ -147,12 +313,41 @@ class Legacy(Canvas, LegacyCoordinates):
 
 	def copy(self, canvas):
 
-		self.surface = canvas.surface.copy()
-		Canvas.copy(self, canvas)
+		self._wait_prepared()
+		canvas._wait_prepared()
+		canvas._repaint_dirty()
+		# The surface is shared until either canvas draws on it
+		self.surface = canvas.surface
+		self._surface_shared = canvas._surface_shared = True
+		self._dirty_elements = []
+		self._dirty_rects = []
+		# Canvas.copy() is not used, because it calls set_config(), which
+		# would needlessly redraw the shared surface.
+		self._share_elements(canvas)
+		Canvas.set_config(self, **canvas.get_config())
+
+	def _own_surface(self):
+
+		"""
+		visible: False
+
+		desc:
+			Gives the canvas its own surface if the surface is shared with
+			another canvas as a result of copy().
+		"""
+
+		if not self._surface_shared:
+			return
+		self.surface = self.surface.copy()
+		self._surface_shared = False
 
 	@configurable
 	def clear(self):
 
+		self._wait_prepared()
+		self._dirty_elements = []
+		self._dirty_rects = []
+		self._own_surface()
 		self.surface.fill(self.background_color.backend_color)
 		self._elements = {}
 
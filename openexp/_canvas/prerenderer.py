@@ -0,0 +1,225 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+import threading
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+
+# Backends that support prerendering hold this lock while canvases and their
+# elements are prepared, so that the main thread and the prerenderer thread
+# never draw at the same time.
+render_lock = threading.RLock()
+# The active Prerenderer, or None if prerendering is disabled
+prerenderer = None
+
+
+class PrerenderJob(object):
+
+	"""
+	desc:
+		A canvas that is waiting to be, or has been, prepared in the background.
+	"""
+
+	def __init__(self, canvas):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			canvas:
+				desc:	The canvas to prepare.
+				type:	Canvas
+		"""
+
+		self.canvas = canvas
+		self._done = threading.Event()
+		self._exception = None
+
+	def run(self):
+
+		"""
+		desc:
+			Prepares the canvas. This is called from the prerenderer thread.
+			Exceptions are not raised here, but when the job is waited for.
+		"""
+
+		try:
+			self.canvas.prepare()
+		except Exception as e:
+			self._exception = e
+		finally:
+			self._done.set()
+
+	def wait(self):
+
+		"""
+		desc:
+			Waits until the canvas has been prepared, and re-raises the
+			exception that occurred during preparation (if any).
+		"""
+
+		self._done.wait()
+		if self._exception is not None:
+			raise self._exception
+
+
+class Prerenderer(threading.Thread):
+
+	"""
+	desc:
+		A thread that prepares (rasterizes) canvases in the background, in the
+		order in which they are submitted.
+	"""
+
+	def __init__(self, size):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			size:
+				desc:	The maximum number of canvases that can wait to be
+						prepared.
+				type:	int
+		"""
+
+		super(Prerenderer, self).__init__()
+		self.daemon = True
+		self._queue = queue.Queue(maxsize=size)
+
+	def submit(self, canvas):
+
+		"""
+		desc:
+			Submits a canvas for preparation.
+
+		arguments:
+			canvas:
+				desc:	The canvas to prepare.
+				type:	Canvas
+
+		returns:
+			desc:	A PrerenderJob, or None if too many canvases are already
+					waiting to be prepared.
+			type:	[PrerenderJob, NoneType]
+		"""
+
+		job = PrerenderJob(canvas)
+		try:
+			self._queue.put_nowait(job)
+		except queue.Full:
+			return None
+		return job
+
+	def run(self):
+
+		"""
+		desc:
+			Prepares canvases until the prerenderer is stopped.
+		"""
+
+		while True:
+			job = self._queue.get()
+			if job is None:
+				break
+			job.run()
+
+	def stop(self):
+
+		"""
+		desc:
+			Stops the prerenderer after all waiting canvases have been
+			prepared.
+		"""
+
+		self._queue.put(None)
+		self.join()
+
+
+def init_prerenderer(experiment):
+
+	"""
+	desc:
+		Starts a prerenderer before the experiment begins, if the
+		`canvas_prerender` experiment variable is larger than 0. This variable
+		indicates how many canvases can be prepared ahead of time.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global prerenderer
+
+	size = experiment.var.get(u'canvas_prerender', 0)
+	if not isinstance(size, int) or size <= 0:
+		return
+	oslogger.info(u'prerendering up to %d canvases in the background' % size)
+	prerenderer = Prerenderer(size)
+	prerenderer.start()
+
+
+def close_prerenderer(experiment):
+
+	"""
+	desc:
+		Stops the prerenderer (if any) after the experiment is finished.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global prerenderer
+
+	if prerenderer is None:
+		return
+	prerenderer.stop()
+	prerenderer = None
+
+
+def submit(canvas):
+
+	"""
+	desc:
+		Submits a canvas to the prerenderer.
+
+	arguments:
+		canvas:
+			desc:	The canvas to prepare.
+			type:	Canvas
+
+	returns:
+		desc:	A PrerenderJob, or None if prerendering is disabled or too many
+				canvases are already waiting to be prepared.
+		type:	[PrerenderJob, NoneType]
+	"""
+
+	if prerenderer is None:
+		return None
+	return prerenderer.submit(canvas)
@@ -101,7 +101,7 @@ class Psycho(Canvas, PsychoCoordinates):
 		for e in self._elements.values():
 			e.show()
 		self.experiment.window.flip(clearBuffer=True)
-		return self.experiment.clock.time()
+		return self._flipped(self.experiment.clock.time())
 
 	def _set_background(self):
 
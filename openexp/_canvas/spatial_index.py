@@ -0,0 +1,167 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+import math
+
+# The size of the grid cells in pixels
+DEFAULT_CELL_SIZE = 64
+# Rects that span more cells than this are not put in the grid, but are always
+# checked, so that huge rects don't take up a lot of memory
+MAX_CELLS = 1024
+
+
+class SpatialIndex(object):
+
+	"""
+	desc:
+		A uniform grid of rects that quickly finds the rects that contain a
+		point. This is used for hit testing, for example to find out which
+		canvas elements or form widgets have been clicked on. The index is
+		static: when rects change, a new index should be created.
+
+	example: |
+		index = SpatialIndex([(u'a', (0, 0, 100, 100)), (u'b', (50, 50, 10, 10))])
+		print(index.candidates(55, 55)) # [u'a', u'b']
+	"""
+
+	def __init__(self, items, cell_size=DEFAULT_CELL_SIZE):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			items:
+				desc:	An iterable of (key, rect) tuples, where rect is an
+						(x, y, w, h) tuple, or None if the key should be a
+						candidate for every point.
+				type:	iterable
+
+		keywords:
+			cell_size:
+				desc:	The size of the grid cells.
+				type:	[int, float]
+		"""
+
+		self._cell_size = cell_size
+		self._cells = {}
+		self._rects = []
+		self._keys = []
+		self._unindexed = []
+		for order, (key, rect) in enumerate(items):
+			self._keys.append(key)
+			self._rects.append(rect)
+			if rect is None:
+				self._unindexed.append(order)
+				continue
+			x1, y1, x2, y2 = self._cell_range(rect)
+			if (x2 - x1 + 1) * (y2 - y1 + 1) > MAX_CELLS:
+				self._unindexed.append(order)
+				continue
+			for cx in range(x1, x2 + 1):
+				for cy in range(y1, y2 + 1):
+					self._cells.setdefault((cx, cy), []).append(order)
+
+	def __len__(self):
+
+		return len(self._keys)
+
+	def candidates(self, x, y):
+
+		"""
+		desc:
+			Gets the keys of all rects that contain a point, as well as all keys
+			without a rect.
+
+		arguments:
+			x:
+				desc:	An X coordinate.
+				type:	[int, float]
+			y:
+				desc:	A Y coordinate.
+				type:	[int, float]
+
+		returns:
+			desc:	A list of keys in the order in which they were added to the
+					index.
+			type:	list
+		"""
+
+		cell = self._cells.get(self._cell(x, y), [])
+		orders = [
+			order for order in cell + self._unindexed
+			if self._contains(self._rects[order], x, y)
+		]
+		return [self._keys[order] for order in sorted(orders)]
+
+	def _cell(self, x, y):
+
+		return (
+			int(math.floor(x / self._cell_size)),
+			int(math.floor(y / self._cell_size))
+		)
+
+	def _cell_range(self, rect):
+
+		x, y, w, h = rect
+		return self._cell(x, y) + self._cell(x + w, y + h)
+
+	@staticmethod
+	def _contains(rect, x, y):
+
+		if rect is None:
+			return True
+		_x, _y, w, h = rect
+		return _x <= x and _x + w >= x and _y <= y and _y + h >= y
+
+
+def element_rect(element):
+
+	"""
+	desc:
+		Gets the bounding rect of a canvas element. For groups, this is the
+		union of the rects of the elements in the group.
+
+	arguments:
+		element:
+			desc:	A canvas element.
+			type:	Element
+
+	returns:
+		desc:	An (x, y, w, h) tuple, or None if the element doesn't have a
+				rect.
+		type:	[tuple, NoneType]
+	"""
+
+	try:
+		return element.rect
+	except NotImplementedError:
+		pass
+	children = list(element)
+	if not children or children == [element]:
+		return None
+	rects = [element_rect(child) for child in children]
+	if None in rects:
+		return None
+	x1 = min(x for x, y, w, h in rects)
+	y1 = min(y for x, y, w, h in rects)
+	x2 = max(x + w for x, y, w, h in rects)
+	y2 = max(y + h for x, y, w, h in rects)
+	return x1, y1, x2 - x1, y2 - y1
@@ -72,7 +72,7 @@ class Xpyriment(Canvas, XpyrimentCoordinates):
 		while elements:
 			e = elements.pop(0)
 			e.show(clear=False, update=not elements)
-		return self.experiment.clock.time()
+		return self._flipped(self.experiment.clock.time())
 
 	def _set_background(self):
 
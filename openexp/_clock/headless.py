@@ -0,0 +1,83 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from openexp._clock.clock import Clock
+import timeit
+
+# The total time that has been skipped by sleeping. This is shared by all
+# headless backends, so that their timestamps are consistent.
+skipped = 0.
+
+
+def virtual_time():
+
+	"""
+	desc:
+		Gives the current time of the virtual clock, which is the real time
+		plus the time that has been skipped by sleeping.
+
+	returns:
+		desc:	A timestamp in milliseconds.
+		type:	float
+	"""
+
+	return 1000. * timeit.default_timer() + skipped
+
+
+def virtual_sleep(ms):
+
+	"""
+	desc:
+		Advances the virtual clock without actually sleeping.
+
+	arguments:
+		ms:
+			desc:	The number of milliseconds to skip.
+			type:	[int, float]
+	"""
+
+	global skipped
+
+	if ms > 0:
+		skipped += ms
+
+
+class Headless(Clock):
+
+	"""
+	desc:
+		A virtual clock for the headless backend. Sleeping returns immediately
+		and advances the clock instead, so that experiments run as fast as
+		possible while timestamps remain consistent.
+
+		For docstrings, see openexp._clock.clock.
+	"""
+
+	def time(self):
+
+		return virtual_time()
+
+	def sleep(self, ms):
+
+		virtual_sleep(ms)
+
+
+# Non PEP-8 alias for backwards compatibility
+headless = Headless
@@ -21,6 +21,17 @@ from libopensesame.py3compat import *
 import webcolors
 import numbers
 from libopensesame.exceptions import osexception
+from openexp.cache import Cache
+
+# The maximum number of color specifications that are memoized
+MAX_CACHED_COLORS = 1024
+
+# Hexadecimal colors by color specification, and (interned) color objects by
+# backend class, experiment, and color specification. Memoization is
+# especially useful because elements construct a color object whenever their
+# color is set, and most of these are the same few colors.
+hex_cache = Cache(max_size=MAX_CACHED_COLORS, sizeof=lambda hexcolor: 1)
+color_cache = Cache(max_size=MAX_CACHED_COLORS, sizeof=lambda color: 1)
 
 
 class Color(object):
@@ -30,8 +41,25 @@ class Color(object):
 		Converts various color specifications to a back-end specific format.
 		Valid color specificatons are described in more detail in
 		openexp._canvas.canvas.canvas.
+
+		Color objects are immutable, and are interned, so that identical color
+		specifications result in the same color object, which is parsed only
+		once.
 	"""
 
+	def __new__(cls, experiment, colorspec):
+
+		key = cls._spec_key(colorspec)
+		if key is None:
+			return object.__new__(cls)
+		key = cls, id(experiment), key
+		self = color_cache.get(key)
+		if self is None:
+			self = object.__new__(cls)
+			self._init(experiment, colorspec)
+			color_cache[key] = self
+		return self
+
 	def __init__(self, experiment, colorspec):
 
 		"""
@@ -47,10 +75,42 @@ class Color(object):
 				type:	[str, unicode, tuple, int]
 		"""
 
-		self.experiment = experiment
-		self.colorspec = colorspec
-		self.hexcolor = self.to_hex(self.colorspec)
-		self.backend_color = self.to_backend_color(self.hexcolor)
+		# Interned colors have already been initialized by __new__()
+		if u'hexcolor' not in self.__dict__:
+			self._init(experiment, colorspec)
+
+	def _init(self, experiment, colorspec):
+
+		"""
+		visible: False
+
+		desc:
+			Initializes the color. This is separate from __init__(), because
+			interned colors are initialized only once.
+		"""
+
+		hexcolor = self.to_hex(colorspec)
+		object.__setattr__(self, u'experiment', experiment)
+		object.__setattr__(self, u'colorspec', colorspec)
+		object.__setattr__(self, u'hexcolor', hexcolor)
+		object.__setattr__(self, u'backend_color',
+			self.to_backend_color(hexcolor))
+
+	def __setattr__(self, name, value):
+
+		raise AttributeError(u'color objects are immutable')
+
+	def __delattr__(self, name):
+
+		raise AttributeError(u'color objects are immutable')
+
+	def __copy__(self):
+
+		return self
+
+	def __deepcopy__(self, memo):
+
+		return self
 
 	def __repr__(self):
 
@@ -62,13 +122,45 @@ class Color(object):
 
 		return self.colorspec
 
+	@staticmethod
+	def _spec_key(colorspec):
+
+		"""
+		visible: False
+
+		desc:
+			Gets a hashable key for a color specification. The types are part
+			of the key, so that for example 255 and 255.0, which are equal but
+			not both valid, have different keys.
+
+		arguments:
+			colorspec:
+				desc:	A color specification.
+				type:	[str, unicode, array-like, int]
+
+		returns:
+			desc:	A key, or None if no key could be created.
+			type:	[tuple, NoneType]
+		"""
+
+		if isinstance(colorspec, (basestring, int)):
+			return type(colorspec), colorspec
+		try:
+			values = tuple(colorspec)
+		except TypeError:
+			return None
+		if not all(isinstance(v, numbers.Number) for v in values):
+			return None
+		return type(colorspec), tuple((type(v), v) for v in values)
+
 	@staticmethod
 	def to_hex(colorspec):
 
 		"""
 		desc:
 			Converts a color specificaton to a seven-character lowercase
-			hexadecimal color string, such as '#ff0000'.
+			hexadecimal color string, such as '#ff0000'. The results are
+			memoized.
 
 		arguments:
 			colorspec:
@@ -79,6 +171,27 @@ class Color(object):
 			desc:	A hexadecimal color specification.
 			type:	unicode
 		"""
+
+		key = Color._spec_key(colorspec)
+		if key is None:
+			return Color._parse_hex(colorspec)
+		hexcolor = hex_cache.get(key)
+		if hexcolor is None:
+			hexcolor = Color._parse_hex(colorspec)
+			hex_cache[key] = hexcolor
+		return hexcolor
+
+	@staticmethod
+	def _parse_hex(colorspec):
+
+		"""
+		visible: False
+
+		desc:
+			Converts a color specificaton to a hexadecimal color string without
+			memoization. See to_hex().
+		"""
+
 		is_rgb = (
 			lambda c: hasattr(c, '__len__')
 			and len(c) == 3
@@ -21,6 +21,42 @@ from libopensesame.py3compat import *
 from openexp._canvas.canvas import Canvas
 from openexp._mouse.mouse import Mouse
 from libopensesame.exceptions import osexception
+import functools
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+
+def array_aware(fnc):
+
+	"""
+	desc:
+		A decorator for `to_xy()` and `from_xy()` functions that only handle
+		scalar coordinates (or separate arrays of x and y coordinates). If the
+		decorated function receives an N x 2 numpy array of (x, y) coordinates,
+		the x and y columns are transformed in a single vectorized operation,
+		and an N x 2 float array is returned.
+
+	arguments:
+		fnc:
+			desc:	The function to decorate.
+			type:	function
+
+	returns:
+		desc:	The decorated function.
+		type:	function
+	"""
+
+	@functools.wraps(fnc)
+	def inner(self, x, y=None):
+
+		if y is None and np is not None and isinstance(x, np.ndarray) \
+			and x.ndim == 2:
+			return np.column_stack(fnc(self, x[:, 0], x[:, 1])).astype(float)
+		return fnc(self, x, y)
+
+	return inner
 
 
 class Coordinates(object):
@@ -97,10 +133,14 @@ class Coordinates(object):
 			back-end specific reference frame. `None` values are taken as the
 			display center.
 
+			An N x 2 numpy array of (x, y) coordinates is converted in a single
+			vectorized operation, and the result is also an N x 2 array. *New
+			in v3.3.0*
+
 		arguments:
 			x:
-				desc:	An x coordinate, or an (x,y) tuple.
-				type:	[float, int, NoneType, tuple]
+				desc:	An x coordinate, an (x,y) tuple, or an N x 2 array.
+				type:	[float, int, NoneType, tuple, ndarray]
 
 		keywords:
 			y:
@@ -108,9 +148,9 @@ class Coordinates(object):
 				type:	[float, int, NoneType]
 
 		returns:
-			desc:	An (x, y) coordinate tuple in the back-end specific
-					reference frame.
-			type:	tuple
+			desc:	An (x, y) coordinate tuple, or an N x 2 array, in the
+					back-end specific reference frame.
+			type:	[tuple, ndarray]
 		"""
 
 		raise NotImplementedError()
@@ -122,10 +162,14 @@ class Coordinates(object):
 			Converts coordinates from the back-end specific reference frame to
 			the OpenSesame reference frame.
 
+			An N x 2 numpy array of (x, y) coordinates is converted in a single
+			vectorized operation, and the result is also an N x 2 array. *New
+			in v3.3.0*
+
 		arguments:
 			x:
-				desc:	An x coordinate, or an (x,y) tuple.
-				type:	[float, int, tuple]
+				desc:	An x coordinate, an (x,y) tuple, or an N x 2 array.
+				type:	[float, int, tuple, ndarray]
 
 		keywords:
 			y:
@@ -133,9 +177,9 @@ class Coordinates(object):
 				type:	[float, int, NoneType]
 
 		returns:
-			desc:	An (x, y) coordinate tuple in the OpenSesame reference
-					frame.
-			type:	tuple
+			desc:	An (x, y) coordinate tuple, or an N x 2 array, in the
+					OpenSesame reference frame.
+			type:	[tuple, ndarray]
 		"""
 
 		raise NotImplementedError()
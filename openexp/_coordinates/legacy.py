@@ -18,7 +18,7 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
-from openexp._coordinates.coordinates import Coordinates
+from openexp._coordinates.coordinates import Coordinates, array_aware
 
 
 class Legacy(Coordinates):
@@ -29,6 +29,7 @@ class Legacy(Coordinates):
 		`openexp._coordinates.coordinates`.
 	"""
 
+	@array_aware
 	def to_xy(self, x, y=None):
 
 		if isinstance(x, tuple):
@@ -38,6 +39,7 @@ class Legacy(Coordinates):
 			return x, y
 		return x + self._xcenter, y + self._ycenter
 
+	@array_aware
 	def from_xy(self, x, y=None):
 
 		if isinstance(x, tuple):
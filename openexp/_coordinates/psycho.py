@@ -18,7 +18,7 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from libopensesame.py3compat import *
-from openexp._coordinates.coordinates import Coordinates
+from openexp._coordinates.coordinates import Coordinates, array_aware
 
 
 class Psycho(Coordinates):
@@ -29,6 +29,7 @@ class Psycho(Coordinates):
 		`openexp._coordinates.coordinates`.
 	"""
 
+	@array_aware
 	def to_xy(self, x, y=None):
 
 		if isinstance(x, tuple):
@@ -40,6 +41,7 @@ class Psycho(Coordinates):
 			return x, -y
 		return x - self._xcenter, self._ycenter - y
 
+	@array_aware
 	def from_xy(self, x, y=None):
 
 		if y is None:
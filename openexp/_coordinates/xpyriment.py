@@ -19,7 +19,7 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 
 from libopensesame.py3compat import *
 from libopensesame.exceptions import osexception
-from openexp._coordinates.coordinates import Coordinates
+from openexp._coordinates.coordinates import Coordinates, array_aware
 
 
 class Xpyriment(Coordinates):
@@ -36,6 +36,7 @@ class Xpyriment(Coordinates):
 		self._xwcenter = self.experiment.expyriment.screen.window_size[0]/2
 		self._ywcenter = self.experiment.expyriment.screen.window_size[1]/2
 
+	@array_aware
 	def to_xy(self, x, y=None):
 
 		if isinstance(x, tuple):
@@ -55,6 +56,7 @@ class Xpyriment(Coordinates):
 			return x + self._xwcenter - self._xcenter, \
 				y + self._ywcenter - self._ycenter
 
+	@array_aware
 	def from_xy(self, x, y=None):
 
 		if isinstance(x, tuple):
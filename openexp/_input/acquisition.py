@@ -0,0 +1,326 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+from openexp._input.event_wait import input_waiter
+from collections import deque
+import threading
+
+# The interval in milliseconds with which the thread checks for new events
+DEFAULT_INTERVAL = 1
+# The maximum number of events that are queued per event type. When a queue is
+# full, the oldest events are dropped, like the PyGame event queue does.
+MAX_QUEUED_EVENTS = 1024
+# The active InputAcquisition, or None if input is not acquired in a thread
+acquisition = None
+
+
+class InputAcquisition(threading.Thread):
+
+	"""
+	desc:
+		A thread that takes keyboard and mouse-button events from the PyGame
+		event queue as soon as they arrive, and timestamps them with the
+		experiment clock. This way, response times are not delayed when the
+		main thread is busy, for example with preparing or showing a canvas,
+		while a response is given.
+
+		Events are stored in a queue per event type. The queues are
+		`collections.deque` objects, which can be appended to by the thread and
+		consumed by the main thread without locking. Every event that is
+		taken from the queue gets a `timestamp` attribute with the time at
+		which the event was acquired. The delay between acquisition and
+		retrieval is recorded.
+
+		Queues hold at most `MAX_QUEUED_EVENTS` events, so that they don't
+		grow without limit when events are not retrieved.
+	"""
+
+	def __init__(self, clock, interval=DEFAULT_INTERVAL):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			clock:
+				desc:	The clock that is used to timestamp events.
+				type:	Clock
+
+		keywords:
+			interval:
+				desc:	The interval in milliseconds with which the thread
+						checks for new events.
+				type:	[int, float]
+		"""
+
+		import pygame
+
+		threading.Thread.__init__(self)
+		self.daemon = True
+		self.clock = clock
+		self.interval = interval
+		self.event_types = (pygame.KEYDOWN, pygame.KEYUP,
+			pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+		self._queues = {
+			event_type: deque(maxlen=MAX_QUEUED_EVENTS)
+			for event_type in self.event_types
+		}
+		self._stopped = threading.Event()
+		self.reset_stats()
+
+	def run(self):
+
+		"""
+		desc:
+			Moves events from the PyGame event queue to the queues of this
+			thread until `stop()` is called.
+		"""
+
+		import pygame
+
+		while not self._stopped.wait(self.interval / 1000.):
+			events = pygame.event.get(self.event_types)
+			if not events:
+				continue
+			t = self.clock.time()
+			for event in events:
+				self._queues[event.type].append(
+					pygame.event.Event(event.type,
+						dict(event.dict, timestamp=t)))
+			input_waiter.notify()
+
+	def stop(self):
+
+		"""
+		desc:
+			Stops the thread. Events that are still queued are put back in the
+			PyGame event queue.
+		"""
+
+		import pygame
+
+		self._stopped.set()
+		self.join()
+		for event in self.flush():
+			pygame.event.post(event)
+
+	def covers(self, event_types):
+
+		"""
+		desc:
+			Checks whether events of the specified types are acquired by this
+			thread.
+
+		arguments:
+			event_types:
+				desc:	A sequence of event types.
+				type:	[list, tuple]
+
+		returns:
+			type:	bool
+		"""
+
+		return all(event_type in self._queues for event_type in event_types)
+
+	def get(self, event_types):
+
+		"""
+		desc:
+			Takes the oldest event of the specified types from the queue. This
+			should only be called by a single thread.
+
+		arguments:
+			event_types:
+				desc:	A sequence of event types.
+				type:	[list, tuple]
+
+		returns:
+			desc:	An event with a `timestamp` attribute, or None if there are
+					no events of the specified types.
+			type:	[Event, NoneType]
+		"""
+
+		queues = [
+			self._queues[event_type] for event_type in event_types
+			if self._queues[event_type]
+		]
+		if not queues:
+			return None
+		# Only this thread removes events from the queues, so the first event
+		# of a non-empty queue doesn't change
+		queue = min(queues, key=lambda queue: queue[0].timestamp)
+		event = queue.popleft()
+		delay = self.clock.time() - event.timestamp
+		self._retrieved += 1
+		self._total_delay += delay
+		self._max_delay = max(self._max_delay, delay)
+		return event
+
+	def unget(self, events):
+
+		"""
+		desc:
+			Puts events back at the front of the queue, so that they are taken
+			again by the next call to `get()`.
+
+		arguments:
+			events:
+				desc:	A list of events that were taken from the queue, in the
+						order in which they were taken.
+				type:	list
+		"""
+
+		for event in reversed(events):
+			self._queues[event.type].appendleft(event)
+
+	def flush(self, event_types=None):
+
+		"""
+		desc:
+			Takes all events of the specified types from the queue.
+
+		keywords:
+			event_types:
+				desc:	A sequence of event types, or None for all event types.
+				type:	[list, tuple, NoneType]
+
+		returns:
+			desc:	A list of events.
+			type:	list
+		"""
+
+		if event_types is None:
+			event_types = self.event_types
+		events = []
+		for event_type in event_types:
+			queue = self._queues[event_type]
+			while queue:
+				events.append(queue.popleft())
+		return events
+
+	def reset_stats(self):
+
+		"""
+		desc:
+			Resets the statistics.
+		"""
+
+		self._retrieved = 0
+		self._total_delay = 0
+		self._max_delay = 0
+
+	def summary(self):
+
+		"""
+		desc:
+			Summarizes how long events were queued before they were retrieved.
+
+		returns:
+			desc:	A dict with the number of `retrieved` events, and the
+					`mean_delay` and `max_delay` between acquisition and
+					retrieval in milliseconds.
+			type:	dict
+		"""
+
+		return {
+			u'retrieved': self._retrieved,
+			u'mean_delay': self._total_delay / self._retrieved
+				if self._retrieved else 0.,
+			u'max_delay': self._max_delay
+		}
+
+	def log_summary(self):
+
+		"""
+		desc:
+			Writes the summary to the log.
+		"""
+
+		oslogger.info(u'input acquisition: %(retrieved)d events, '
+			u'mean delay %(mean_delay).2f ms, max delay %(max_delay).2f ms'
+			% self.summary())
+
+
+def init_acquisition(experiment):
+
+	"""
+	desc:
+		Starts acquiring input in a thread, if the `input_thread` experiment
+		variable is 'yes'. The `input_thread_interval` experiment variable
+		indicates how often the thread checks for new events (default: every
+		millisecond).
+
+		Input can only be acquired in a thread when the display is handled by
+		PyGame with the X11 video driver, which is the default on Linux. On
+		X11, the thread reads events from the connection with the X server.
+		Other video drivers, such as those of Windows and macOS, only receive
+		input for the window when the thread that created it processes
+		messages. The main thread doesn't do this while it waits for
+		acquired input, so on these systems input is acquired by the main
+		thread as usual.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global acquisition
+
+	import pygame
+	from openexp.clock import clock
+
+	if experiment.var.get(u'input_thread', u'no') != u'yes':
+		return
+	if (
+		not pygame.display.get_init()
+		or pygame.display.get_driver() != u'x11'
+	):
+		oslogger.warning(u'input can only be acquired in a thread with the '
+			u'x11 video driver')
+		return
+	acquisition = InputAcquisition(clock(experiment),
+		experiment.var.get(u'input_thread_interval', DEFAULT_INTERVAL))
+	acquisition.start()
+	input_waiter.acquisition = acquisition
+	oslogger.info(u'acquiring input in a thread')
+
+
+def close_acquisition(experiment):
+
+	"""
+	desc:
+		Stops acquiring input (if applicable), and logs the summary.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global acquisition
+
+	if acquisition is None:
+		return
+	input_waiter.acquisition = None
+	acquisition.stop()
+	acquisition.log_summary()
+	acquisition = None
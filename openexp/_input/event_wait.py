@@ -0,0 +1,468 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+import threading
+import timeit
+import time
+
+# The time before a deadline, in milliseconds, during which input is polled
+# continuously instead of waited for, so that the deadline is not overshot
+DEFAULT_SPIN_TIME = 2
+# The longest time, in milliseconds, that is slept at once while waiting for a
+# condition. This is also the longest time that it takes to notice that a
+# condition has become true, unless notify() is called.
+POLL_INTERVAL = 5
+
+
+class InputWaiter(object):
+
+	"""
+	desc:
+		Waits for input without using a CPU core at 100%. Events from the
+		PyGame event queue are waited for with `pygame.event.wait()`, and other
+		conditions are checked periodically while waiting on a condition
+		variable in between. Only during the last few milliseconds before a
+		deadline is input polled continuously, so that a timeout does not
+		overshoot the deadline.
+
+		When input is acquired in a thread (see
+		`openexp._input.acquisition`), keyboard and mouse-button events are
+		taken from the queue of that thread instead of from the PyGame event
+		queue, and the thread wakes up the waiter when events arrive.
+
+		The waiter keeps track of how long it waited, how much of that time it
+		spent polling, and how late timeouts were noticed.
+	"""
+
+	# The InputAcquisition that is active, or None
+	acquisition = None
+
+	def __init__(self, spin_time=DEFAULT_SPIN_TIME):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			spin_time:
+				desc:	The time before a deadline, in milliseconds, during
+						which input is polled continuously.
+				type:	[int, float]
+		"""
+
+		self.spin_time = spin_time
+		self._condition = threading.Condition()
+		self._kept = []
+		self._lock = threading.Lock()
+		self.reset_stats()
+
+	@staticmethod
+	def time():
+
+		"""
+		returns:
+			desc:	A monotonic timestamp in milliseconds.
+			type:	float
+		"""
+
+		return 1000. * timeit.default_timer()
+
+	def wait_event(self, event_types, timeout=None, keep=None):
+
+		"""
+		desc:
+			Waits for an event of one of the specified types to arrive in the
+			PyGame event queue. Events of other types are kept aside, and are
+			put back in the queue by `repost()`, or discarded if they are not
+			of a type that should be kept.
+
+		arguments:
+			event_types:
+				desc:	A sequence of event types.
+				type:	[list, tuple]
+
+		keywords:
+			timeout:
+				desc:	The timeout in milliseconds, or None for no timeout.
+				type:	[int, float, NoneType]
+			keep:
+				desc:	A sequence of event types that are kept aside, or None
+						to keep events of all types.
+				type:	[list, tuple, NoneType]
+
+		returns:
+			desc:	An event, or None if a timeout occurred.
+			type:	[Event, NoneType]
+		"""
+
+		import pygame
+
+		acquisition = self.acquisition
+		if acquisition is not None and acquisition.covers(event_types):
+			return self._wait_acquired(acquisition, event_types, timeout)
+		start = self.time()
+		deadline = None if timeout is None else start + timeout
+		spinning = 0
+		try:
+			while True:
+				now = self.time()
+				remaining = None if deadline is None else deadline - now
+				if remaining is None or remaining > self.spin_time:
+					event = _wait(pygame, POLL_INTERVAL if remaining is None
+						else min(POLL_INTERVAL, remaining - self.spin_time))
+				else:
+					event = pygame.event.poll()
+					spinning += self.time() - now
+				if event.type in event_types:
+					return event
+				if event.type != pygame.NOEVENT:
+					if keep is None or event.type in keep:
+						self._kept.append(event)
+					continue
+				# The queue is always checked at least once, also when the
+				# timeout is 0
+				if remaining is not None and remaining <= 0:
+					if timeout > 0:
+						self._record_timeout(now - deadline)
+					return None
+		finally:
+			# Checking the queue without waiting doesn't count as a wait
+			if timeout is None or timeout > 0:
+				self._record_wait(self.time() - start, spinning)
+
+	def _wait_acquired(self, acquisition, event_types, timeout):
+
+		"""
+		visible: False
+
+		desc:
+			Waits for an event to arrive in the queue of the input-acquisition
+			thread.
+
+		returns:
+			desc:	An event, or None if a timeout occurred.
+			type:	[Event, NoneType]
+		"""
+
+		events = []
+
+		def available():
+			event = acquisition.get(event_types)
+			if event is None:
+				return False
+			events.append(event)
+			return True
+
+		if not self.wait_for(available, timeout=timeout):
+			return None
+		return events[0]
+
+	def flush(self, event_types=None):
+
+		"""
+		desc:
+			Removes the events of the specified types that have been acquired
+			by the input-acquisition thread (if any). This is used to flush
+			keyboard and mouse input in addition to the PyGame event queue.
+
+		keywords:
+			event_types:
+				desc:	A sequence of event types, or None for all event types
+						that are acquired.
+				type:	[list, tuple, NoneType]
+
+		returns:
+			desc:	A list of events.
+			type:	list
+		"""
+
+		acquisition = self.acquisition
+		if acquisition is None:
+			return []
+		return acquisition.flush(event_types)
+
+	def keep(self, event):
+
+		"""
+		desc:
+			Keeps an event aside, so that it is put back in the queue by
+			`repost()`.
+
+		arguments:
+			event:
+				desc:	A PyGame event.
+				type:	Event
+		"""
+
+		self._kept.append(event)
+
+	def repost(self):
+
+		"""
+		desc:
+			Puts the events that were kept aside back in the PyGame event queue,
+			so that they are available to the next keyboard or mouse that
+			collects a response.
+		"""
+
+		import pygame
+
+		kept, self._kept = self._kept, []
+		# Events that have been acquired by the input-acquisition thread have
+		# a timestamp, and go back to the queue of that thread
+		if self.acquisition is not None:
+			self.acquisition.unget(
+				[event for event in kept if hasattr(event, u'timestamp')])
+			kept = [event for event in kept if not hasattr(event, u'timestamp')]
+		for event in kept:
+			pygame.event.post(event)
+
+	def wait_for(self, predicate, timeout=None, expected=None):
+
+		"""
+		desc:
+			Waits until a condition is true. The condition is checked every few
+			milliseconds, and whenever `notify()` is called. Around the time
+			at which the condition is expected to become true, as well as just
+			before the timeout, the condition is checked continuously.
+
+		arguments:
+			predicate:
+				desc:	A function that returns True when the condition is
+						true.
+				type:	callable
+
+		keywords:
+			timeout:
+				desc:	The timeout in milliseconds, or None for no timeout.
+				type:	[int, float, NoneType]
+			expected:
+				desc:	The time, relative to now in milliseconds, at which the
+						condition is expected to become true, or None if this
+						is unknown.
+				type:	[int, float, NoneType]
+
+		returns:
+			desc:	True if the condition became true, False if a timeout
+					occurred.
+			type:	bool
+		"""
+
+		start = self.time()
+		deadline = None if timeout is None else start + timeout
+		expected = None if expected is None else start + expected
+		spinning = 0
+		try:
+			# The condition is checked while holding the lock, so that a
+			# notification cannot arrive unnoticed between checking and waiting
+			with self._condition:
+				while True:
+					t0 = self.time()
+					if predicate():
+						return True
+					now = self.time()
+					if deadline is not None and now >= deadline:
+						if timeout > 0:
+							self._record_timeout(now - deadline)
+						return False
+					sleep = POLL_INTERVAL
+					for t in (deadline, expected):
+						if t is None:
+							continue
+						# Poll continuously from spin_time before until
+						# spin_time after the moment of interest
+						if abs(t - now) <= self.spin_time:
+							sleep = 0
+						elif t > now:
+							sleep = min(sleep, t - now - self.spin_time)
+					if sleep > 0:
+						self._condition.wait(sleep / 1000.)
+					else:
+						spinning += now - t0
+		finally:
+			# Checking without waiting doesn't count as a wait
+			if timeout is None or timeout > 0:
+				self._record_wait(self.time() - start, spinning)
+
+	def sleep(self, ms):
+
+		"""
+		desc:
+			Sleeps, but wakes up early when `notify()` is called.
+
+		arguments:
+			ms:
+				desc:	The duration in milliseconds.
+				type:	[int, float]
+		"""
+
+		with self._condition:
+			self._condition.wait(ms / 1000.)
+
+	def notify(self):
+
+		"""
+		desc:
+			Wakes up all threads that are waiting in `wait_for()` or `sleep()`,
+			for example because new input has become available.
+		"""
+
+		with self._condition:
+			self._condition.notify_all()
+
+	def reset_stats(self):
+
+		"""
+		desc:
+			Resets the statistics.
+		"""
+
+		with self._lock:
+			self._waits = 0
+			self._wait_time = 0
+			self._spin_time = 0
+			self._timeouts = 0
+			self._total_overshoot = 0
+			self._max_overshoot = 0
+
+	def summary(self):
+
+		"""
+		desc:
+			Summarizes how input was waited for.
+
+		returns:
+			desc:	A dict with the number of `waits`, the total `wait_time`
+					and the part of it that was spent polling continuously
+					(`spin_time`) in milliseconds, the number of `timeouts`,
+					and the `mean_latency` and `max_latency` with which
+					timeouts were noticed in milliseconds.
+			type:	dict
+		"""
+
+		with self._lock:
+			return {
+				u'waits': self._waits,
+				u'wait_time': self._wait_time,
+				u'spin_time': self._spin_time,
+				u'timeouts': self._timeouts,
+				u'mean_latency': self._total_overshoot / self._timeouts
+					if self._timeouts else 0.,
+				u'max_latency': self._max_overshoot
+			}
+
+	def log_summary(self):
+
+		"""
+		desc:
+			Writes the summary to the log.
+		"""
+
+		oslogger.info(u'input wait: %(waits)d waits, %(wait_time).0f ms '
+			u'waited, %(spin_time).0f ms polled, %(timeouts)d timeouts, '
+			u'mean latency %(mean_latency).2f ms, '
+			u'max latency %(max_latency).2f ms' % self.summary())
+
+	def _record_wait(self, wait_time, spin_time):
+
+		"""
+		visible: False
+		"""
+
+		with self._lock:
+			self._waits += 1
+			self._wait_time += wait_time
+			self._spin_time += spin_time
+
+	def _record_timeout(self, overshoot):
+
+		"""
+		visible: False
+		"""
+
+		with self._lock:
+			self._timeouts += 1
+			self._total_overshoot += overshoot
+			self._max_overshoot = max(self._max_overshoot, overshoot)
+
+
+def _wait(pygame, ms):
+
+	"""
+	visible: False
+
+	desc:
+		Waits for at most ms milliseconds for an event. PyGame 1 does not
+		support a timeout for `pygame.event.wait()`, in which case the queue is
+		polled every millisecond.
+
+	returns:
+		desc:	An event, which is of type NOEVENT if no event arrived.
+		type:	Event
+	"""
+
+	if ms >= 1:
+		try:
+			return pygame.event.wait(int(ms))
+		except TypeError:
+			pass
+	event = pygame.event.poll()
+	if event.type == pygame.NOEVENT:
+		time.sleep(.001)
+	return event
+
+
+def init_input_waiter(experiment):
+
+	"""
+	desc:
+		Configures the input waiter when the display is initialized. The
+		`input_spin_time` experiment variable indicates how many milliseconds
+		before a timeout input is polled continuously (default: 2).
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	input_waiter.spin_time = experiment.var.get(u'input_spin_time',
+		DEFAULT_SPIN_TIME)
+	input_waiter.reset_stats()
+
+
+def close_input_waiter(experiment):
+
+	"""
+	desc:
+		Logs the summary when the display is closed.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	input_waiter.log_summary()
+
+
+# The input waiter that is shared by all backends
+input_waiter = InputWaiter()
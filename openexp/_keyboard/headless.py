@@ -0,0 +1,119 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+import random
+from collections import deque
+from openexp._keyboard.legacy import Legacy
+from openexp._clock.headless import virtual_time, virtual_sleep
+from openexp.backend import configurable
+
+
+class Headless(Legacy):
+
+	"""
+	desc:
+		This is a keyboard backend that simulates key presses, so that it does
+		not need a display. Key presses can be queued with `simulate()`. If no
+		key presses are queued, a random key from the keylist is pressed after
+		a random response time between the `headless_min_rt` and
+		`headless_max_rt` experiment variables (default: 200 - 1000 ms).
+		Waiting for a response advances the virtual clock instead of actually
+		waiting.
+
+		For function specifications and docstrings, see
+		`openexp._keyboard.keyboard`.
+	"""
+
+	# The queue is shared by all keyboards, just like the event queue of a
+	# real keyboard
+	_queue = deque()
+
+	def simulate(self, key, rt=None):
+
+		"""
+		desc:
+			Queues a simulated key press.
+
+		arguments:
+			key:
+				desc:	The name of the key.
+				type:	str
+
+		keywords:
+			rt:
+				desc:	The response time in milliseconds relative to the start
+						of the next call to get_key(), or None for a random
+						response time.
+				type:	[int, float, NoneType]
+		"""
+
+		self._queue.append((key, rt))
+
+	@configurable
+	def get_key(self):
+
+		return self._get_key_event()
+
+	@configurable
+	def get_key_release(self):
+
+		return self._get_key_event()
+
+	def _get_key_event(self):
+
+		keylist = self.keylist
+		timeout = self.timeout
+		# Queued key presses that are not in the keylist are discarded
+		while self._queue:
+			key, rt = self._queue.popleft()
+			if keylist is None or key in keylist:
+				queued = True
+				break
+		else:
+			key = u'space' if not keylist \
+				else self.synonyms(random.choice(keylist))[0]
+			rt = None
+			queued = False
+		if rt is None:
+			rt = random.uniform(
+				self.experiment.var.get(u'headless_min_rt', 200),
+				self.experiment.var.get(u'headless_max_rt', 1000)
+			)
+		if timeout is not None and rt > timeout:
+			virtual_sleep(timeout)
+			# A queued key press that comes after the timeout is kept for the
+			# next call
+			if queued:
+				self._queue.appendleft((key, rt - timeout))
+			return None, virtual_time()
+		virtual_sleep(rt)
+		return key, virtual_time()
+
+	def get_mods(self):
+
+		return []
+
+	def flush(self):
+
+		return False
+
+
+# Non PEP-8 alias for backwards compatibility
+headless = Headless
@@ -25,6 +25,7 @@ from string import whitespace
 from libopensesame.exceptions import osexception
 from openexp._keyboard.keyboard import Keyboard
 from openexp.backend import configurable
+from openexp._input.event_wait import input_waiter
 
 # Whitespace, backspace, and empty strings are not acceptable names for keys.
 # These should be converted to descriptions, e.g. '\t' to 'tab'
@@ -92,12 +93,21 @@ class Legacy(Keyboard):
 	def _get_key_event(self, event_type):
 
 		start_time = pygame.time.get_ticks()
-		time = start_time
 		keylist = self.keylist
 		timeout = self.timeout
-		while True:
-			time = pygame.time.get_ticks()
-			for event in pygame.event.get(event_type):
+		try:
+			while True:
+				# Block until a key event arrives, rather than polling the
+				# event queue continuously
+				event = input_waiter.wait_event((event_type,),
+					None if timeout is None
+					else start_time + timeout - pygame.time.get_ticks())
+				time = pygame.time.get_ticks()
+				if event is None:
+					return None, time
+				# Events that have been acquired in a thread have been
+				# timestamped when they arrived
+				time = getattr(event, u'timestamp', time)
 				if event.key == pygame.K_ESCAPE:
 					self.experiment.pause()
 				# KEYUP events don't have a unicode property, so in that case
@@ -116,9 +126,9 @@ class Legacy(Keyboard):
 					key = ucode
 				if keylist is None or key in keylist:
 					return key, time
-			if timeout is not None and time-start_time >= timeout:
-				break
-		return None, time
+		finally:
+			# Other events are left in the queue
+			input_waiter.repost()
 
 	def get_mods(self):
 
@@ -149,7 +159,7 @@ class Legacy(Keyboard):
 	def flush(self):
 
 		keypressed = False
-		for event in pygame.event.get():
+		for event in pygame.event.get() + input_waiter.flush():
 			if event.type == KEYDOWN:
 				keypressed = True
 				if event.key == pygame.K_ESCAPE:
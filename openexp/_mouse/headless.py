@@ -0,0 +1,147 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+import random
+from collections import deque
+from openexp._mouse.mouse import Mouse
+from openexp._coordinates.legacy import Legacy as LegacyCoordinates
+from openexp._clock.headless import virtual_time, virtual_sleep
+from openexp.backend import configurable
+
+
+class Headless(Mouse, LegacyCoordinates):
+
+	"""
+	desc:
+		This is a mouse backend that simulates clicks, so that it does not need
+		a display. Clicks can be queued with `simulate()`. If no clicks are
+		queued, a random button from the buttonlist is clicked at a random
+		position after a random response time between the `headless_min_rt`
+		and `headless_max_rt` experiment variables (default: 200 - 1000 ms).
+		Waiting for a response advances the virtual clock instead of actually
+		waiting.
+
+		For function specifications and docstrings, see
+		`openexp._mouse.mouse`.
+	"""
+
+	# The queue and the cursor position are shared by all mice, just like for
+	# a real mouse. The position is in display (not canvas) coordinates, and
+	# None means the display center.
+	_queue = deque()
+	_pos = None
+
+	def __init__(self, experiment, **resp_args):
+
+		Mouse.__init__(self, experiment, **resp_args)
+		LegacyCoordinates.__init__(self)
+
+	def simulate(self, button=1, pos=None, rt=None):
+
+		"""
+		desc:
+			Queues a simulated click.
+
+		keywords:
+			button:
+				desc:	The button number.
+				type:	int
+			pos:
+				desc:	An (x, y) tuple with the click position, or None for a
+						random position.
+				type:	[tuple, NoneType]
+			rt:
+				desc:	The response time in milliseconds relative to the start
+						of the next call to get_click(), or None for a random
+						response time.
+				type:	[int, float, NoneType]
+		"""
+
+		if pos is not None:
+			pos = self.to_xy(pos)
+		self._queue.append((button, pos, rt))
+
+	def set_pos(self, pos=(0,0)):
+
+		Headless._pos = self.to_xy(pos)
+
+	@configurable
+	def get_click(self):
+
+		return self._get_mouse_event()
+
+	@configurable
+	def get_click_release(self):
+
+		return self._get_mouse_event()
+
+	def _get_mouse_event(self):
+
+		buttonlist = self.buttonlist
+		timeout = self.timeout
+		# Queued clicks with buttons that are not in the buttonlist are
+		# discarded
+		while self._queue:
+			button, pos, rt = self._queue.popleft()
+			if buttonlist is None or button in buttonlist:
+				queued = True
+				break
+		else:
+			button = 1 if not buttonlist else random.choice(buttonlist)
+			pos = rt = None
+			queued = False
+		if rt is None:
+			rt = random.uniform(
+				self.experiment.var.get(u'headless_min_rt', 200),
+				self.experiment.var.get(u'headless_max_rt', 1000)
+			)
+		if timeout is not None and rt > timeout:
+			virtual_sleep(timeout)
+			# A queued click that comes after the timeout is kept for the next
+			# call
+			if queued:
+				self._queue.appendleft((button, pos, rt - timeout))
+			return None, None, virtual_time()
+		if pos is None:
+			pos = (
+				random.randint(0, self.experiment.var.width - 1),
+				random.randint(0, self.experiment.var.height - 1)
+			)
+		virtual_sleep(rt)
+		Headless._pos = pos
+		return button, self.from_xy(pos), virtual_time()
+
+	def get_pos(self):
+
+		if self._pos is None:
+			return self.none_to_center(None, None), virtual_time()
+		return self.from_xy(self._pos), virtual_time()
+
+	def get_pressed(self):
+
+		return 0, 0, 0
+
+	def flush(self):
+
+		return False
+
+
+# Non PEP-8 alias for backwards compatibility
+headless = Headless
@@ -23,6 +23,7 @@ from openexp._mouse.mouse import Mouse
 from openexp._coordinates.legacy import Legacy as LegacyCoordinates
 from libopensesame.exceptions import osexception
 from openexp.backend import configurable
+from openexp._input.event_wait import input_waiter
 import pygame
 
 
@@ -78,40 +79,51 @@ class Legacy(Mouse, LegacyCoordinates):
 		) == u'yes'
 		pygame.mouse.set_visible(self.visible)
 		start_time = pygame.time.get_ticks()
-		time = start_time
-		while True:
-			time = pygame.time.get_ticks()
-			# Process the input
-			for event in pygame.event.get():
+		try:
+			while True:
+				# Block until a mouse or key event arrives, rather than polling
+				# the event queue continuously. Key presses are left in the
+				# queue, but other events, such as mouse motion, are discarded.
+				event = input_waiter.wait_event((KEYDOWN, event_type),
+					None if timeout is None
+					else start_time + timeout - pygame.time.get_ticks(),
+					keep=())
+				time = pygame.time.get_ticks()
+				if event is None:
+					break
+				# Events that have been acquired in a thread have been
+				# timestamped when they arrived
+				time = getattr(event, u'timestamp', time)
 				if event.type == KEYDOWN:
 					if event.key == pygame.K_ESCAPE:
 						self.experiment.pause()
-						continue
-					pygame.event.post(event)
-				if event.type == event_type:
-					# Check escape sequence. If the top-left and top-right
-					# corner are clicked successively within 2000ms, the
-					# experiment is aborted
-					if (
-						enable_escape and event.pos[0] < 64
-						and event.pos[1] < 64
-					):
-						_time = pygame.time.get_ticks()
-						while pygame.time.get_ticks() - _time < 2000:
-							for event in pygame.event.get():
-								if event.type == event_type:
-									if (
-										event.pos[0] > self.experiment.var.width-64
-										and  event.pos[1] < 64
-									):
-										raise osexception(
-											u"The escape sequence was clicked/ tapped"
-										)
-					if buttonlist is None or event.button in buttonlist:
-						pygame.mouse.set_visible(self._cursor_shown)
-						return event.button, self.from_xy(event.pos), time
-			if timeout is not None and time-start_time >= timeout:
-				break
+					else:
+						input_waiter.keep(event)
+					continue
+				# Check escape sequence. If the top-left and top-right corner
+				# are clicked successively within 2000ms, the experiment is
+				# aborted
+				if enable_escape and event.pos[0] < 64 and event.pos[1] < 64:
+					_time = pygame.time.get_ticks()
+					while True:
+						_event = input_waiter.wait_event((event_type,),
+							_time + 2000 - pygame.time.get_ticks(),
+							keep=(KEYDOWN,))
+						if _event is None:
+							break
+						if (
+							_event.pos[0] > self.experiment.var.width-64
+							and _event.pos[1] < 64
+						):
+							raise osexception(
+								u"The escape sequence was clicked/ tapped"
+							)
+				if buttonlist is None or event.button in buttonlist:
+					pygame.mouse.set_visible(self._cursor_shown)
+					return event.button, self.from_xy(event.pos), time
+		finally:
+			# Key presses are left in the queue
+			input_waiter.repost()
 		pygame.mouse.set_visible(self._cursor_shown)
 		return None, None, time
 
@@ -125,10 +137,17 @@ class Legacy(Mouse, LegacyCoordinates):
 		pygame.event.get()
 		return pygame.mouse.get_pressed()
 
+	def _sample(self):
+
+		# Unlike get_pos() and get_pressed(), this doesn't process events,
+		# which should only be done by the main thread. The mouse state is
+		# updated whenever events are processed.
+		return self.from_xy(pygame.mouse.get_pos()), pygame.mouse.get_pressed()
+
 	def flush(self):
 
 		buttonclicked = False
-		for event in pygame.event.get():
+		for event in pygame.event.get() + input_waiter.flush():
 			if event.type == KEYDOWN and event.key == pygame.K_ESCAPE:
 				self.experiment.pause()
 			if event.type == MOUSEBUTTONDOWN:
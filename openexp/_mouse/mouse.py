@@ -20,6 +20,8 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 from libopensesame.py3compat import *
 from openexp.backend import Backend, configurable
 from libopensesame.exceptions import osexception
+from openexp._mouse.trajectory import Trajectory, DEFAULT_RATE, \
+	DEFAULT_DURATION
 import warnings
 
 
@@ -323,6 +325,76 @@ class Mouse(Backend):
 
 		raise NotImplementedError()
 
+	def trajectory(self, rate=DEFAULT_RATE, duration=DEFAULT_DURATION):
+
+		"""
+		desc: |
+			Creates a `Trajectory` that records the cursor position and the
+			state of the mouse buttons at a fixed rate in a background thread.
+			This requires `numpy`. *New in v3.3.0*
+
+			A `Trajectory` has the following functions and properties:
+
+			- `start()` starts recording, and discards the samples of a
+			  previous recording.
+			- `stop()` stops recording.
+			- `t`, `x`, `y`, and `buttons` are NumPy arrays with the
+			  timestamps, cursor positions, and button states of the samples.
+			  Button states are bit masks, where 1 is the left, 2 the middle,
+			  and 4 the right button.
+			- `summary()` returns a dict with the number of `samples`, the
+			  `duration`, the achieved sampling `rate`, the `max_interval`
+			  between samples, the number of `missed` samples, and the
+			  `path_length`.
+			- `log(prefix='trajectory')` saves the samples to a compressed
+			  NumPy (`.npz`) file next to the log file, and stores the name of
+			  this file (as `[prefix]_file`) and the summary as experiment
+			  variables, which are written to the log file by the next logger.
+
+		keywords:
+			rate:
+				desc:	The sampling rate in Hz.
+				type:	[int, float]
+			duration:
+				desc:	The expected duration of a recording in milliseconds.
+						This determines how much memory is preallocated, but
+						longer recordings are possible.
+				type:	[int, float]
+
+		returns:
+			desc:	A trajectory recorder.
+			type:	Trajectory
+
+		example: |
+			my_mouse = Mouse()
+			trajectory = my_mouse.trajectory(rate=200)
+			trajectory.start()
+			button, position, timestamp = my_mouse.get_click(timeout=3000)
+			trajectory.stop()
+			print(trajectory.summary())
+			trajectory.log()
+		"""
+
+		return Trajectory(self, rate=rate, duration=duration)
+
+	def _sample(self):
+
+		"""
+		visible: False
+
+		desc:
+			Gets the cursor position and the state of the mouse buttons for a
+			trajectory recording. This is called from a background thread, and
+			backends should override it if `get_pos()` or `get_pressed()` are
+			not thread-safe.
+
+		returns:
+			desc:	A ((x, y), (button1, button2, button3)) tuple.
+			type:	tuple
+		"""
+
+		return self.get_pos()[0], self.get_pressed()
+
 	def flush(self):
 
 		"""
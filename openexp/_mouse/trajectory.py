@@ -0,0 +1,322 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.exceptions import osexception
+from libopensesame.oslogging import oslogger
+import threading
+import os
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+# The default sampling rate in Hz
+DEFAULT_RATE = 100
+# The default duration in milliseconds for which memory is preallocated. Longer
+# recordings are possible, but require the arrays to be enlarged.
+DEFAULT_DURATION = 10000
+
+
+class Trajectory(object):
+
+	"""
+	desc:
+		Records the position of the mouse cursor and the state of the mouse
+		buttons at a fixed rate in a background thread. The samples are stored
+		in preallocated NumPy arrays.
+	"""
+
+	def __init__(self, mouse, rate=DEFAULT_RATE, duration=DEFAULT_DURATION):
+
+		"""
+		desc:
+			Constructor. You generally create a `Trajectory` with
+			`Mouse.trajectory()`.
+
+		arguments:
+			mouse:
+				desc:	The mouse to record.
+				type:	Mouse
+
+		keywords:
+			rate:
+				desc:	The sampling rate in Hz.
+				type:	[int, float]
+			duration:
+				desc:	The expected duration of a recording in milliseconds.
+						This determines how much memory is preallocated.
+				type:	[int, float]
+		"""
+
+		if np is None:
+			raise osexception(u'numpy is required to record trajectories')
+		if rate <= 0:
+			raise osexception(u'The sampling rate should be positive')
+		self.mouse = mouse
+		self.rate = rate
+		self._clock = mouse.experiment.clock
+		self._capacity = max(1, int(duration * rate / 1000.) + 1)
+		self._thread = None
+		self._stopped = threading.Event()
+		self._allocate()
+
+	@property
+	def t(self):
+
+		"""
+		desc:
+			An array with the timestamps of the samples in milliseconds.
+		"""
+
+		return self._t[:self._n]
+
+	@property
+	def x(self):
+
+		"""
+		desc:
+			An array with the horizontal cursor positions.
+		"""
+
+		return self._x[:self._n]
+
+	@property
+	def y(self):
+
+		"""
+		desc:
+			An array with the vertical cursor positions.
+		"""
+
+		return self._y[:self._n]
+
+	@property
+	def buttons(self):
+
+		"""
+		desc:
+			An array with the state of the mouse buttons as bit masks, where 1
+			is the left, 2 the middle, and 4 the right button.
+		"""
+
+		return self._buttons[:self._n]
+
+	def __len__(self):
+
+		return self._n
+
+	@property
+	def recording(self):
+
+		"""
+		desc:
+			True while the trajectory is being recorded.
+		"""
+
+		return self._thread is not None
+
+	def start(self):
+
+		"""
+		desc:
+			Starts recording. Samples of a previous recording are discarded.
+		"""
+
+		self.stop()
+		self._allocate()
+		self._stopped.clear()
+		self._thread = threading.Thread(target=self._record)
+		self._thread.daemon = True
+		self._thread.start()
+
+	def stop(self):
+
+		"""
+		desc:
+			Stops recording (if the trajectory is being recorded).
+		"""
+
+		if self._thread is None:
+			return
+		self._stopped.set()
+		self._thread.join()
+		self._thread = None
+
+	def summary(self):
+
+		"""
+		desc:
+			Summarizes the recorded trajectory.
+
+		returns:
+			desc:	A dict with the number of `samples`, the `duration` of the
+					recording in milliseconds, the achieved sampling `rate` in
+					Hz, the longest interval between samples
+					(`max_interval`) in milliseconds, the number of `missed`
+					samples, and the distance traveled by the cursor
+					(`path_length`).
+			type:	dict
+		"""
+
+		t = self.t
+		duration = float(t[-1] - t[0]) if len(t) > 1 else 0.
+		return {
+			u'samples': len(t),
+			u'duration': duration,
+			u'rate': 1000. * (len(t) - 1) / duration if duration else 0.,
+			u'max_interval': float(np.diff(t).max()) if len(t) > 1 else 0.,
+			u'missed': self._missed,
+			u'path_length':
+				float(np.hypot(np.diff(self.x), np.diff(self.y)).sum())
+		}
+
+	def log(self, prefix=u'trajectory'):
+
+		"""
+		desc: |
+			Saves the trajectory to a compressed NumPy (`.npz`) file next to
+			the log file, and stores the name of this file and the summary as
+			experiment variables, so that they are written to the log file by
+			the next logger. The file contains the timestamps, positions, and
+			button states as the arrays `t`, `x`, `y`, and `buttons`.
+			Timestamps are on the same clock as the timestamps in the log file.
+			The name of the file is stored as `[prefix]_file`, and the summary
+			as `[prefix]_samples`, `[prefix]_duration`, etc.
+
+			Samples are not stored as experiment variables, because a few
+			seconds of recording would make the log file very large.
+
+		keywords:
+			prefix:
+				desc:	The prefix of the variable names and of the file name.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The path to the file.
+			type:	unicode
+		"""
+
+		experiment = self.mouse.experiment
+		path = self._data_path(prefix)
+		np.savez_compressed(path, t=self.t, x=self.x, y=self.y,
+			buttons=self.buttons)
+		experiment.data_files.append(path)
+		var = experiment.var
+		var.set(u'%s_file' % prefix, os.path.basename(path))
+		for name, value in self.summary().items():
+			var.set(u'%s_%s' % (prefix, name), value)
+		return path
+
+	def _data_path(self, prefix):
+
+		"""
+		visible: False
+
+		desc:
+			Gets a path for a new trajectory file, which is based on the path
+			of the log file and is numbered so that existing files are not
+			overwritten.
+
+		arguments:
+			prefix:
+				desc:	The prefix of the file name.
+				type:	[str, unicode]
+
+		returns:
+			type:	unicode
+		"""
+
+		base = os.path.splitext(safe_decode(self.mouse.experiment.logfile))[0]
+		i = 0
+		while True:
+			path = u'%s_%s_%d.npz' % (base, prefix, i)
+			if not os.path.exists(path):
+				return path
+			i += 1
+
+	def _allocate(self):
+
+		"""
+		visible: False
+
+		desc:
+			Allocates empty arrays.
+		"""
+
+		self._t = np.empty(self._capacity)
+		self._x = np.empty(self._capacity)
+		self._y = np.empty(self._capacity)
+		self._buttons = np.empty(self._capacity, dtype=np.uint8)
+		self._n = 0
+		self._missed = 0
+
+	def _enlarge(self):
+
+		"""
+		visible: False
+
+		desc:
+			Doubles the size of the arrays.
+		"""
+
+		self._capacity *= 2
+		self._t = np.resize(self._t, self._capacity)
+		self._x = np.resize(self._x, self._capacity)
+		self._y = np.resize(self._y, self._capacity)
+		self._buttons = np.resize(self._buttons, self._capacity)
+
+	def _record(self):
+
+		"""
+		visible: False
+
+		desc:
+			Takes samples until recording is stopped. This runs in a separate
+			thread. When a sample is taken too late, for example because the
+			system was busy, the samples that should have been taken in the
+			meantime are counted as missed.
+		"""
+
+		interval = 1000. / self.rate
+		next_t = self._clock.time()
+		while True:
+			t = self._clock.time()
+			try:
+				(x, y), b = self.mouse._sample()
+			except Exception as e:
+				oslogger.warning(u'failed to sample mouse: %s' % e)
+				break
+			if self._n == self._capacity:
+				self._enlarge()
+			n = self._n
+			self._t[n] = t
+			self._x[n] = x
+			self._y[n] = y
+			self._buttons[n] = b[0] | b[1] << 1 | b[2] << 2
+			self._n = n + 1
+			next_t += interval
+			delay = next_t - self._clock.time()
+			if delay < 0:
+				missed = int(-delay // interval) + 1
+				self._missed += missed
+				next_t += missed * interval
+				delay += missed * interval
+			if self._stopped.wait(delay / 1000.):
+				break
@@ -0,0 +1,254 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+from libopensesame.exceptions import osexception
+import threading
+import itertools
+import weakref
+try:
+	import pygame.mixer as mixer
+except ImportError:
+	import android.mixer as mixer
+
+# The default number of mixer channels, which is the number of sounds that can
+# play at the same time
+DEFAULT_SIZE = 8
+# The policies for when all channels are in use: stop the sound that started
+# first, stop the sound with the lowest volume, or don't play the new sound
+POLICIES = u'oldest', u'quietest', u'none'
+# The active ChannelPool, or None if sound has not been initialized
+channel_pool = None
+
+
+class ChannelPool(object):
+
+	"""
+	desc:
+		Manages the mixer channels, and keeps track of which sampler plays on
+		which channel, so that samplers can be stopped, paused, and resumed
+		without affecting other samplers.
+	"""
+
+	def __init__(self, size=DEFAULT_SIZE, policy=u'oldest'):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			size:
+				desc:	The number of channels.
+				type:	int
+			policy:
+				desc:	What to do when a channel is requested while all
+						channels are in use: 'oldest' to take the channel of
+						the sound that started first, 'quietest' to take the
+						channel with the lowest volume, or 'none' to not give a
+						channel.
+				type:	[str, unicode]
+		"""
+
+		if policy not in POLICIES:
+			raise osexception(u'Invalid channel-steal policy: %s' % policy)
+		mixer.set_num_channels(size)
+		self.size = size
+		self.policy = policy
+		self._owners = [None] * size
+		self._started = [0] * size
+		self._counter = itertools.count(1)
+		self._lock = threading.Lock()
+
+	def acquire(self, owner):
+
+		"""
+		desc:
+			Gets a free channel for a sampler, or, if all channels are in use,
+			takes a channel from another sampler according to the policy.
+
+		arguments:
+			owner:
+				desc:	The sampler that will play on the channel.
+				type:	Sampler
+
+		returns:
+			desc:	A channel, or None if no channel is available.
+			type:	[Channel, NoneType]
+		"""
+
+		with self._lock:
+			busy = [mixer.Channel(i).get_sound() is not None
+				for i in range(self.size)]
+			if not all(busy):
+				i = busy.index(False)
+			elif self.policy == u'oldest':
+				i = min(range(self.size), key=self._started.__getitem__)
+			elif self.policy == u'quietest':
+				i = min(range(self.size), key=self._volume)
+			else:
+				return None
+			channel = mixer.Channel(i)
+			if busy[i]:
+				oslogger.debug(u'taking over sound channel %d' % i)
+				channel.stop()
+			channel.set_volume(1.)
+			self._owners[i] = weakref.ref(owner)
+			self._started[i] = next(self._counter)
+			return channel
+
+	def _volume(self, i):
+
+		"""
+		visible: False
+
+		desc:
+			Gets the volume of a channel, taking into account the volume of the
+			sound that is playing on it.
+
+		returns:
+			desc:	The volume between 0 and 1.
+			type:	float
+		"""
+
+		channel = mixer.Channel(i)
+		sound = channel.get_sound()
+		if sound is None:
+			return 0.
+		return channel.get_volume() * sound.get_volume()
+
+	def channels(self, owner):
+
+		"""
+		desc:
+			Gets the channels on which a sampler is playing.
+
+		arguments:
+			owner:
+				desc:	The sampler.
+				type:	Sampler
+
+		returns:
+			desc:	A list of channels.
+			type:	list
+		"""
+
+		channels = []
+		with self._lock:
+			for i, ref in enumerate(self._owners):
+				if ref is None or ref() is not owner:
+					continue
+				channel = mixer.Channel(i)
+				# Channel.get_busy() is briefly False when a queued sound takes
+				# over, whereas Channel.get_sound() is not.
+				if channel.get_sound() is None:
+					self._owners[i] = None
+					continue
+				channels.append(channel)
+		return channels
+
+
+def init_channel_pool(experiment):
+
+	"""
+	desc: |
+		Creates the channel pool when the mixer is initialized, based on the
+		following experiment variables:
+
+		- `sampler_polyphony` is the number of sounds that can play at the
+		  same time (default: 8).
+		- `sampler_steal_policy` indicates what happens when a sound is played
+		  while all channels are in use: 'oldest' (the default) stops the
+		  sound that started first, 'quietest' stops the sound with the lowest
+		  volume, and 'none' does not play the new sound.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global channel_pool
+
+	channel_pool = ChannelPool(
+		experiment.var.get(u'sampler_polyphony', DEFAULT_SIZE),
+		experiment.var.get(u'sampler_steal_policy', u'oldest')
+	)
+
+
+def close_channel_pool(experiment):
+
+	"""
+	desc:
+		Removes the channel pool when the mixer is closed.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global channel_pool
+
+	channel_pool = None
+
+
+def acquire(owner):
+
+	"""
+	desc:
+		Gets a channel for a sampler from the channel pool. A default channel
+		pool is created if there is none yet.
+
+	arguments:
+		owner:
+			desc:	The sampler that will play on the channel.
+			type:	Sampler
+
+	returns:
+		desc:	A channel, or None if no channel is available.
+		type:	[Channel, NoneType]
+	"""
+
+	global channel_pool
+
+	if channel_pool is None:
+		channel_pool = ChannelPool()
+	return channel_pool.acquire(owner)
+
+
+def channels(owner):
+
+	"""
+	desc:
+		Gets the channels on which a sampler is playing.
+
+	arguments:
+		owner:
+			desc:	The sampler.
+			type:	Sampler
+
+	returns:
+		desc:	A list of channels.
+		type:	list
+	"""
+
+	if channel_pool is None:
+		return []
+	return channel_pool.channels(owner)
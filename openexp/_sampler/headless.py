@@ -0,0 +1,124 @@
+# coding=utf-8
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+import os
+from openexp._sampler.legacy import Legacy
+from openexp._clock.headless import virtual_time, virtual_sleep
+from openexp.backend import configurable
+
+
+class Headless(Legacy):
+
+	"""
+	desc:
+		This is a sampler backend that does not need an audio device. Sounds
+		are loaded and processed as by the legacy backend, but they are not
+		actually played. Instead, playback is simulated with the virtual clock,
+		so that waiting for a sound to finish returns immediately.
+
+		For function specifications and docstrings, see
+		`openexp._sampler.sampler`.
+	"""
+
+	settings = {}
+	# The audio driver before the sound was initialized
+	_original_driver = None
+
+	def __init__(self, experiment, src, **playback_args):
+
+		# The end times of the sounds that are playing, and the time at which
+		# playback was paused. As in the legacy backend, stop(), pause(), and
+		# resume() only affect the sounds of this sampler.
+		self._end_times = []
+		self._paused_at = None
+		Legacy.__init__(self, experiment, src, **playback_args)
+
+	@configurable
+	def play(self, **playback_args):
+
+		self._end_times.append(virtual_time() + self._length())
+		if self.block:
+			self.wait()
+
+	@configurable
+	def play_at(self, t, **playback_args):
+
+		# Playback is simulated, so it can start exactly on time
+		self._end_times.append(max(t, virtual_time()) + self._length())
+		if self.block:
+			self.wait()
+
+	def stop(self):
+
+		del self._end_times[:]
+		self._paused_at = None
+
+	def pause(self):
+
+		if self._paused_at is None:
+			self._paused_at = virtual_time()
+
+	def resume(self):
+
+		if self._paused_at is None:
+			return
+		dt = virtual_time() - self._paused_at
+		self._end_times[:] = [t + dt for t in self._end_times]
+		self._paused_at = None
+
+	def is_playing(self):
+
+		if self._paused_at is not None:
+			return False
+		t = virtual_time()
+		self._end_times[:] = [_t for _t in self._end_times if _t > t]
+		return bool(self._end_times)
+
+	def wait(self):
+
+		if self.is_playing():
+			virtual_sleep(max(self._end_times) - virtual_time())
+			del self._end_times[:]
+
+	@staticmethod
+	def output_latency(experiment):
+
+		return 0.
+
+	@staticmethod
+	def init_sound(experiment):
+
+		# Sounds are still decoded by the mixer, which needs an audio driver
+		Headless._original_driver = os.environ.get(u'SDL_AUDIODRIVER', None)
+		os.environ[u'SDL_AUDIODRIVER'] = u'dummy'
+		Legacy.init_sound(experiment)
+
+	@staticmethod
+	def close_sound(experiment):
+
+		Legacy.close_sound(experiment)
+		if Headless._original_driver is None:
+			os.environ.pop(u'SDL_AUDIODRIVER', None)
+		else:
+			os.environ[u'SDL_AUDIODRIVER'] = Headless._original_driver
+
+
+# Non PEP-8 alias for backwards compatibility
+headless = Headless
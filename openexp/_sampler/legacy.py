@@ -26,6 +26,10 @@ from libopensesame.oslogging import oslogger
 from libopensesame import misc
 from openexp.keyboard import Keyboard
 from openexp.backend import configurable
+from openexp.cache import Cache
+from openexp._sampler.stream import Stream, stop_all
+from openexp._sampler import channel_pool
+from openexp._input.event_wait import input_waiter
 import os.path
 try:
 	import numpy
@@ -36,6 +40,13 @@ try:
 except ImportError:
 	import android.mixer as mixer
 
+# The default memory cap of the sound cache in bytes
+DEFAULT_CACHE_SIZE = 128 * 1024 ** 2
+# A process-wide cache of decoded sounds, as raw PCM buffers, which is shared by
+# all samplers. Pitch and pan variants are cached as well.
+sound_cache = Cache(max_size=DEFAULT_CACHE_SIZE, sizeof=len)
+
+
 class Legacy(Sampler):
 
 	"""
@@ -70,9 +81,26 @@ class Legacy(Sampler):
 			},
 		}
 
-	def __init__(self, experiment, src, **playback_args):
-
-		if src is not None:
+	# The key of the current sound in the sound cache, or None if the sound
+	# is not cached
+	_sound_key = None
+	# A Stream object for streamed sounds, or None if the sound is loaded into
+	# memory
+	_stream = None
+	# The time at which playback is expected to end, according to
+	# input_waiter.time(), or None if this is unknown
+	_end_time = None
+
+	def __init__(self, experiment, src, stream=False, **playback_args):
+
+		if stream:
+			if not isinstance(src, basestring):
+				raise osexception(u'Only sound files can be streamed')
+			if not os.path.exists(src):
+				raise osexception(u"The file '%s' does not exist" % src)
+			self._stream = Stream(src)
+			self.sound = None
+		elif src is not None:
 			if isinstance(src, basestring):
 				if not os.path.exists(src):
 					raise osexception( \
@@ -88,7 +116,13 @@ class Legacy(Sampler):
 				if not py3 and isinstance(src, str):
 					import sys
 					src = src.encode(misc.filesystem_encoding())
-			self.sound = mixer.Sound(src)
+				# Decoded sounds depend on the mixer settings, which are
+				# therefore part of the key
+				self._sound_key = (src, os.path.getmtime(src),
+					mixer.get_init())
+				self.sound = self._cached_sound(mixer.Sound, src)
+			else:
+				self.sound = mixer.Sound(src)
 		Sampler.__init__(self, experiment, src, **playback_args)
 		self.keyboard = Keyboard(experiment)
 
@@ -99,12 +133,21 @@ class Legacy(Sampler):
 		if u'fade_in' in cfg and cfg[u'fade_in'] is None:
 			cfg[u'fade_in'] = 0
 		Sampler.set_config(self, **cfg)
-		if u'volume' in cfg:
-			self.sound.set_volume(cfg[u'volume'])
+		if self._stream is not None:
+			# Streamed sounds are not processed. The volume and pan are
+			# applied to the mixer channel when playback starts.
+			if cfg.get(u'pitch', 1) != 1:
+				raise osexception(
+					u'The pitch of streamed sounds cannot be changed')
+			return
 		if u'pitch' in cfg:
 			self.adjust_pitch(cfg[u'pitch'])
 		if u'pan' in cfg:
 			self.adjust_pan(cfg[u'pan'])
+		# The volume is set last, because adjusting the pitch and pan creates
+		# a new sound object
+		if u'volume' in cfg:
+			self.sound.set_volume(cfg[u'volume'])
 
 	def adjust_pitch(self, p):
 
@@ -116,12 +159,16 @@ class Legacy(Sampler):
 				u"openexp._sampler.legacy.pitch should be a positive number")
 		if p == 1:
 			return
+		self._set_variant((u'pitch', p), self._pitch, p)
+
+	def _pitch(self, p):
+
 		buf = pygame.sndarray.array(self.sound)
-		_buf = []
-		for i in range(int(float(len(buf)) / p)):
-			_buf.append(buf[int(float(i) * p)])
-		self.sound = pygame.sndarray.make_sound(
-			numpy.array(_buf, dtype=u"int16"))
+		# Resample by taking every p-th sample (nearest lower neighbor), which
+		# is done for all samples at once by indexing with an index array.
+		i = (numpy.arange(int(float(len(buf)) / p)) * float(p)).astype(int)
+		return pygame.sndarray.make_sound(
+			numpy.ascontiguousarray(buf[i], dtype=u"int16"))
 
 	def adjust_pan(self, p):
 
@@ -133,49 +180,209 @@ class Legacy(Sampler):
 				u"openexp._sampler.legacy.pan should be a number or 'left', 'right'")
 		if p == 0:
 			return
+		self._set_variant((u'pan', p), self._pan, p)
+
+	def _pan(self, p):
+
 		buf = pygame.sndarray.array(self.sound)
-		for i in range(len(buf)):
-			l = buf[i][0]
-			r = buf[i][1]
-			if p == "left":
-				r = 0
-			elif p == "right":
-				l = 0
-			elif p < 0:
-				r = int(float(r) / abs(p))
-			else:
-				l = int(float(l) / p)
-			buf[i][0] = l
-			buf[i][1] = r
-		self.sound = pygame.sndarray.make_sound(numpy.array(buf))
+		# One channel is attenuated (or muted) for all frames at once. Values
+		# are clipped, because a pan between -1 and 1 amplifies the channel.
+		if p == u"left":
+			buf[:, 1] = 0
+		elif p == u"right":
+			buf[:, 0] = 0
+		else:
+			channel = 1 if p < 0 else 0
+			info = numpy.iinfo(buf.dtype)
+			buf[:, channel] = numpy.clip(
+				(buf[:, channel] / float(abs(p))).astype(int),
+				info.min, info.max
+			)
+		return pygame.sndarray.make_sound(buf)
+
+	def _cached_sound(self, fnc, *args):
+
+		"""
+		visible: False
+
+		desc:
+			Gets the sound that corresponds to the current sound key from the
+			sound cache. If the sound is not cached, it is created by calling
+			fnc with args, and then added to the cache.
+
+		arguments:
+			fnc:
+				desc:	A function that returns a Sound object.
+				type:	callable
+
+		argument-list:
+			args:	Arguments for fnc.
+
+		returns:
+			desc:	A new Sound object, which is not shared with other
+					samplers.
+			type:	Sound
+		"""
+
+		if self._sound_key is None:
+			return fnc(*args)
+		raw = sound_cache.get(self._sound_key)
+		if raw is not None:
+			return mixer.Sound(buffer=raw)
+		sound = fnc(*args)
+		# get_raw() is not available on all platforms
+		if hasattr(sound, u'get_raw'):
+			sound_cache[self._sound_key] = sound.get_raw()
+		return sound
+
+	def _set_variant(self, variant, fnc, *args):
+
+		"""
+		visible: False
+
+		desc:
+			Replaces the current sound by a variant of it, such as a sound
+			with a different pitch, which is retrieved from the sound cache if
+			possible.
+
+		arguments:
+			variant:
+				desc:	A tuple that describes the variant, and is added to the
+						sound key.
+				type:	tuple
+			fnc:
+				desc:	A function that returns the variant as a Sound object.
+				type:	callable
+
+		argument-list:
+			args:	Arguments for fnc.
+		"""
+
+		if self._sound_key is not None:
+			self._sound_key += variant
+		self.sound = self._cached_sound(fnc, *args)
 
 	@configurable
 	def play(self, **playback_args):
 
-		self.sound.play(maxtime=self.duration, fade_ms=self.fade_in)
+		channel = channel_pool.acquire(self)
+		if channel is None:
+			oslogger.warning(u'no free sound channel, sound not played')
+			return
+		if self._stream is not None:
+			self._stream.play(channel, volume=self.volume,
+				pan=self._pan_volume(), maxtime=self.duration,
+				fade_ms=self.fade_in)
+		else:
+			channel.play(self.sound, maxtime=self.duration,
+				fade_ms=self.fade_in)
+		self._end_time = input_waiter.time() + self._length()
 		if self.block:
 			self.wait()
 
+	def _length(self):
+
+		"""
+		visible: False
+
+		returns:
+			desc:	The duration of playback in milliseconds.
+			type:	float
+		"""
+
+		sound = self.sound if self._stream is None else self._stream
+		length = 1000. * sound.get_length()
+		if self.duration:
+			length = min(length, self.duration)
+		return length
+
+	def _pan_volume(self):
+
+		"""
+		visible: False
+
+		desc:
+			Converts the pan to a (left, right) channel volume, in the same way
+			as adjust_pan() attenuates the channels, except that the volume
+			cannot exceed 1.
+
+		returns:
+			desc:	A (left, right) tuple.
+			type:	tuple
+		"""
+
+		p = self.pan
+		if p == u"left":
+			return 1, 0
+		if p == u"right":
+			return 0, 1
+		if p < 0:
+			return 1, min(1, 1. / abs(p))
+		if p > 0:
+			return min(1, 1. / p), 1
+		return 1, 1
+
 	def stop(self):
 
-		mixer.stop()
+		if self._stream is not None:
+			self._stream.stop()
+		for channel in channel_pool.channels(self):
+			channel.stop()
 
 	def pause(self):
 
-		mixer.pause()
+		# The end of playback cannot be predicted after pausing
+		self._end_time = None
+		for channel in channel_pool.channels(self):
+			channel.pause()
 
 	def resume(self):
 
-		mixer.unpause()
+		for channel in channel_pool.channels(self):
+			channel.unpause()
 
 	def is_playing(self):
 
-		return bool(mixer.get_busy())
+		return bool(channel_pool.channels(self))
 
 	def wait(self):
 
-		while mixer.get_busy():
-			self.keyboard.flush()
+		# Sleep until shortly before the sound is expected to end, while
+		# checking every few milliseconds whether it has been stopped, and
+		# whether the Escape key has been pressed
+		input_waiter.wait_for(self._finished, expected=None
+			if self._end_time is None
+			else self._end_time - input_waiter.time())
+
+	def _finished(self):
+
+		"""
+		visible: False
+
+		returns:
+			desc:	True if playback has finished, False if not.
+			type:	bool
+		"""
+
+		self.keyboard.flush()
+		return not self.is_playing()
+
+	@staticmethod
+	def output_latency(experiment):
+
+		# A sound becomes audible after the buffer has been played
+		return 1000. * experiment.var.sound_buf_size \
+			/ experiment.var.sound_freq
+
+	@classmethod
+	def silence(cls, experiment):
+
+		# On Android, numpy does not exist and this is not supported
+		if numpy is None:
+			raise osexception(u'numpy is required to create silence')
+		return cls(experiment, numpy.zeros(
+			(experiment.var.sound_buf_size, experiment.var.sound_channels),
+			dtype=u'int16'))
 
 	@staticmethod
 	def init_sound(experiment):
@@ -197,10 +404,20 @@ class Legacy(Sampler):
 			mixer.init()
 		except pygame.error:
 			oslogger.error(u'failed to initialize mixer')
+		else:
+			channel_pool.init_channel_pool(experiment)
+		sound_cache.max_size = int(experiment.var.get(u'sound_cache_size',
+			DEFAULT_CACHE_SIZE // 1024 ** 2) * 1024 ** 2)
+		sound_cache.reset_stats()
 
 	@staticmethod
 	def close_sound(experiment):
 
+		oslogger.info(u'sound cache: %(hits)d hits, %(misses)d misses, '
+			u'%(evictions)d evictions, %(items)d items, %(size)d bytes'
+			% sound_cache.stats())
+		stop_all()
+		channel_pool.close_channel_pool(experiment)
 		mixer.quit()
 
 
@@ -61,6 +61,37 @@ class Sampler(Backend):
 		my_sampler = Sampler(src, volume=.5)
 		~~~
 
+		### Streaming long sounds
+
+		By default, a sound file is loaded into memory in its entirety, which
+		can take a lot of memory for long sounds. If you pass `stream=True`,
+		the sound is instead read from disk in small chunks while it is
+		playing. Only `.wav` files with 16-bit samples and the same sampling
+		rate as the sampler back-end can be streamed, and the pitch of a
+		streamed sound cannot be changed. *New in v3.3.0*
+
+		~~~ .python
+		src = pool['narrative.wav']
+		my_sampler = Sampler(src, stream=True)
+		~~~
+
+		### Playing several sounds at the same time
+
+		Several samplers can play at the same time, and each sampler controls
+		only its own sound: `stop()`, `pause()`, `resume()`, `is_playing()`,
+		and `wait()` do not affect other samplers. By default, at most eight
+		sounds can play at the same time. You can change this with the
+		`sampler_polyphony` experiment variable. When a sound is played while
+		all channels are in use, the `sampler_steal_policy` experiment variable
+		determines what happens: `'oldest'` (the default) stops the sound that
+		started first, `'quietest'` stops the sound with the lowest volume,
+		and `'none'` does not play the new sound. *New in v3.3.0*
+
+		~~~ .python
+		var.sampler_polyphony = 16
+		var.sampler_steal_policy = 'quietest'
+		~~~
+
 		### Sampling rate
 
 		If you find that your sample plays to slowly (low pitch) or too quickly
@@ -222,11 +253,65 @@ class Sampler(Backend):
 
 		raise NotImplementedError()
 
+	def play_at(self, t, **playback_args):
+
+		"""
+		desc: |
+			Schedules the sound to start playing at a specific time, and
+			returns right away, unless `block` is `True`. The sound is started
+			slightly before the specified time, to compensate for the latency
+			of the audio output. This makes it possible to synchronize a sound
+			with, for example, the onset of a `Canvas`.
+
+			The intended and estimated onsets of all scheduled sounds are
+			summarized in the log after the experiment has finished.
+
+			*New in v3.3.0*
+
+		arguments:
+			t:
+				desc:	The intended onset, as a timestamp in milliseconds
+						(see [clock.time]).
+				type:	[int, float]
+
+		keyword-dict:
+			playback_args:
+				Optional [playback keywords] that will be used for this call to
+				[sampler.play_at]. This does not affect subsequent operations.
+
+		returns:
+			desc:	A `ScheduledPlayback` object. Its `wait()` function blocks
+					until the sound has started, after which its `onset`
+					property is the estimated onset.
+			type:	ScheduledPlayback
+
+		example: |
+			src = pool[u'my_sound.ogg']
+			my_sampler = Sampler(src)
+			my_canvas = Canvas()
+			my_canvas.fixdot()
+			# Play the sound in 100 ms, and show the canvas at the same time
+			t = clock.time() + 100
+			my_sampler.play_at(t)
+			clock.sleep(t - clock.time())
+			my_canvas.show()
+		"""
+
+		from openexp._sampler import scheduler
+		block = playback_args.pop(u'block', self.block)
+		playback_args[u'block'] = False
+		playback = scheduler.schedule(self, t, playback_args)
+		if block:
+			playback.wait()
+			self.wait()
+		return playback
+
 	def stop(self):
 
 		"""
 		desc:
-			Stops the currently playing sound (if any).
+			Stops the currently playing sound (if any). Sounds of other
+			samplers keep playing.
 
 		example: |
 			src = pool[u'my_sound.ogg']
@@ -278,7 +363,7 @@ class Sampler(Backend):
 
 		"""
 		desc:
-			Checks if a sound is currently playing.
+			Checks if the sound of this sampler is currently playing.
 
 		returns:
 			desc:	True if a sound is playing, False if not.
@@ -325,6 +410,49 @@ class Sampler(Backend):
 			'Use sampler.duration instead.', DeprecationWarning)
 		self.duration = ms
 
+	@staticmethod
+	def output_latency(experiment):
+
+		"""
+		visible: False
+
+		desc:
+			Estimates the time that it takes before sound that is sent to the
+			audio device is audible, which is used to schedule sounds.
+
+		arguments:
+			experiment:
+				desc:	The experiment object.
+				type:	experiment
+
+		returns:
+			desc:	The latency in milliseconds.
+			type:	float
+		"""
+
+		return 0.
+
+	@classmethod
+	def silence(cls, experiment):
+
+		"""
+		visible: False
+
+		desc:
+			Creates a silent sampler, which is used to calibrate the latency.
+
+		arguments:
+			experiment:
+				desc:	The experiment object.
+				type:	experiment
+
+		returns:
+			desc:	A silent sampler.
+			type:	Sampler
+		"""
+
+		raise NotImplementedError()
+
 	@staticmethod
 	def init_sound(experiment):
 
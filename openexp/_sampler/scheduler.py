@@ -0,0 +1,399 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+from libopensesame.exceptions import osexception
+from array import array
+import threading
+import heapq
+import itertools
+
+# The scheduler sleeps until this many milliseconds before a scheduled onset,
+# and then polls the clock, because sleeping is not precise enough
+SPIN_TIME = 2
+# The default number of times that a silent sound is played to calibrate the
+# latency
+DEFAULT_CALIBRATION = 10
+# The active Scheduler, or None if sound has not been initialized
+scheduler = None
+
+
+class ScheduledPlayback(object):
+
+	"""
+	desc:
+		A sampler that is waiting to be, or has been, played at a scheduled
+		time.
+	"""
+
+	def __init__(self, sampler, t, playback_args):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			sampler:
+				desc:	The sampler to play.
+				type:	Sampler
+			t:
+				desc:	The intended onset in milliseconds.
+				type:	[int, float]
+			playback_args:
+				desc:	Playback keywords for Sampler.play().
+				type:	dict
+		"""
+
+		self.sampler = sampler
+		self.t = t
+		self.playback_args = playback_args
+		# The estimated onset, i.e. the time at which playback was started
+		# plus the latency, or None if the sound has not been played (yet)
+		self.onset = None
+		self._done = threading.Event()
+		self._exception = None
+
+	def run(self, clock, latency):
+
+		"""
+		desc:
+			Plays the sound. This is called from the scheduler thread.
+			Exceptions are not raised here, but when the playback is waited
+			for.
+
+		arguments:
+			clock:
+				desc:	The clock object.
+				type:	Clock
+			latency:
+				desc:	The latency in milliseconds.
+				type:	[int, float]
+		"""
+
+		try:
+			t = clock.time()
+			self.sampler.play(**self.playback_args)
+			self.onset = t + latency
+		except Exception as e:
+			self._exception = e
+		finally:
+			self._done.set()
+
+	def cancel(self):
+
+		"""
+		desc:
+			Marks the playback as done without playing the sound.
+		"""
+
+		self._done.set()
+
+	def wait(self):
+
+		"""
+		desc:
+			Waits until the sound has been started, and re-raises the exception
+			that occurred while starting it (if any).
+		"""
+
+		self._done.wait()
+		if self._exception is not None:
+			raise self._exception
+
+
+class Scheduler(threading.Thread):
+
+	"""
+	desc:
+		A thread that starts samplers at scheduled times. Because it takes
+		some time before a sound is audible after it has been started, sounds
+		are started `latency` milliseconds before their intended onset. The
+		intended and estimated onsets are recorded.
+	"""
+
+	def __init__(self, clock, latency=0):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			clock:
+				desc:	The clock object.
+				type:	Clock
+
+		keywords:
+			latency:
+				desc:	The latency in milliseconds.
+				type:	[int, float]
+		"""
+
+		super(Scheduler, self).__init__()
+		self.daemon = True
+		self.latency = latency
+		self._clock = clock
+		self._heap = []
+		self._counter = itertools.count()
+		self._condition = threading.Condition()
+		self._stopped = False
+		self._intended = array(u'd' if py3 else b'd')
+		self._onsets = array(u'd' if py3 else b'd')
+
+	def schedule(self, sampler, t, playback_args):
+
+		"""
+		desc:
+			Schedules a sampler to be played.
+
+		arguments:
+			sampler:
+				desc:	The sampler to play.
+				type:	Sampler
+			t:
+				desc:	The intended onset in milliseconds.
+				type:	[int, float]
+			playback_args:
+				desc:	Playback keywords for Sampler.play().
+				type:	dict
+
+		returns:
+			desc:	The scheduled playback.
+			type:	ScheduledPlayback
+		"""
+
+		playback = ScheduledPlayback(sampler, t, playback_args)
+		with self._condition:
+			# The counter breaks ties between playbacks with the same onset,
+			# so that these are played in the order in which they were
+			# scheduled
+			heapq.heappush(self._heap, (t, next(self._counter), playback))
+			self._condition.notify()
+		return playback
+
+	def run(self):
+
+		"""
+		desc:
+			Plays scheduled samplers until the scheduler is stopped.
+		"""
+
+		while True:
+			with self._condition:
+				while not self._heap and not self._stopped:
+					self._condition.wait()
+				if self._stopped:
+					break
+				start = self._heap[0][0] - self.latency
+				dt = start - self._clock.time()
+				if dt > SPIN_TIME:
+					# Wake up early, and check again, because an earlier
+					# playback may be scheduled in the meantime
+					self._condition.wait((dt - SPIN_TIME) / 1000.)
+					continue
+				t, i, playback = heapq.heappop(self._heap)
+			while self._clock.time() < start:
+				pass
+			playback.run(self._clock, self.latency)
+			if playback.onset is not None:
+				self._intended.append(t)
+				self._onsets.append(playback.onset)
+
+	def stop(self):
+
+		"""
+		desc:
+			Stops the scheduler. Playbacks that have not started yet are
+			cancelled.
+		"""
+
+		with self._condition:
+			self._stopped = True
+			for t, i, playback in self._heap:
+				playback.cancel()
+			del self._heap[:]
+			self._condition.notify()
+		self.join()
+
+	def calibrate(self, sampler, n, output_latency=0):
+
+		"""
+		desc:
+			Sets the latency to the median time that it takes to start a
+			sampler, plus the latency of the audio output.
+
+		arguments:
+			sampler:
+				desc:	A sampler, typically one that plays silence.
+				type:	Sampler
+			n:
+				desc:	The number of times to start the sampler.
+				type:	int
+
+		keywords:
+			output_latency:
+				desc:	The time in milliseconds that it takes before sound
+						that is sent to the audio device is audible, typically
+						the duration of the audio buffer.
+				type:	[int, float]
+		"""
+
+		durations = []
+		for i in range(n):
+			t0 = self._clock.time()
+			sampler.play(block=False)
+			durations.append(self._clock.time() - t0)
+			sampler.stop()
+		durations.sort()
+		self.latency = durations[len(durations) // 2] + output_latency
+
+	def summary(self):
+
+		"""
+		desc:
+			Summarizes the difference between the estimated and the intended
+			onsets of the samplers that have been played.
+
+		returns:
+			desc:	A dict with the number of `played` samplers, and the
+					`mean_error` and `max_error` in milliseconds, which are
+					NaN if no samplers have been played. Positive errors
+					indicate that sounds started too late.
+			type:	dict
+		"""
+
+		errors = [
+			onset - t for t, onset in zip(self._intended, self._onsets)
+		]
+		if not errors:
+			return {
+				u'played': 0,
+				u'mean_error': float(u'nan'),
+				u'max_error': float(u'nan')
+			}
+		return {
+			u'played': len(errors),
+			u'mean_error': sum(errors) / len(errors),
+			u'max_error': max(errors, key=abs)
+		}
+
+	def log_summary(self):
+
+		"""
+		desc:
+			Writes the summary to the log.
+		"""
+
+		summary = self.summary()
+		if not summary[u'played']:
+			return
+		oslogger.info(u'scheduled sounds: %(played)d played, latency '
+			u'%(latency).2f ms, mean error %(mean_error).2f ms, max error '
+			u'%(max_error).2f ms' % dict(summary, latency=self.latency))
+
+
+def init_scheduler(experiment, cls):
+
+	"""
+	desc: |
+		Starts the scheduler before the experiment begins. The latency is
+		taken from the `sampler_latency` experiment variable (in
+		milliseconds) if it is specified, which is useful if the latency has
+		been measured externally, for example with a microphone. Otherwise,
+		the latency is calibrated by playing a silent sound a number of times,
+		as specified by the `sampler_latency_calibration` experiment variable
+		(default: 10).
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+		cls:
+			desc:	The sampler backend class.
+			type:	type
+	"""
+
+	global scheduler
+
+	scheduler = Scheduler(experiment.clock)
+	latency = experiment.var.get(u'sampler_latency', u'')
+	if isinstance(latency, (int, float)):
+		scheduler.latency = latency
+	else:
+		n = experiment.var.get(u'sampler_latency_calibration',
+			DEFAULT_CALIBRATION)
+		output_latency = cls.output_latency(experiment)
+		scheduler.latency = output_latency
+		if isinstance(n, int) and n > 0:
+			try:
+				scheduler.calibrate(cls.silence(experiment), n, output_latency)
+			except Exception as e:
+				oslogger.warning(u'failed to calibrate sampler latency: %s'
+					% e)
+	oslogger.info(u'sampler latency: %.2f ms' % scheduler.latency)
+	scheduler.start()
+
+
+def close_scheduler(experiment):
+
+	"""
+	desc:
+		Stops the scheduler (if any) and logs its summary after the
+		experiment is finished.
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	global scheduler
+
+	if scheduler is None:
+		return
+	scheduler.stop()
+	scheduler.log_summary()
+	scheduler = None
+
+
+def schedule(sampler, t, playback_args):
+
+	"""
+	desc:
+		Schedules a sampler to be played.
+
+	arguments:
+		sampler:
+			desc:	The sampler to play.
+			type:	Sampler
+		t:
+			desc:	The intended onset in milliseconds.
+			type:	[int, float]
+		playback_args:
+			desc:	Playback keywords for Sampler.play().
+			type:	dict
+
+	returns:
+		desc:	The scheduled playback.
+		type:	ScheduledPlayback
+	"""
+
+	if scheduler is None:
+		raise osexception(u'Sound has not been initialized')
+	return scheduler.schedule(sampler, t, playback_args)
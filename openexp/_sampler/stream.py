@@ -0,0 +1,290 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.exceptions import osexception
+import threading
+import weakref
+import wave
+import os
+try:
+	import numpy
+except ImportError:
+	numpy = None
+try:
+	import pygame.mixer as mixer
+except ImportError:
+	import android.mixer as mixer
+
+# The duration of the chunks in which a stream is decoded, in milliseconds
+DEFAULT_CHUNK_SIZE = 500
+# The streams that have been played, so that they can be stopped before the
+# mixer is closed
+streams = weakref.WeakSet()
+
+
+class Stream(object):
+
+	"""
+	desc:
+		Plays a `.wav` file without loading it into memory. The file is
+		decoded in chunks while it is playing. Every chunk is queued on a mixer
+		channel while the previous chunk is playing, so that at most a few
+		chunks are in memory at the same time.
+	"""
+
+	def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			path:
+				desc:	The path to a 16-bit `.wav` file with the same
+						sampling frequency as the mixer.
+				type:	[str, unicode]
+
+		keywords:
+			chunk_size:
+				desc:	The duration of a chunk in milliseconds.
+				type:	[int, float]
+		"""
+
+		if os.path.splitext(path)[1].lower() not in (u'.wav', b'.wav'):
+			raise osexception(u'Only .wav files can be streamed')
+		try:
+			reader = wave.open(path, u'rb')
+		except (wave.Error, EOFError) as e:
+			raise osexception(u'Failed to open %s' % safe_decode(path),
+				exception=e)
+		self._rate = reader.getframerate()
+		self._channels = reader.getnchannels()
+		self._nframes = reader.getnframes()
+		sampwidth = reader.getsampwidth()
+		reader.close()
+		freq, size, channels = mixer.get_init()
+		if sampwidth != 2 or abs(size) != 16:
+			raise osexception(u'Only 16-bit sounds can be streamed')
+		if self._rate != freq:
+			raise osexception(
+				u'Streamed sounds should have a sampling frequency of %d Hz'
+				% freq)
+		if self._channels != channels and numpy is None:
+			raise osexception(
+				u'Streamed sounds should have %d channel(s)' % channels)
+		self._mixer_channels = channels
+		self.path = path
+		self.chunk_frames = int(chunk_size * self._rate / 1000)
+		self._channel = None
+		self._chunks = []
+		self._thread = None
+		self._stopped = threading.Event()
+		self._lock = threading.Lock()
+
+	def get_length(self):
+
+		"""
+		returns:
+			desc:	The length of the sound in seconds.
+			type:	float
+		"""
+
+		return float(self._nframes) / self._rate
+
+	def play(self, channel, volume=1, pan=(1, 1), maxtime=0, fade_ms=0):
+
+		"""
+		desc:
+			Starts playback on a mixer channel. Playback that is still going on
+			is stopped first.
+
+		arguments:
+			channel:
+				desc:	The mixer channel.
+				type:	Channel
+
+		keywords:
+			volume:
+				desc:	The volume between 0 and 1.
+				type:	[int, float]
+			pan:
+				desc:	The (left, right) volume between 0 and 1.
+				type:	tuple
+			maxtime:
+				desc:	The maximum duration in milliseconds, or 0 to play the
+						full sound.
+				type:	[int, float]
+			fade_ms:
+				desc:	The fade-in time in milliseconds.
+				type:	[int, float]
+		"""
+
+		self.stop()
+		reader = wave.open(self.path, u'rb')
+		nframes = self._nframes
+		if maxtime:
+			nframes = min(nframes, int(maxtime * self._rate / 1000))
+		chunk, nframes = self._read(reader, nframes, volume)
+		if chunk is None:
+			reader.close()
+			return
+		self._stopped.clear()
+		self._channel = channel
+		self._chunks = [chunk]
+		self._channel.set_volume(*pan)
+		self._channel.play(chunk, fade_ms=int(fade_ms))
+		self._thread = threading.Thread(target=self._feed,
+			args=(self._channel, reader, nframes, volume))
+		self._thread.daemon = True
+		self._thread.start()
+		streams.add(self)
+
+	def stop(self):
+
+		"""
+		desc:
+			Stops playback (if any).
+		"""
+
+		if self._thread is None:
+			return
+		with self._lock:
+			self._stopped.set()
+			if self._owns_channel():
+				self._channel.stop()
+		self._thread.join()
+		self._thread = None
+
+	def is_playing(self):
+
+		"""
+		returns:
+			desc:	True if the stream is playing, False if not.
+			type:	bool
+		"""
+
+		# Channel.get_busy() is briefly False when one chunk ends and the
+		# next, queued chunk begins, whereas Channel.get_sound() is not.
+		return self._channel is not None and self._owns_channel()
+
+	def _owns_channel(self):
+
+		"""
+		visible: False
+
+		desc:
+			Checks whether one of the chunks of this stream is playing on the
+			channel. This is not the case when playback has finished, or when
+			the channel has been taken over by another sound.
+
+		returns:
+			type:	bool
+		"""
+
+		return self._channel.get_sound() in self._chunks
+
+	def _read(self, reader, nframes, volume):
+
+		"""
+		visible: False
+
+		desc:
+			Decodes the next chunk.
+
+		arguments:
+			reader:
+				desc:	The wave reader.
+				type:	Wave_read
+			nframes:
+				desc:	The number of frames that remain to be played.
+				type:	int
+			volume:
+				desc:	The volume.
+				type:	[int, float]
+
+		returns:
+			desc:	A (Sound, nframes) tuple, where nframes is the number of
+					frames that remain to be played after this chunk. The
+					Sound is None if there are no frames left.
+			type:	tuple
+		"""
+
+		n = min(self.chunk_frames, nframes)
+		buf = reader.readframes(n) if n > 0 else b''
+		if not buf:
+			return None, 0
+		if self._channels != self._mixer_channels:
+			a = numpy.frombuffer(buf, dtype=numpy.int16).reshape(
+				-1, self._channels)
+			if self._mixer_channels == 1:
+				a = a.mean(axis=1)
+			else:
+				a = a[:, :1].repeat(self._mixer_channels, axis=1)
+			buf = a.astype(numpy.int16).tobytes()
+		sound = mixer.Sound(buffer=buf)
+		sound.set_volume(volume)
+		return sound, nframes - n
+
+	def _feed(self, channel, reader, nframes, volume):
+
+		"""
+		visible: False
+
+		desc:
+			Queues chunks on the channel until the end of the sound, or until
+			playback is stopped. This runs in a separate thread.
+		"""
+
+		# Check for a free spot in the queue a few times per chunk
+		interval = .25 * self.chunk_frames / self._rate
+		try:
+			chunk = None
+			while not self._stopped.is_set():
+				if chunk is None:
+					chunk, nframes = self._read(reader, nframes, volume)
+					if chunk is None:
+						break
+				with self._lock:
+					# The channel no longer plays a chunk of this stream if
+					# playback has been stopped, or if the channel has been
+					# taken over by another sound
+					if self._stopped.is_set() or not self._owns_channel():
+						break
+					if channel.get_queue() is None:
+						channel.queue(chunk)
+						# Remember the playing and the queued chunk
+						self._chunks = [channel.get_sound(), chunk]
+						chunk = None
+				if chunk is not None:
+					self._stopped.wait(interval)
+		finally:
+			reader.close()
+
+
+def stop_all():
+
+	"""
+	desc:
+		Stops all streams. This should be done before the mixer is closed,
+		because the mixer cannot be accessed while it is closing.
+	"""
+
+	for stream in list(streams):
+		stream.stop()
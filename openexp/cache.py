@@ -0,0 +1,364 @@
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from libopensesame.py3compat import *
+from libopensesame.oslogging import oslogger
+from collections import OrderedDict
+import threading
+import hashlib
+import os
+
+
+class Cache(object):
+
+	"""
+	desc:
+		A thread-safe least-recently-used cache with a memory cap, hit/miss
+		statistics, and an optional on-disk store. The cache is used to avoid
+		regenerating or reloading stimuli that are expensive to create.
+
+	example: |
+		cache = Cache(max_size=1024**2, sizeof=len)
+		cache[u'key'] = u'value'
+		if u'key' in cache:
+			print(cache[u'key'])
+	"""
+
+	def __init__(self, max_size=None, sizeof=None, store=None):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			max_size:
+				desc:	The maximum total size of the cached values (as
+						determined by `sizeof`), or `None` for no maximum.
+				type:	[int, NoneType]
+			sizeof:
+				desc:	A function that takes a value and returns its size,
+						typically in bytes. If `None`, all values have size 0,
+						so that `max_size` has no effect.
+				type:	[function, NoneType]
+			store:
+				desc:	A `DiskStore` object that values are additionally
+						written to, and read from if they are not in memory,
+						or `None` to keep values in memory only.
+				type:	[DiskStore, NoneType]
+		"""
+
+		self.max_size = max_size
+		self.store = store
+		self._sizeof = (lambda value: 0) if sizeof is None else sizeof
+		self._items = OrderedDict()
+		self._sizes = {}
+		self._size = 0
+		self._lock = threading.RLock()
+		self.reset_stats()
+
+	def __contains__(self, key):
+
+		with self._lock:
+			return key in self._items or (
+				self.store is not None and key in self.store
+			)
+
+	def __getitem__(self, key):
+
+		with self._lock:
+			if key in self._items:
+				self._hits += 1
+				# Move the value to the end, i.e. mark it as most recently used
+				value = self._items.pop(key)
+				self._items[key] = value
+				return value
+			if self.store is not None and key in self.store:
+				try:
+					value = self.store.load(key)
+				except Exception as e:
+					oslogger.warning(u'failed to load %s from %s: %s'
+						% (key, self.store.folder, e))
+				else:
+					self._hits += 1
+					self._disk_hits += 1
+					self._add(key, value)
+					return value
+			self._misses += 1
+			raise KeyError(key)
+
+	def __setitem__(self, key, value):
+
+		with self._lock:
+			self._add(key, value)
+			if self.store is not None:
+				try:
+					self.store.save(key, value)
+				except Exception as e:
+					oslogger.warning(u'failed to save %s to %s: %s'
+						% (key, self.store.folder, e))
+
+	def __delitem__(self, key):
+
+		with self._lock:
+			self._remove(key)
+
+	def __len__(self):
+
+		return len(self._items)
+
+	def get(self, key, default=None):
+
+		"""
+		desc:
+			Gets a value from the cache.
+
+		arguments:
+			key:
+				desc:	The key.
+				type:	object
+
+		keywords:
+			default:
+				desc:	The value to return if the key is not in the cache.
+				type:	object
+
+		returns:
+			The cached value, or `default`.
+		"""
+
+		try:
+			return self[key]
+		except KeyError:
+			return default
+
+	def clear(self):
+
+		"""
+		desc:
+			Removes all values from memory. The on-disk store (if any) is left
+			intact.
+		"""
+
+		with self._lock:
+			self._items.clear()
+			self._sizes.clear()
+			self._size = 0
+
+	def reset_stats(self):
+
+		"""
+		desc:
+			Resets the hit/miss statistics.
+		"""
+
+		self._hits = 0
+		self._disk_hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+	@property
+	def size(self):
+
+		"""
+		desc:
+			The total size of the values that are kept in memory.
+		"""
+
+		return self._size
+
+	def stats(self):
+
+		"""
+		desc:
+			Gets the cache statistics.
+
+		returns:
+			desc:	A dict with the number of `hits` (including `disk_hits`),
+					`disk_hits`, `misses`, and `evictions`, as well as the
+					number of `items` and the total `size` of the values that
+					are kept in memory.
+			type:	dict
+		"""
+
+		return {
+			u'hits': self._hits,
+			u'disk_hits': self._disk_hits,
+			u'misses': self._misses,
+			u'evictions': self._evictions,
+			u'items': len(self._items),
+			u'size': self._size
+		}
+
+	def _add(self, key, value):
+
+		"""
+		visible: False
+
+		desc:
+			Adds a value to memory, and evicts least-recently-used values until
+			the cache fits within max_size. Values that do not fit in the
+			cache by themselves are not kept in memory.
+		"""
+
+		self._remove(key)
+		size = self._sizeof(value)
+		if self.max_size is not None and size > self.max_size:
+			return
+		self._items[key] = value
+		self._sizes[key] = size
+		self._size += size
+		while self.max_size is not None and self._size > self.max_size:
+			self._remove(next(iter(self._items)))
+			self._evictions += 1
+
+	def _remove(self, key):
+
+		"""
+		visible: False
+
+		desc:
+			Removes a value from memory, if it exists.
+		"""
+
+		if key not in self._items:
+			return
+		del self._items[key]
+		self._size -= self._sizes.pop(key)
+
+
+def image_size(image):
+
+	"""
+	desc:
+		Gets the size of a decoded image in bytes. This can be used as the
+		`sizeof` function of a `Cache` for images.
+
+	arguments:
+		image:
+			desc:	A pygame surface or a PIL image.
+			type:	[Surface, Image]
+
+	returns:
+		desc:	The size in bytes.
+		type:	int
+	"""
+
+	if hasattr(image, u'get_bytesize'):
+		return image.get_width() * image.get_height() * image.get_bytesize()
+	w, h = image.size
+	return w * h * len(image.getbands())
+
+
+class DiskStore(object):
+
+	"""
+	desc:
+		A folder in which cached values are stored as files, so that they are
+		preserved across sessions. File names are derived from a hash of the
+		key, so keys should have a stable `repr()`, such as strings and tuples
+		of strings and numbers.
+	"""
+
+	def __init__(self, folder, save, load, suffix=u''):
+
+		"""
+		desc:
+			Constructor. The folder is created if it doesn't exist yet.
+
+		arguments:
+			folder:
+				desc:	The folder.
+				type:	str
+			save:
+				desc:	A function that takes a value and a path, and writes the
+						value to the path.
+				type:	function
+			load:
+				desc:	A function that takes a path and returns a value.
+				type:	function
+
+		keywords:
+			suffix:
+				desc:	A file extension, such as '.png'.
+				type:	str
+		"""
+
+		if not os.path.isdir(folder):
+			os.makedirs(folder)
+		self.folder = folder
+		self._save = save
+		self._load = load
+		self._suffix = suffix
+
+	def path(self, key):
+
+		"""
+		desc:
+			Gets the path for a key.
+
+		arguments:
+			key:
+				desc:	The key.
+				type:	object
+
+		returns:
+			desc:	A path.
+			type:	str
+		"""
+
+		digest = hashlib.sha1(safe_encode(repr(key))).hexdigest()
+		return os.path.join(self.folder, digest + self._suffix)
+
+	def __contains__(self, key):
+
+		return os.path.exists(self.path(key))
+
+	def load(self, key):
+
+		"""
+		desc:
+			Loads a value.
+
+		arguments:
+			key:
+				desc:	The key.
+				type:	object
+
+		returns:
+			The value.
+		"""
+
+		return self._load(self.path(key))
+
+	def save(self, key, value):
+
+		"""
+		desc:
+			Saves a value.
+
+		arguments:
+			key:
+				desc:	The key.
+				type:	object
+			value:
+				desc:	The value.
+				type:	object
+		"""
+
+		self._save(value, self.path(key))
@@ -64,8 +64,16 @@ def init_display(experiment):
 		type:			experiment
 	"""
 
+	from openexp._canvas import canvas as _canvas, prerenderer, frame_timing
+	from openexp._input import event_wait, acquisition
 	cls = backend.get_backend_class(experiment, u'canvas')
 	cls.init_display(experiment)
+	_canvas.init_cache(experiment)
+	if cls.threadsafe_prepare:
+		prerenderer.init_prerenderer(experiment)
+	frame_timing.init_frame_timer(experiment, cls)
+	event_wait.init_input_waiter(experiment)
+	acquisition.init_acquisition(experiment)
 
 
 def close_display(experiment):
@@ -79,8 +87,15 @@ def close_display(experiment):
 		type:			experiment
 	"""
 
+	from openexp._canvas import canvas as _canvas, prerenderer, frame_timing
+	from openexp._input import event_wait, acquisition
+	prerenderer.close_prerenderer(experiment)
+	frame_timing.close_frame_timer(experiment)
+	acquisition.close_acquisition(experiment)
+	event_wait.close_input_waiter(experiment)
 	cls = backend.get_backend_class(experiment, u'canvas')
 	cls.close_display(experiment)
+	_canvas.close_cache(experiment)
 
 
 def clean_up(verbose=False):
@@ -48,4 +48,5 @@ class Gabor(ElementFactory): mod = 'gabor'
 class NoisePatch(ElementFactory): mod = 'noise_patch'
 class RichText(ElementFactory): mod = 'richtext'
 class Arrow(ElementFactory): mod = 'arrow'
+class Dots(ElementFactory): mod = 'dots'
 Text = RichText
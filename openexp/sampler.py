@@ -54,8 +54,12 @@ def init_sound(experiment):
 		type:			experiment
 	"""
 
+	from openexp import synth
+	from openexp._sampler import scheduler
 	cls = backend.get_backend_class(experiment, u'sampler')
 	cls.init_sound(experiment)
+	synth.init_cache(experiment)
+	scheduler.init_scheduler(experiment, cls)
 
 
 def close_sound(experiment):
@@ -69,6 +73,10 @@ def close_sound(experiment):
 		type:			experiment
 	"""
 
+	from openexp import synth
+	from openexp._sampler import scheduler
+	scheduler.close_scheduler(experiment)
+	synth.close_cache(experiment)
 	cls = backend.get_backend_class(experiment, u'sampler')
 	cls.close_sound(experiment)
 
@@ -19,7 +19,9 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 
 from libopensesame.py3compat import *
 from libopensesame.exceptions import osexception
+from libopensesame.oslogging import oslogger
 from openexp.sampler import Sampler
+from openexp.cache import Cache
 try:
 	import numpy as np
 	from scipy import signal
@@ -27,6 +29,12 @@ except:
 	np = None
 	signal = None
 
+# The default memory cap of the waveform cache in bytes
+DEFAULT_CACHE_SIZE = 32 * 1024 ** 2
+# A cache of synthesized waveforms, as read-only int16 arrays, which are keyed
+# by the synth parameters
+waveform_cache = Cache(max_size=DEFAULT_CACHE_SIZE, sizeof=lambda a: a.nbytes)
+
 
 def Synth(experiment, osc="sine", freq=440, length=100, attack=0, decay=5):
 
@@ -59,10 +67,120 @@ def Synth(experiment, osc="sine", freq=440, length=100, attack=0, decay=5):
 			u'Decay must be a numeric value between 0 and the sound length')
 	# We need to multiply the rate by two to get a stereo signal
 	rate = 2*experiment.var.get(u'sampler_frequency', 48100)
-	signal = osc_gen(osc, key_to_freq(freq), length, rate)
-	_envelope = envelope(length, attack, decay, rate)
-	sound = to_int_16(signal * _envelope)
-	return Sampler(experiment, sound)
+	return Sampler(experiment,
+		waveform(osc, key_to_freq(freq), length, attack, decay, rate))
+
+
+def waveform(osc, freq, length, attack, decay, rate):
+
+	"""
+	desc:
+		Synthesizes a waveform, or gets it from the waveform cache. White noise
+		is not cached, because it should be different every time.
+
+	visible:
+		False
+
+	arguments:
+		osc:
+			desc:	The oscillator.
+			type:	[str, unicode]
+		freq:
+			desc:	The frequency in hertz.
+			type:	[int, float]
+		length:
+			desc:	The length in milliseconds.
+			type:	[int, float]
+		attack:
+			desc:	The attack in milliseconds.
+			type:	[int, float]
+		decay:
+			desc:	The decay in milliseconds.
+			type:	[int, float]
+		rate:
+			desc:	The number of samples per second (for both channels).
+			type:	int
+
+	returns:
+		desc:	An int16 array. Cached arrays are shared, and therefore
+				read-only.
+		type:	ndarray
+	"""
+
+	if osc == u'white_noise':
+		return to_int_16(osc_gen(osc, freq, length, rate)
+			* envelope(length, attack, decay, rate))
+	key = osc, freq, length, attack, decay, rate
+	sound = waveform_cache.get(key)
+	if sound is None:
+		sound = to_int_16(osc_gen(osc, freq, length, rate)
+			* envelope(length, attack, decay, rate))
+		sound.flags.writeable = False
+		waveform_cache[key] = sound
+	return sound
+
+
+def init_cache(experiment):
+
+	"""
+	desc: |
+		Configures the waveform cache before the experiment begins, based on
+		the `synth_cache_size` experiment variable (in megabytes), and
+		synthesizes the waveforms of all synth items ahead of time. Items with
+		parameters that contain variables are skipped, because their
+		waveforms are only known during the experiment.
+
+	visible:
+		False
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	waveform_cache.max_size = int(experiment.var.get(u'synth_cache_size',
+		DEFAULT_CACHE_SIZE // 1024 ** 2) * 1024 ** 2)
+	if np is None:
+		return
+	rate = 2*experiment.var.get(u'sampler_frequency', 48100)
+	for item in experiment.items.values():
+		if item.item_type != u'synth':
+			continue
+		params = [
+			item.var.get(var, _eval=False)
+			for var in (u'osc', u'freq', u'length', u'attack', u'decay')
+		]
+		if any(experiment.syntax.contains_variables(p) for p in params):
+			continue
+		osc, freq, length, attack, decay = params
+		try:
+			waveform(osc, key_to_freq(freq), length, attack, decay, rate)
+		except Exception as e:
+			# Invalid parameters result in an error when the item is prepared
+			oslogger.warning(u'failed to synthesize %s ahead of time: %s'
+				% (item.name, e))
+	waveform_cache.reset_stats()
+
+
+def close_cache(experiment):
+
+	"""
+	desc:
+		Logs waveform-cache statistics after the experiment is finished.
+
+	visible:
+		False
+
+	arguments:
+		experiment:
+			desc:	An experiment object.
+			type:	experiment
+	"""
+
+	oslogger.info(u'synth cache: %(hits)d hits, %(misses)d misses, '
+		u'%(evictions)d evictions, %(items)d items, %(size)d bytes'
+		% waveform_cache.stats())
 
 
 def key_to_freq(key):
@@ -134,7 +252,7 @@ def key_to_freq(key):
 def osc_gen(_type, freq, length, rate):
 
 	length *= .001
-	t = np.linspace(0, length, length*rate)
+	t = np.linspace(0, length, int(length*rate))
 	if _type == u'square':
 		return signal.square(2*np.pi*freq*t)
 	if _type == u'saw':
@@ -20,9 +20,95 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 from libopensesame.py3compat import *
 from libopensesame.exceptions import osexception
 from libopensesame.oslogging import oslogger
+from collections import deque
+import threading
 import serial
 import os
 
+# The time in seconds that the reader thread waits for data before checking
+# whether it should stop
+READ_TIMEOUT = .01
+
+
+class SRBoxReader(threading.Thread):
+
+	"""
+	desc:
+		A thread that reads the output of the SR Box while it is in sending
+		mode. In sending mode, the SR Box continuously sends a byte that
+		indicates which buttons are pressed. The reader reads all bytes that
+		are available at once, and queues a (timestamp, previous state, state)
+		tuple for every change of state. The previous state of the first byte
+		that is read is None.
+	"""
+
+	def __init__(self, port, clock):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			port:
+				desc:	The serial port.
+				type:	Serial
+			clock:
+				desc:	A function that returns a timestamp in milliseconds.
+				type:	callable
+		"""
+
+		threading.Thread.__init__(self)
+		self.daemon = True
+		self.port = port
+		self.clock = clock
+		self.changes = deque()
+		self.state = None
+		self.condition = threading.Condition()
+		self.exception = None
+		self._stopped = threading.Event()
+
+	def run(self):
+
+		"""
+		desc:
+			Reads until `stop()` is called.
+		"""
+
+		port = self.port
+		timeout = port.timeout
+		# Block until at least one byte is available, but not longer than
+		# READ_TIMEOUT
+		port.timeout = READ_TIMEOUT
+		try:
+			while not self._stopped.is_set():
+				data = bytearray(port.read(max(1, port.in_waiting)))
+				if not data:
+					continue
+				t = self.clock()
+				with self.condition:
+					for byte in data:
+						if byte == self.state:
+							continue
+						self.changes.append((t, self.state, byte))
+						self.state = byte
+					self.condition.notify_all()
+		except Exception as e:
+			self.exception = e
+			with self.condition:
+				self.condition.notify_all()
+		finally:
+			port.timeout = timeout
+
+	def stop(self):
+
+		"""
+		desc:
+			Stops the thread.
+		"""
+
+		self._stopped.set()
+		self.join()
+
 
 class libsrbox(object):
 
@@ -43,6 +129,16 @@ class libsrbox(object):
 		You need to call [srbox.start] to put the SR Box in sending mode,
 		before calling [srbox.get_button_press] to collect a button press.
 
+		__Important note 3:__
+
+		While the SR Box is in sending mode, its output is read in a
+		background thread, and button presses are timestamped when they
+		arrive. Therefore, button presses that occur while the experiment is
+		busy doing something else are not missed, and their timestamps are
+		accurate. Button presses that occurred since [srbox.start] are
+		collected by the next call to [srbox.get_button_press]. Call
+		[srbox.flush] to discard them.
+
 		__Example:__
 
 		~~~ .python
@@ -94,6 +190,7 @@ class libsrbox(object):
 		self.experiment = experiment
 		self._srbox = None
 		self._started = False
+		self._reader = None
 
 		# If a device has been specified, use it
 		if dev not in (None, "", "autodetect"):
@@ -172,6 +269,8 @@ class libsrbox(object):
 		self._srbox.flushOutput()
 		self._srbox.flushInput()
 		self._srbox.write(b'\xA0')
+		self._reader = SRBoxReader(self._srbox, self.experiment.time)
+		self._reader.start()
 		self._started = True
 
 	def stop(self):
@@ -183,6 +282,8 @@ class libsrbox(object):
 
 		if not self._started:
 			return
+		self._reader.stop()
+		self._reader = None
 		# Write the stop byte and flush the input
 		self._srbox.flushOutput()
 		self._srbox.flushInput()
@@ -203,7 +304,8 @@ class libsrbox(object):
 				type:	[list, NoneType]
 			timeout:
 				desc:	A timeout value in milliseconds or `None` for no
-						timeout.
+						timeout. Use 0 to check for a button press without
+						waiting.
 				type:	[int, float, NoneType]
 			require_state_change:
 				desc:	Indicates whether already pressed button should be
@@ -225,45 +327,109 @@ class libsrbox(object):
 		for buttonnr, bytemask in enumerate(self.BYTEMASKS):
 			if allowed_buttons is None or buttonnr+1 in allowed_buttons:
 				bytemasks.append((buttonnr+1, bytemask))
-		inputbyte0 = None
-		while True:
-			# Get a valid character and convert it to a byte
-			inputchar = self._srbox.read(1)
-			if inputchar == b'':
-				continue
-			inputbyte1 = ord(inputchar)
-			# Check for a timeout
-			t1 = self.experiment.time()
-			if timeout is not None and t1 - t0 > timeout:
-				break
-			# To check for state changes, we need an old and a new state.
-			# Therefore, on the first loop we don't do anything.
-			if require_state_change and inputbyte0 is None:
-				inputbyte0 = inputbyte1
-				continue
-			# Ignore no responses
-			if not inputbyte1:
-				inputbyte0 = inputbyte1
-				continue
-			if require_state_change:
-				# If a state change is required, a button should be pressed now
-				# but not before. Because there is only one state change at a
-				# time, we can return right away.
-				for buttonnr, bytemask in bytemasks:
-					if inputbyte1 | bytemask == 255 and \
-						inputbyte0 | bytemask != 255:
-						return [buttonnr], t1
-			else:
-				# If no state change is required, only consider the last input
-				# and create a list of all buttons that are pressed.
-				button_list = []
-				for button_nr, bytemask in bytemasks:
-					if inputbyte1 | bytemask == 255:
-						button_list.append(button_nr)
-				if button_list:
-					return button_list, t1
-			inputbyte0 = inputbyte1
-		return None, t1
+		reader = self._reader
+		with reader.condition:
+			while True:
+				if reader.exception is not None:
+					raise osexception(u'Failed to read from the SR Box',
+						exception=reader.exception)
+				# Walk through the state changes in the order in which they
+				# occurred
+				while reader.changes:
+					t1, inputbyte0, inputbyte1 = reader.changes.popleft()
+					# Ignore no responses
+					if not inputbyte1:
+						continue
+					if require_state_change:
+						# The first state is not a state change
+						if inputbyte0 is None:
+							continue
+						# If a state change is required, a button should be
+						# pressed now but not before. Because there is only
+						# one state change at a time, we can return right away.
+						for buttonnr, bytemask in bytemasks:
+							if inputbyte1 | bytemask == 255 and \
+								inputbyte0 | bytemask != 255:
+								return [buttonnr], t1
+					else:
+						button_list = self._button_list(inputbyte1, bytemasks)
+						if button_list:
+							return button_list, t1
+				t1 = self.experiment.time()
+				# If no state change is required, buttons that are still
+				# pressed count as well
+				if not require_state_change and reader.state:
+					button_list = self._button_list(reader.state, bytemasks)
+					if button_list:
+						return button_list, t1
+				if timeout is not None and t1 - t0 >= timeout:
+					return None, t1
+				reader.condition.wait(None if timeout is None
+					else (t0 + timeout - t1) / 1000.)
+
+	def get_button_state(self):
+
+		"""
+		desc:
+			Gets the buttons that are currently pressed, without waiting.
+
+		returns:
+			desc:	A list of buttons, which is empty if no button is pressed.
+			type:	list
+
+		example: |
+			srbox.start()
+			if 1 in srbox.get_button_state():
+				print('Button 1 is pressed!')
+			srbox.stop()
+		"""
+
+		if not self._started:
+			raise osexception(
+				u'Please call srbox.start() before srbox.get_button_state()')
+		with self._reader.condition:
+			state = self._reader.state
+		if not state:
+			return []
+		return self._button_list(state, enumerate(self.BYTEMASKS, 1))
+
+	def flush(self):
+
+		"""
+		desc:
+			Discards the button presses that have not been collected yet.
+		"""
+
+		if not self._started:
+			return
+		with self._reader.condition:
+			self._reader.changes.clear()
+
+	def _button_list(self, inputbyte, bytemasks):
+
+		"""
+		visible: False
+
+		desc:
+			Gets the pressed buttons from an input byte.
+
+		arguments:
+			inputbyte:
+				desc:	The input byte.
+				type:	int
+			bytemasks:
+				desc:	A list of (button number, byte mask) tuples.
+				type:	list
+
+		returns:
+			desc:	A list of buttons.
+			type:	list
+		"""
+
+		return [
+			button_nr for button_nr, bytemask in bytemasks
+			if inputbyte | bytemask == 255
+		]
 
 	def close(self):
 
@@ -273,5 +439,8 @@ class libsrbox(object):
 			the SRBOX plugin when the experiment finishes.
 		"""
 
+		if self._reader is not None:
+			self._reader.stop()
+			self._reader = None
 		self._srbox.close()
 		self._started = False
@@ -19,10 +19,14 @@ along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
 from opensesame_unittest import backends, compilable, color, syntax, response, \
-	headless, translations, readandwrite
+	headless, translations, readandwrite, cache, \
+	frame_timing, scheduler, channel_pool, event_wait, trajectory, srbox, \
+	sketchpad, acquisition, canvas_copy, text_warm_up, stream
 
 for mod in (backends, compilable, color, syntax, response, headless, \
-	translations, readandwrite):
+	translations, readandwrite, cache, frame_timing, scheduler, channel_pool, \
+	event_wait, trajectory, srbox, sketchpad, acquisition, \
+	canvas_copy, text_warm_up, stream):
 	res = unittest.main(mod, exit=False)
 	if len(res.result.errors) > 0 or len(res.result.failures) > 0:
 		exit(1)
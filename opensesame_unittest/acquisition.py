@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import pygame
+from openexp._input.acquisition import InputAcquisition, MAX_QUEUED_EVENTS
+
+class FakeClock(object):
+
+	def time(self):
+
+		return 0
+
+class check_acquisition(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether acquired events are flushed, and whether the queues of
+		acquired events are bounded.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		acquisition = InputAcquisition(FakeClock())
+		for event_type in acquisition.event_types:
+			acquisition.unget([pygame.event.Event(event_type, timestamp=0)])
+		# Flushing without event types flushes key releases and clicks too
+		self.assertEqual(len(acquisition.flush()), 4)
+		for event_type in acquisition.event_types:
+			self.assertEqual(acquisition.get((event_type,)), None)
+		# Queues don't grow beyond their maximum length
+		acquisition.unget([
+			pygame.event.Event(pygame.KEYDOWN, timestamp=i)
+			for i in range(MAX_QUEUED_EVENTS + 10)
+		])
+		self.assertEqual(len(acquisition.flush((pygame.KEYDOWN,))),
+			MAX_QUEUED_EVENTS)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import shutil
+import tempfile
+from openexp.cache import Cache, DiskStore
+
+class check_cache(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether the stimulus cache evicts and stores values correctly.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		cache = Cache(max_size=6, sizeof=len)
+		cache[u'a'] = u'aa'
+		cache[u'b'] = u'bb'
+		cache[u'c'] = u'cc'
+		# Touch a, so that b becomes the least-recently used value
+		self.assertEqual(cache[u'a'], u'aa')
+		cache[u'd'] = u'dd'
+		self.assertTrue(u'b' not in cache)
+		self.assertEqual(sorted(cache._items), [u'a', u'c', u'd'])
+		# A value that is too large by itself is not kept
+		cache[u'e'] = u'eeeeeee'
+		self.assertTrue(u'e' not in cache)
+		self.assertEqual(cache.get(u'b'), None)
+		stats = cache.stats()
+		self.assertEqual(stats[u'hits'], 1)
+		self.assertEqual(stats[u'misses'], 1)
+		self.assertEqual(stats[u'evictions'], 1)
+		self.assertEqual(stats[u'size'], 6)
+		# Values are reloaded from disk after they have been evicted
+		folder = tempfile.mkdtemp()
+		try:
+			store = DiskStore(folder, save=self.save, load=self.load,
+				suffix=u'.txt')
+			cache = Cache(max_size=2, sizeof=len, store=store)
+			cache[(u'gabor', 1, .5)] = u'aa'
+			cache[(u'gabor', 2, .5)] = u'bb'
+			self.assertEqual(len(cache), 1)
+			cache = Cache(max_size=2, sizeof=len, store=store)
+			self.assertEqual(cache[(u'gabor', 1, .5)], u'aa')
+			self.assertEqual(cache.stats()[u'disk_hits'], 1)
+		finally:
+			shutil.rmtree(folder)
+
+	def save(self, value, path):
+
+		with open(path, u'w') as fd:
+			fd.write(value)
+
+	def load(self, path):
+
+		with open(path) as fd:
+			return fd.read()
+
+if __name__ == '__main__':
+	unittest.main()
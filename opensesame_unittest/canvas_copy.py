@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+from libopensesame.experiment import experiment
+
+script = u'''
+set canvas_backend legacy
+set start check_copy
+
+define inline_script check_copy
+	___run__
+	import pygame
+
+	def pixels(canvas):
+		canvas.prepare()
+		return pygame.image.tostring(canvas.surface, u'RGB')
+
+	# The surface is shared until either canvas draws on it
+	c = Canvas()
+	c[u'dot'] = Circle(x=0, y=0, r=32, fill=True)
+	original = pixels(c)
+	c2 = Canvas()
+	c2.copy(c)
+	assert(c2.surface is c.surface)
+	c2.fixdot(x=200)
+	assert(c2.surface is not c.surface)
+	assert(pixels(c) == original)
+	assert(pixels(c2) != original)
+	# A reference that was taken before copying doesn't change the copy
+	c = Canvas()
+	c[u'dot'] = Circle(x=0, y=0, r=32, fill=True)
+	dot = c[u'dot']
+	c2 = Canvas()
+	c2.copy(c)
+	dot.x = 200
+	assert(c2[u'dot'].x == 0)
+	assert(pixels(c2) == original)
+	assert(pixels(c) != original)
+	# And changing the copy doesn't change the original
+	c2[u'dot'].color = u'red'
+	assert(c[u'dot'].color.colorspec == u'white')
+	# Iterating doesn't copy elements
+	c3 = Canvas()
+	c3.copy(c)
+	elements = [element for name, element in c3]
+	assert(elements == [element for name, element in c3])
+	assert(elements[0]._shared)
+	assert(c3.surface is c.surface)
+	__end__
+'''
+
+class check_canvas_copy(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether copies of a canvas are independent of the original,
+		even though they share elements and the surface until they are changed.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		e = experiment(logfile=u'/tmp/tmp.csv', string=script)
+		e.run()
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import os
+import pygame
+from libopensesame.oslogging import oslogger
+from openexp._sampler.channel_pool import ChannelPool
+
+class Owner(object):
+
+	pass
+
+class check_channel_pool(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether channels are assigned to samplers, and taken over from
+		other samplers according to the steal policy.
+	"""
+
+	def setUp(self):
+
+		if not oslogger.started:
+			oslogger.start()
+		os.environ[u'SDL_AUDIODRIVER'] = u'dummy'
+		pygame.mixer.init(44100, -16, 2, 1024)
+		self.sound = pygame.mixer.Sound(buffer=b'\0' * 44100 * 4)
+
+	def tearDown(self):
+
+		pygame.mixer.quit()
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		pool = ChannelPool(size=2, policy=u'oldest')
+		first, second, third = Owner(), Owner(), Owner()
+		for owner in (first, second):
+			pool.acquire(owner).play(self.sound)
+		self.assertEqual(len(pool.channels(first)), 1)
+		self.assertEqual(len(pool.channels(second)), 1)
+		# Stopping one sampler doesn't affect the other
+		pool.channels(first)[0].stop()
+		self.assertEqual(pool.channels(first), [])
+		self.assertEqual(len(pool.channels(second)), 1)
+		# When all channels are in use, the oldest sound is stopped
+		pool.acquire(first).play(self.sound)
+		pool.acquire(third).play(self.sound)
+		self.assertEqual(pool.channels(second), [])
+		self.assertEqual(len(pool.channels(third)), 1)
+		# The quietest sound is stopped
+		pygame.mixer.stop()
+		pool = ChannelPool(size=2, policy=u'quietest')
+		pool.acquire(first).play(self.sound)
+		pool.acquire(second).play(self.sound)
+		pool.channels(first)[0].set_volume(.1)
+		pool.acquire(third).play(self.sound)
+		self.assertEqual(pool.channels(first), [])
+		self.assertEqual(len(pool.channels(second)), 1)
+		# No sound is stopped
+		pygame.mixer.stop()
+		pool = ChannelPool(size=2, policy=u'none')
+		pool.acquire(first).play(self.sound)
+		pool.acquire(second).play(self.sound)
+		self.assertEqual(pool.acquire(third), None)
+		self.assertEqual(len(pool.channels(first)), 1)
+
+if __name__ == '__main__':
+	unittest.main()
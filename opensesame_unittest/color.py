@@ -36,7 +36,8 @@ class check_color(unittest.TestCase):
 			Checks various correct and incorrect color specifications.
 		"""
 
-		for colorspec in [
+		# Run twice to check memoized results
+		for colorspec in 2 * [
 			u'white',
 			u'#FFFFFF',
 			u'#ffffff',
@@ -52,7 +53,7 @@ class check_color(unittest.TestCase):
 			print(u'Checking correct %s (%s)' % (str(colorspec), type(colorspec)))
 			self.assertEqual(u'#ffffff', color.to_hex(colorspec))
 
-		for colorspec in [
+		for colorspec in 2 * [
 			u'wihte',
 			u'#FFFFF',
 			u'#FFFFG',
@@ -67,5 +68,13 @@ class check_color(unittest.TestCase):
 				% (str(colorspec), type(colorspec)))
 			self.assertRaises(osexception, color.to_hex, colorspec)
 
+		# Colors are interned, and immutable
+		white = color(None, u'white')
+		self.assertTrue(white is color(None, u'white'))
+		self.assertTrue(white is not color(None, u'#ffffff'))
+		self.assertEqual(white.hexcolor, color(None, (255, 255, 255)).hexcolor)
+		self.assertRaises(AttributeError, setattr, white, u'hexcolor',
+			u'#000000')
+
 if __name__ == '__main__':
 	unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import threading
+import pygame
+from openexp._input.event_wait import InputWaiter
+
+class check_event_wait(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether the input waiter notices conditions and timeouts on
+		time, and wakes up when it is notified.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		waiter = InputWaiter(spin_time=2)
+		# A timeout is noticed within the spin time
+		t0 = waiter.time()
+		self.assertFalse(waiter.wait_for(lambda: False, timeout=50))
+		self.assertTrue(50 <= waiter.time() - t0 < 60)
+		summary = waiter.summary()
+		self.assertEqual(summary[u'waits'], 1)
+		self.assertEqual(summary[u'timeouts'], 1)
+		self.assertTrue(0 <= summary[u'max_latency'] < 2)
+		# Most of the time is spent sleeping
+		self.assertTrue(summary[u'spin_time'] < summary[u'wait_time'] / 2)
+		# A condition that is true right away doesn't wait
+		self.assertTrue(waiter.wait_for(lambda: True, timeout=0))
+		# A notification wakes up a sleeping thread
+		t0 = waiter.time()
+		timer = threading.Timer(.05, waiter.notify)
+		timer.start()
+		waiter.sleep(10000)
+		timer.join()
+		self.assertTrue(waiter.time() - t0 < 1000)
+		# Events that are waited for are taken from the queue. Other events
+		# are put back if they are of a type that should be kept, and
+		# discarded otherwise.
+		pygame.display.init()
+		try:
+			pygame.event.clear()
+			pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION,
+				pos=(0, 0), rel=(1, 1), buttons=(0, 0, 0)))
+			pygame.event.post(pygame.event.Event(pygame.KEYDOWN,
+				key=pygame.K_a, unicode=u'a', mod=0))
+			pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN,
+				pos=(0, 0), button=1))
+			event = waiter.wait_event((pygame.MOUSEBUTTONDOWN,), timeout=0,
+				keep=(pygame.KEYDOWN,))
+			self.assertEqual(event.type, pygame.MOUSEBUTTONDOWN)
+			waiter.repost()
+			self.assertEqual([event.type for event in pygame.event.get()
+				if event.type in (pygame.MOUSEMOTION, pygame.KEYDOWN)],
+				[pygame.KEYDOWN])
+		finally:
+			pygame.display.quit()
+
+if __name__ == '__main__':
+	unittest.main()
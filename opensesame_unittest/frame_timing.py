@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+from openexp._canvas import frame_timing
+from openexp._canvas.frame_timing import FrameTimer
+
+class Var(dict):
+
+	def set(self, var, val):
+
+		self[var] = val
+
+class Experiment(object):
+
+	def __init__(self):
+
+		self.var = Var()
+
+class check_frame_timing(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether the refresh interval is estimated correctly, and whether
+		late flips and dropped frames are detected.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		timer = FrameTimer()
+		self.assertEqual(timer.refresh_interval, None)
+		# Back-to-back calibration flips at 100 Hz, with some jitter
+		for t in (0, 10, 20.5, 30, 39.5, 50):
+			timer.record(t)
+		self.assertEqual(timer.refresh_interval, 10)
+		# Flips that are not synchronized to the refresh are ignored
+		timer.record(50.5)
+		self.assertEqual(timer.refresh_interval, 10)
+		# A flip without an intended onset
+		timer.record(100, u'fixation')
+		# A flip that is on time, because it occurs within one refresh
+		# interval of its intended onset
+		timer.expect(195)
+		timer.record(200, u'target')
+		# A flip that is two frames late
+		timer.expect(395)
+		timer.record(420, u'target')
+		summary = timer.summary()
+		self.assertEqual(list(summary), [u'fixation', u'target'])
+		self.assertEqual(summary[u'fixation'][u'flips'], 1)
+		self.assertEqual(summary[u'fixation'][u'timed'], 0)
+		self.assertEqual(summary[u'target'][u'flips'], 2)
+		self.assertEqual(summary[u'target'][u'timed'], 2)
+		self.assertEqual(summary[u'target'][u'late'], 1)
+		self.assertEqual(summary[u'target'][u'dropped'], 2)
+		self.assertEqual(summary[u'target'][u'max_delay'], 25)
+		self.assertEqual(len(timer.onsets), 10)
+		# The summary of an item is stored as experiment variables
+		exp = Experiment()
+		frame_timing.log_item(exp, u'target')
+		self.assertEqual(exp.var, {})
+		frame_timing.frame_timer = timer
+		try:
+			frame_timing.log_item(exp, u'target')
+			frame_timing.log_item(exp, u'unknown')
+		finally:
+			frame_timing.frame_timer = None
+		self.assertEqual(exp.var[u'frame_timing_refresh_interval'], 10)
+		self.assertEqual(exp.var[u'frame_timing_target_flips'], 2)
+		self.assertEqual(exp.var[u'frame_timing_target_late'], 1)
+		self.assertEqual(exp.var[u'frame_timing_target_dropped'], 2)
+		self.assertEqual(exp.var[u'frame_timing_target_max_delay'], 25)
+		self.assertFalse(any(u'unknown' in var for var in exp.var))
+		# Unknown values are stored as NA
+		frame_timing.frame_timer = FrameTimer()
+		try:
+			frame_timing.frame_timer.record(0, u'fixation')
+			frame_timing.log_item(exp, u'fixation')
+		finally:
+			frame_timing.frame_timer = None
+		self.assertEqual(exp.var[u'frame_timing_refresh_interval'], u'NA')
+		self.assertEqual(exp.var[u'frame_timing_fixation_max_delay'], u'NA')
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import time
+from openexp._sampler.scheduler import Scheduler
+
+class Clock(object):
+
+	def time(self):
+
+		return 1000. * time.time()
+
+class Sampler(object):
+
+	def __init__(self, clock):
+
+		self.clock = clock
+		self.played = []
+
+	def play(self, **playback_args):
+
+		self.played.append((self.clock.time(), playback_args))
+
+	def stop(self):
+
+		pass
+
+class check_scheduler(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether samplers are started at the scheduled time minus the
+		latency, in the order of their onsets.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		clock = Clock()
+		sampler = Sampler(clock)
+		scheduler = Scheduler(clock, latency=10)
+		scheduler.start()
+		t = clock.time()
+		late = scheduler.schedule(sampler, t + 100, {u'volume': .5})
+		early = scheduler.schedule(sampler, t + 50, {u'volume': 1})
+		early.wait()
+		late.wait()
+		scheduler.stop()
+		self.assertEqual([args for t, args in sampler.played],
+			[{u'volume': 1}, {u'volume': .5}])
+		for playback, (t_played, args) in zip([early, late], sampler.played):
+			self.assertTrue(playback.t - 10 <= t_played < playback.t - 5)
+			self.assertTrue(playback.onset is not None)
+		summary = scheduler.summary()
+		self.assertEqual(summary[u'played'], 2)
+		self.assertTrue(0 <= summary[u'max_error'] < 5)
+		# Playbacks that have not started when the scheduler is stopped are
+		# cancelled
+		scheduler = Scheduler(clock)
+		scheduler.start()
+		playback = scheduler.schedule(sampler, clock.time() + 10000, {})
+		scheduler.stop()
+		playback.wait()
+		self.assertEqual(playback.onset, None)
+
+if __name__ == '__main__':
+	unittest.main()
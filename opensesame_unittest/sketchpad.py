@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+from libopensesame.experiment import experiment
+
+script = u'''
+set canvas_backend legacy
+set start check_sketchpads
+
+define sketchpad named
+	set duration 0
+	draw circle color=white fill=0 name=dot penwidth=1 r=32 show_if=always x=0 y=0 z_index=0
+
+define sketchpad unnamed
+	set duration 0
+	draw fixdot color=white show_if=always style=default x=0 y=0 z_index=0
+
+define inline_script check_sketchpads
+	___run__
+	for run in range(3):
+		# Changes to a named element must not carry over to the next run
+		items.prepare(u'named')
+		assert(items[u'named']._static_canvas is None)
+		assert(items[u'named'].canvas[u'dot'].color.colorspec == u'white')
+		items[u'named'].canvas[u'dot'].color = u'red'
+		items.run(u'named')
+		# Changes to a cached canvas must not carry over either
+		items.prepare(u'unnamed')
+		assert(items[u'unnamed']._static_canvas is not None)
+		assert(len(items[u'unnamed'].canvas) == 1)
+		items[u'unnamed'].canvas.fixdot(x=100)
+		items.run(u'unnamed')
+	__end__
+'''
+
+class check_sketchpad(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether changes to the canvas of a sketchpad, for example from
+		an inline_script, are undone when the sketchpad is prepared again.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		e = experiment(logfile=u'/tmp/tmp.csv', string=script)
+		e.run()
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), u'..',
+	u'opensesame_plugins', u'srbox'))
+from libsrbox import libsrbox
+from libopensesame.oslogging import oslogger
+
+class Experiment(object):
+
+	def time(self):
+
+		return 1000. * time.time()
+
+@unittest.skipIf(not hasattr(os, u'openpty'), u'requires a pseudo-terminal')
+class check_srbox(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether button presses are read from a fake SR Box, which is
+		connected to a pseudo-terminal, and timestamped when they arrive.
+	"""
+
+	def send(self, *states):
+
+		os.write(self.master, bytes(bytearray(states)))
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		if not oslogger.started:
+			oslogger.start()
+		self.master, slave = os.openpty()
+		srbox = libsrbox(Experiment(), os.ttyname(slave))
+		srbox.start()
+		# Button 1 is pressed and released, and then button 2 is pressed
+		self.send(0, 0, 1, 1, 0, 2, 2)
+		self.assertEqual(srbox.get_button_press(require_state_change=True,
+			timeout=1000)[0], [1])
+		self.assertEqual(srbox.get_button_press(require_state_change=True,
+			timeout=1000)[0], [2])
+		# Button 2 is still pressed, which counts when no state change is
+		# required
+		self.assertEqual(srbox.get_button_press(timeout=0)[0], [2])
+		self.assertEqual(srbox.get_button_press(allowed_buttons=[1],
+			timeout=0)[0], None)
+		self.assertEqual(srbox.get_button_state(), [2])
+		# A timeout occurs on time, even though the box sends nothing
+		t0 = srbox.experiment.time()
+		button_list, t1 = srbox.get_button_press(require_state_change=True,
+			timeout=50)
+		self.assertEqual(button_list, None)
+		self.assertTrue(50 <= t1 - t0 < 100)
+		# A button press is timestamped when it arrives, even if it is
+		# collected later
+		timer = threading.Timer(.05, self.send, (0, 4))
+		t0 = srbox.experiment.time()
+		timer.start()
+		timer.join()
+		time.sleep(.1)
+		button_list, t1 = srbox.get_button_press(allowed_buttons=[3],
+			require_state_change=True)
+		self.assertEqual(button_list, [3])
+		self.assertTrue(50 <= t1 - t0 < 100)
+		# Presses are flushed
+		self.send(0, 1)
+		time.sleep(.05)
+		srbox.flush()
+		self.assertEqual(srbox.get_button_press(require_state_change=True,
+			timeout=0)[0], None)
+		srbox.stop()
+		srbox.close()
+		os.close(self.master)
+		os.close(slave)
+
+if __name__ == '__main__':
+	unittest.main()
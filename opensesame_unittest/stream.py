@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import os
+import time
+import wave
+import shutil
+import tempfile
+import numpy as np
+import pygame
+from libopensesame.oslogging import oslogger
+from libopensesame.exceptions import osexception
+from libopensesame.experiment import experiment
+from openexp._sampler.stream import Stream
+
+RATE = 44100
+
+script = u'''
+set canvas_backend legacy
+set sound_freq %d
+set sound_channels 2
+set sound_sample_size -16
+set start check_sampler
+
+define inline_script check_sampler
+	___run__
+	path = %r
+	# Playback of a stream is limited to the duration
+	s = Sampler(path, stream=True, duration=300)
+	t0 = clock.time()
+	s.play()
+	s.wait()
+	assert(250 <= clock.time() - t0 < 700)
+	# A paused stream keeps playing after it is resumed
+	s = Sampler(path, stream=True)
+	t0 = clock.time()
+	s.play()
+	clock.sleep(200)
+	s.pause()
+	clock.sleep(300)
+	assert(s.is_playing())
+	s.resume()
+	s.wait()
+	assert(clock.time() - t0 >= 1150)
+	__end__
+'''
+
+class check_stream(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether .wav files are streamed in chunks, and whether
+		playback of a stream can be paused, resumed, and stopped.
+	"""
+
+	def setUp(self):
+
+		if not oslogger.started:
+			oslogger.start()
+		os.environ[u'SDL_AUDIODRIVER'] = u'dummy'
+		self.folder = tempfile.mkdtemp()
+		pygame.mixer.init(RATE, -16, 2, 1024)
+
+	def tearDown(self):
+
+		pygame.mixer.quit()
+		shutil.rmtree(self.folder)
+
+	def wav(self, name, duration, channels=2, sampwidth=2, rate=RATE):
+
+		"""
+		desc:
+			Writes a .wav file with a ramp in every channel.
+
+		arguments:
+			name:
+				desc:	The file name.
+				type:	unicode
+			duration:
+				desc:	The duration in milliseconds.
+				type:	int
+
+		keywords:
+			channels:
+				desc:	The number of channels.
+				type:	int
+			sampwidth:
+				desc:	The sample width in bytes.
+				type:	int
+			rate:
+				desc:	The sampling frequency.
+				type:	int
+
+		returns:
+			desc:	The path to the file.
+			type:	unicode
+		"""
+
+		path = os.path.join(self.folder, name)
+		nframes = duration * rate // 1000
+		a = np.arange(nframes * channels) % 128
+		a = a.astype(np.int16 if sampwidth == 2 else np.uint8)
+		writer = wave.open(path, u'wb')
+		writer.setnchannels(channels)
+		writer.setsampwidth(sampwidth)
+		writer.setframerate(rate)
+		writer.writeframes(a.tobytes())
+		writer.close()
+		return path
+
+	def playing_time(self, stream, timeout=5):
+
+		"""
+		desc:
+			Waits until a stream has stopped playing.
+
+		arguments:
+			stream:
+				desc:	The stream.
+				type:	Stream
+
+		keywords:
+			timeout:
+				desc:	The maximum time to wait in seconds.
+				type:	float
+
+		returns:
+			desc:	The time in seconds that the stream kept playing.
+			type:	float
+		"""
+
+		t0 = time.time()
+		while stream.is_playing() and time.time() - t0 < timeout:
+			time.sleep(.005)
+		return time.time() - t0
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		path = self.wav(u'stereo.wav', 1000)
+		channel = pygame.mixer.Channel(0)
+		# A stream is played in chunks, and keeps playing when one chunk hands
+		# over to the next
+		stream = Stream(path, chunk_size=200)
+		self.assertAlmostEqual(stream.get_length(), 1)
+		stream.play(channel)
+		self.assertTrue(0.9 <= self.playing_time(stream) < 2)
+		stream.stop()
+		# Stopping a stream joins the feeder thread
+		stream.play(channel)
+		thread = stream._thread
+		time.sleep(.1)
+		stream.stop()
+		self.assertFalse(thread.is_alive())
+		self.assertFalse(stream.is_playing())
+		self.assertEqual(channel.get_sound(), None)
+		# A paused stream keeps playing after it is resumed
+		stream.play(channel)
+		time.sleep(.2)
+		channel.pause()
+		time.sleep(.3)
+		self.assertTrue(stream.is_playing())
+		channel.unpause()
+		self.assertTrue(1 <= .5 + self.playing_time(stream) < 2.5)
+		stream.stop()
+		# Playback is limited to maxtime
+		stream.play(channel, maxtime=300)
+		self.assertTrue(.2 <= self.playing_time(stream) < .7)
+		stream.stop()
+		# Mono sounds are converted to stereo
+		stream = Stream(self.wav(u'mono.wav', 100, channels=1))
+		reader = wave.open(stream.path, u'rb')
+		sound, nframes = stream._read(reader, stream._nframes, 1)
+		reader.close()
+		a = np.frombuffer(sound.get_raw(), dtype=np.int16).reshape(-1, 2)
+		self.assertEqual(len(a), 100 * RATE // 1000)
+		self.assertTrue((a[:, 0] == a[:, 1]).all())
+		self.assertEqual(list(a[:3, 0]), [0, 1, 2])
+		# Stereo sounds are converted to mono
+		pygame.mixer.quit()
+		pygame.mixer.init(RATE, -16, 1, 1024)
+		stream = Stream(self.wav(u'stereo.wav', 100))
+		reader = wave.open(stream.path, u'rb')
+		sound, nframes = stream._read(reader, stream._nframes, 1)
+		reader.close()
+		a = np.frombuffer(sound.get_raw(), dtype=np.int16)
+		self.assertEqual(len(a), 100 * RATE // 1000)
+		self.assertEqual(list(a[:3]), [0, 2, 4])
+		# Only 16-bit .wav files with the mixer frequency can be streamed
+		self.assertRaises(osexception, Stream,
+			self.wav(u'8bit.wav', 100, sampwidth=1))
+		self.assertRaises(osexception, Stream,
+			self.wav(u'22050.wav', 100, rate=22050))
+		self.assertRaises(osexception, Stream,
+			os.path.join(self.folder, u'sound.ogg'))
+		pygame.mixer.quit()
+		# Pausing, resuming, and limiting the duration also work through the
+		# sampler
+		path = self.wav(u'sampler.wav', 1000)
+		e = experiment(logfile=os.path.join(self.folder, u'log.csv'),
+			string=script % (RATE, path))
+		e.run()
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+from libopensesame.experiment import experiment
+
+script = u'''
+set canvas_backend legacy
+set start check_warm_up
+
+define inline_script check_warm_up
+	___run__
+	import pygame
+	from openexp._canvas._richtext.richtext import warm_up
+	from openexp._canvas.canvas import text_cache
+
+	def pixels(canvas):
+		return pygame.image.tostring(canvas.surface, u'RGB')
+
+	c = Canvas()
+	c.fixdot()
+	original = pixels(c)
+	# Warming up doesn't draw onto the canvas
+	warm_up(c, [u'the', u'quick', u'brown', u'fox'], font_size=32)
+	assert(len(c) == 1)
+	c.show()
+	assert(pixels(c) == original)
+	# A warmed-up text is taken from the cache
+	stats = text_cache.stats()
+	c.text(u'fox', font_size=32)
+	c.prepare()
+	assert(text_cache.stats()[u'misses'] == stats[u'misses'])
+	assert(text_cache.stats()[u'hits'] > stats[u'hits'])
+	__end__
+'''
+
+class check_text_warm_up(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether texts can be rendered into the text cache in advance,
+		without changing the canvas.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		e = experiment(logfile=u'/tmp/tmp.csv', string=script)
+		e.run()
+
+if __name__ == '__main__':
+	unittest.main()
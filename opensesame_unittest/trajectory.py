@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of OpenSesame.
+
+OpenSesame is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+OpenSesame is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with OpenSesame.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import time
+import os
+import shutil
+import tempfile
+import numpy as np
+from openexp._mouse.mouse import Mouse
+
+class Clock(object):
+
+	def time(self):
+
+		return 1000. * time.time()
+
+class Var(dict):
+
+	def set(self, var, val):
+
+		self[var] = val
+
+class Experiment(object):
+
+	def __init__(self, logfile):
+
+		self.clock = Clock()
+		self.var = Var()
+		self.logfile = logfile
+		self.data_files = []
+
+class FakeMouse(Mouse):
+
+	def __init__(self, logfile):
+
+		self.experiment = Experiment(logfile)
+		self.pos = 0
+
+	def _sample(self):
+
+		self.pos += 1
+		return (self.pos, -self.pos), (True, False, True)
+
+class check_trajectory(unittest.TestCase):
+
+	"""
+	desc:
+		Checks whether mouse trajectories are recorded at a fixed rate, and
+		saved next to the log file.
+	"""
+
+	def runTest(self):
+
+		"""
+		desc:
+			Walks through the test.
+		"""
+
+		folder = tempfile.mkdtemp()
+		try:
+			self.check(os.path.join(folder, u'subject-0.csv'))
+		finally:
+			shutil.rmtree(folder)
+
+	def check(self, logfile):
+
+		"""
+		desc:
+			Records, checks, and logs a trajectory.
+
+		arguments:
+			logfile:
+				desc:	The path to the log file.
+				type:	unicode
+		"""
+
+		mouse = FakeMouse(logfile)
+		# Preallocate less than is needed, so that the arrays are enlarged
+		trajectory = mouse.trajectory(rate=200, duration=100)
+		trajectory.start()
+		time.sleep(.5)
+		trajectory.stop()
+		n = len(trajectory)
+		summary = trajectory.summary()
+		self.assertEqual(summary[u'samples'], n)
+		self.assertTrue(80 <= n <= 110)
+		self.assertTrue(150 <= summary[u'rate'] <= 250)
+		self.assertEqual(list(trajectory.x), list(range(1, n + 1)))
+		self.assertEqual(list(trajectory.y), list(range(-1, -n - 1, -1)))
+		self.assertTrue((trajectory.buttons == 5).all())
+		self.assertAlmostEqual(summary[u'path_length'], (n - 1) * 2 ** .5)
+		# No samples are taken after recording has stopped
+		time.sleep(.05)
+		self.assertEqual(len(trajectory), n)
+		path = trajectory.log(u'traj')
+		var = mouse.experiment.var
+		self.assertEqual(var[u'traj_samples'], n)
+		self.assertEqual(var[u'traj_file'], u'subject-0_traj_0.npz')
+		self.assertEqual(mouse.experiment.data_files, [path])
+		with np.load(path) as data:
+			self.assertEqual(list(data[u'x'][:3]), [1, 2, 3])
+			self.assertEqual(list(data[u't']), list(trajectory.t))
+			self.assertEqual(len(data[u'buttons']), n)
+		# Logging again doesn't overwrite the previous file
+		trajectory.log(u'traj')
+		self.assertEqual(var[u'traj_file'], u'subject-0_traj_1.npz')
+		# Starting again discards the previous recording
+		trajectory.start()
+		trajectory.stop()
+		self.assertTrue(len(trajectory) < n)
+
+if __name__ == '__main__':
+	unittest.main()
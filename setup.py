@@ -154,6 +154,7 @@ setup(name=u"python-opensesame",
 		"openexp._canvas",
 		"openexp._canvas._arrow",
 		"openexp._canvas._circle",
+		"openexp._canvas._dots",
 		"openexp._canvas._element",
 		"openexp._canvas._ellipse",
 		"openexp._canvas._fixdot",
@@ -164,6 +165,7 @@ setup(name=u"python-opensesame",
 		"openexp._canvas._polygon",
 		"openexp._canvas._rect",
 		"openexp._canvas._richtext",
+		"openexp._input",
 		"openexp._keyboard",
 		"openexp._mouse",
 		"openexp._sampler",